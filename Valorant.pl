@@ -3,6 +3,7 @@
 % -------------------------
 mapa(ascent).
 mapa(bind).
+mapa(breeze).
 mapa(haven).
 mapa(split).
 mapa(icebox).
@@ -12,71 +13,118 @@ mapa(lotus).
 mapa(sunset).
 
 % -------------------------
-% Lista de composiciones por mapa (Actualizadas según meta 2025)
-% -------------------------
-
-composiciones(ascent, [
-    [jett, omen, sova, kayo, killjoy],   % Meta profesional
-    [jett, omen, sova, killjoy, sage],   % Variación ranked alto
-    [jett, sova, breach, killjoy, omen], % Alternativa EMEA
-    [jett, reyna, omen, killjoy, sova]   % Variación agresiva
-]).
-
-composiciones(fracture, [
-    [raze, breach, brimstone, fade, chamber],  % Meta profesional
-    [raze, breach, fade, killjoy, brimstone],  % Variación común
-    [neon, breach, fade, killjoy, harbor],     % Alternativa NA
-    [raze, skye, brimstone, chamber, fade]     % Variación ranked
-]).
-
-composiciones(haven, [
-    [jett, sova, omen, breach, killjoy],   % Configuración profesional
-    [jett, sova, omen, cypher, breach],    % Variación con Cypher
-    [jett, skye, omen, killjoy, kayo],     % Alternativa NA
-    [phoenix, sova, omen, killjoy, breach] % Variación LATAM
-]).
-
-composiciones(icebox, [
-    [jett, sova, viper, sage, killjoy],    % Meta profesional
-    [jett, sova, viper, sage, chamber],   % Variación con Chamber
-    [reyna, sova, viper, sage, killjoy],  % Alternativa ranked
-    [jett, fade, viper, sage, killjoy]     % Variación iniciador alternativo
-]).
-
-composiciones(lotus, [
-    [raze, fade, omen, viper, killjoy],    % Meta profesional
-    [raze, fade, harbor, viper, killjoy],  % Variación con Harbor
-    [jett, fade, omen, viper, chamber],    % Alternativa Asia
-    [raze, skye, omen, killjoy, viper]     % Versión simplificada ranked
-]).
-
-composiciones(pearl, [
-    [jett, fade, astra, chamber, sage],    % Meta profesional
-    [jett, fade, astra, killjoy, sage],    % Variación con Killjoy
-    [raze, fade, harbor, killjoy, sage],   % Alternativa doble controlador
-    [neon, fade, astra, chamber, sage]     % Variación agresiva ranked
-]).
-
-composiciones(split, [
-    [raze, skye, omen, cypher, sage],      % Meta profesional
-    [raze, skye, omen, killjoy, sage],     % Variación con Killjoy
-    [jett, skye, omen, cypher, sage],      % Alternativa con Jett
-    [raze, breach, omen, killjoy, sage]    % Versión EMEA
-]).
-
-composiciones(bind, [
-    [raze, skye, brimstone, cypher, viper],  % Meta clásica
-    [phoenix, kayo, harbor, sage, killjoy],  % Composición alternativa
-    [jett, skye, omen, chamber, viper],      % Variación moderna
-    [neon, fade, harbor, killjoy, sage]       % Estrategia agresiva
-]).
-
-composiciones(sunset, [
-    [tejo, fade, astra, clove, chamber], % Meta profesional
-    [jett, sova, omen, killjoy, raze],   % Composición temporal
-    [raze, skye, harbor, cypher, sage],  % Estrategia de control
-    [vyse, fade, omen, killjoy, jett]    % Variación S-tier
-]).
+% Composiciones por mapa y estilo (usadas por la aplicación)
+% pro = Balanceada, aggressive = Agresiva, defensive = Defensiva
+% -------------------------
+composicion(ascent, pro, [jett, omen, sova, kayo, killjoy]).
+composicion(ascent, ranked, [jett, omen, sova, kayo, killjoy]).
+composicion(ascent, alt, [jett, omen, skye, reyna, killjoy]).
+composicion(ascent, aggressive, [jett, reyna, raze, skye, omen]).
+composicion(ascent, defensive, [cypher, killjoy, sage, sova, omen]).
+
+composicion(bind, pro, [raze, skye, brimstone, viper, cypher]).
+composicion(bind, ranked, [raze, skye, brimstone, viper, killjoy]).
+composicion(bind, alt, [phoenix, fade, brimstone, viper, cypher]).
+composicion(bind, aggressive, [raze, phoenix, skye, breach, brimstone]).
+composicion(bind, defensive, [cypher, killjoy, viper, brimstone, sova]).
+
+composicion(breeze, pro, [jett, sova, viper, chamber, skye]).
+composicion(breeze, ranked, [jett, sova, viper, killjoy, skye]).
+composicion(breeze, alt, [jett, sova, viper, cypher, kayo]).
+composicion(breeze, aggressive, [jett, reyna, skye, sova, viper]).
+composicion(breeze, defensive, [chamber, viper, cypher, sova, omen]).
+
+composicion(fracture, pro, [raze, breach, brimstone, fade, chamber]).
+composicion(fracture, ranked, [raze, breach, brimstone, fade, killjoy]).
+composicion(fracture, alt, [neon, breach, brimstone, fade, cypher]).
+composicion(fracture, aggressive, [raze, neon, breach, fade, brimstone]).
+composicion(fracture, defensive, [chamber, cypher, breach, fade, brimstone]).
+
+composicion(haven, pro, [jett, sova, omen, cypher, breach]).
+composicion(haven, ranked, [jett, sova, omen, killjoy, breach]).
+composicion(haven, alt, [jett, sova, omen, killjoy, kayo]).
+composicion(haven, aggressive, [jett, reyna, breach, skye, omen]).
+composicion(haven, defensive, [cypher, killjoy, sova, sage, omen]).
+
+composicion(icebox, pro, [jett, sova, viper, sage, killjoy]).
+composicion(icebox, ranked, [jett, sova, viper, sage, killjoy]).
+composicion(icebox, alt, [reyna, sova, viper, sage, chamber]).
+composicion(icebox, aggressive, [jett, reyna, sova, viper, sage]).
+composicion(icebox, defensive, [killjoy, sage, viper, sova, chamber]).
+
+composicion(lotus, pro, [raze, fade, omen, viper, killjoy]).
+composicion(lotus, ranked, [raze, fade, omen, viper, killjoy]).
+composicion(lotus, alt, [jett, skye, omen, viper, killjoy]).
+composicion(lotus, aggressive, [raze, jett, fade, skye, omen]).
+composicion(lotus, defensive, [killjoy, cypher, viper, omen, fade]).
+
+composicion(pearl, pro, [jett, fade, astra, chamber, sage]).
+composicion(pearl, ranked, [jett, fade, astra, killjoy, sage]).
+composicion(pearl, alt, [neon, kayo, astra, killjoy, sage]).
+composicion(pearl, aggressive, [jett, neon, fade, skye, astra]).
+composicion(pearl, defensive, [chamber, killjoy, sage, astra, fade]).
+
+composicion(split, pro, [raze, skye, omen, cypher, sage]).
+composicion(split, ranked, [raze, skye, omen, killjoy, sage]).
+composicion(split, alt, [jett, raze, omen, skye, sage]).
+composicion(split, aggressive, [raze, jett, breach, skye, omen]).
+composicion(split, defensive, [cypher, killjoy, sage, omen, skye]).
+
+composicion(sunset, pro, [raze, skye, omen, deadlock, killjoy]).
+composicion(sunset, ranked, [raze, skye, omen, deadlock, killjoy]).
+composicion(sunset, alt, [phoenix, fade, brimstone, deadlock, killjoy]).
+composicion(sunset, aggressive, [raze, phoenix, skye, omen, deadlock]).
+composicion(sunset, defensive, [deadlock, killjoy, cypher, omen, skye]).
+
+% Todas las composiciones de un mapa, derivadas de composicion/3
+composiciones(Mapa, Composiciones) :-
+    findall(Compo, composicion(Mapa, _, Compo), Composiciones).
+
+% -------------------------
+% Descripciones de mapas
+% -------------------------
+descripcion_mapa(ascent, 'Equilibra poder de entrada, control de mapa e información. Jett aporta entrada rápida y uso del Operator, Omen controla ángulos con sus humos, los iniciadores brindan reconocimiento, y Killjoy asegura la defensa de sitios.').
+descripcion_mapa(bind, 'Mapa con teletransportadores que requiere control de flancos. Raze es excelente para limpiar espacios cerrados, Brimstone y Viper controlan sitios con humos, mientras Cypher vigila los flancos y teletransportadores.').
+descripcion_mapa(breeze, 'Mapa amplio con largas líneas de visión. Viper es esencial para dividir espacios abiertos, Jett y Chamber aprovechan las líneas largas con Operator, mientras Sova y Skye proporcionan información crucial.').
+descripcion_mapa(fracture, 'Composición con alto poder de iniciadores y utilidades de control. Raze aprovecha los ángulos cerrados, Breach y Fade proporcionan un combo de aturdimiento y revelado, Brimstone coloca humos rápidos, mientras el centinela controla flancos.').
+descripcion_mapa(haven, 'Al tener tres sitios, exige una composición versátil. Jett es imprescindible para aprovechar las largas líneas de visión, Omen cubre múltiples ángulos, la combinación de Sova y Breach provee información constante, mientras el centinela ofrece control de flancos.').
+descripcion_mapa(icebox, 'Viper es imprescindible, dividiendo sitios con su Pantalla Tóxica. Sage proporciona muro para plantar (especialmente en B) y orbes lentos. Sova despejar espacios largos. Jett puede tomar ángulos elevados. Killjoy vigila flancos en este mapa de amplias rotaciones.').
+descripcion_mapa(lotus, 'La dupla de controladores Omen + Viper es clave. Raze limpia esquinas estrechas y zonas de las puertas. Fade explora los amplios espacios y conectores del mapa. Killjoy vigila rotaciones a través de las puertas y su definitiva cubre áreas extensas.').
+descripcion_mapa(pearl, 'Astra con sus humos globales puede tapar ángulos largos. Fade revela enemigos en rincones. Chamber vigila flancos y su definitiva es letal en largas distancias. Jett infiltra y toma duelos de larga distancia. Sage controla Mid Connector o bloquea A Main.').
+descripcion_mapa(split, 'Raze aprovecha sus Blast Packs y granadas en entradas cortas. Skye usa destellos y trailblazer para limpiar esquinas. Omen bloquea visibilidad en puntos clave. Cypher coloca trampas en flancos. Sage levanta muros que bloquean rutas cruciales y ralentiza pushes.').
+descripcion_mapa(sunset, 'Mapa con múltiples niveles y ángulos verticales. Raze y Phoenix son excelentes para limpiar espacios cerrados, Deadlock controla áreas clave, mientras Killjoy asegura el control de sitios con su utilidad.').
+
+% -------------------------
+% Consejos para agentes
+% -------------------------
+consejo_agente(jett, 'Usa Tailwind para entrar rápido y Cloudburst para cubrir ángulos. Ideal para operar con AWP.').
+consejo_agente(raze, 'Utiliza Blast Pack para moverte rápido y Paint Shells para limpiar esquinas. Showstopper es excelente para romper defensas.').
+consejo_agente(phoenix, 'Aprovecha Curveball para cegar y Hot Hands para curar. Run It Back te permite hacer entradas seguras.').
+consejo_agente(reyna, 'Dismiss después de cada eliminación para reposicionarte. Leer es clave para cegar a múltiples enemigos.').
+consejo_agente(neon, 'Usa Sprint para rotaciones rápidas y Slide para entrar a sitios. Fast Lane divide el mapa eficazmente.').
+consejo_agente(yoru, 'Utiliza Fakeout para engañar y Gatecrash para flanquear. Dimensional Drift permite reconocimiento seguro.').
+consejo_agente(iso, 'Aprovecha Double Tap para duelos y Kill Contract para aislar objetivos. Contingency es excelente para post-planta.').
+consejo_agente(sova, 'Aprende lineups de Recon Bolt y Shock Dart. Hunters Fury es ideal para limpiar áreas estrechas.').
+consejo_agente(breach, 'Coordina Flashpoint con tu equipo. Aftershock limpia esquinas y Rolling Thunder rompe defensas.').
+consejo_agente(skye, 'Guía Trailblazer para información y Guiding Light para cegar. Seekers revela posiciones enemigas.').
+consejo_agente(kayo, 'FLASH/drive para entradas y ZERO/point para suprimir habilidades. NULL/cmd neutraliza defensas.').
+consejo_agente(fade, 'Usa Haunt para revelar y Prowler para buscar enemigos. Nightfall es excelente para post-planta.').
+consejo_agente(gekko, 'Wingman planta/defusa la spike. Dizzy ciega múltiples ángulos. Thrash limpia posiciones.').
+consejo_agente(waylay, 'Lightspeed permite entradas rápidas y Refract te devuelve a una posición segura. Saturate ralentiza a los enemigos cercanos.').
+consejo_agente(tejo, 'Aprovecha Relampago para revelar y Cascada para empujar. Torrente controla áreas amplias.').
+consejo_agente(brimstone, 'Coloca Sky Smoke en puntos clave. Stim Beacon acelera pushes y Orbital Strike asegura post-planta.').
+consejo_agente(viper, 'Toxic Screen divide sitios. Poison Cloud bloquea ángulos clave. Pit controla post-planta.').
+consejo_agente(omen, 'Dark Cover para humos precisos. Shrouded Step para reposicionamiento. From the Shadows para flanqueos.').
+consejo_agente(astra, 'Gravity Well atrae y vulnera. Nova Pulse aturde grupos. Cosmic Divide divide el mapa.').
+consejo_agente(harbor, 'Cascade bloquea líneas de visión. High Tide crea paredes de agua. Reckoning controla áreas.').
+consejo_agente(clove, 'Pick-Me-Up revive rápidamente. Meddle desinforma. Not Dead Yet permite jugar agresivo.').
+consejo_agente(killjoy, 'Turret vigila flancos. Alarmbot + Nanoswarm es letal. Lockdown controla sitios enteros.').
+consejo_agente(cypher, 'Trapwire en flancos. Spycam para información. Neural Theft revela posiciones enemigas.').
+consejo_agente(sage, 'Barrier Wall bloquea entradas. Slow Orb retrasa pushes. Resurrection cambia rondas.').
+consejo_agente(chamber, 'Rendezvous para reposicionamiento rápido. Trademark vigila flancos. Tour De Force es letal a distancia.').
+consejo_agente(deadlock, 'GravNet bloquea rushes. Sonic Sensor detecta movimiento. Annihilation elimina grupos.').
+consejo_agente(vyse, 'Razorvine y Shear cierran pasillos tras los atacantes. Arc Rose ciega a través de paredes. Steel Garden desarma las armas principales.').
+
 % -------------------------
 % Agentes y Roles (Actualizados)
 % -------------------------
@@ -98,6 +146,7 @@ iniciador(skye).
 iniciador(fade).
 iniciador(gekko).
 iniciador(tejo).
+iniciador(waylay).
 
 % Controladores
 controlador(brimstone).
@@ -157,30 +206,31 @@ sugerir_agente(Mapa, RolDeseado, Alternativo) :-
 % Roles de los agentes
 % -------------------------
 rol(jett, duelista).
-rol(reyna, duelista).
 rol(raze, duelista).
-rol(neon, duelista).
 rol(phoenix, duelista).
+rol(reyna, duelista).
+rol(neon, duelista).
 rol(yoru, duelista).
 rol(iso, duelista).
 
 rol(sova, iniciador).
 rol(breach, iniciador).
-rol(kayo, iniciador).
 rol(skye, iniciador).
+rol(kayo, iniciador).
 rol(fade, iniciador).
 rol(gekko, iniciador).
 rol(tejo, iniciador).
+rol(waylay, iniciador).
 
 rol(brimstone, controlador).
-rol(omen, controlador).
 rol(viper, controlador).
+rol(omen, controlador).
 rol(astra, controlador).
 rol(harbor, controlador).
 rol(clove, controlador).
 
-rol(cypher, centinela).
 rol(killjoy, centinela).
+rol(cypher, centinela).
 rol(sage, centinela).
 rol(chamber, centinela).
 rol(deadlock, centinela).
@@ -190,4 +240,7 @@ rol(vyse, centinela).
 tier(s_tier, [tejo, clove, raze, vyse]).
 tier(a_tier, [yoru, deadlock, cypher, jett, iso, neon, sova, gekko, killjoy, omen, brimstone, phoenix, sage]).
 tier(b_tier, [chamber, viper, breach, skye, fade, astra, reyna]).
-tier(c_tier, [kayo, harbor]).
+tier(c_tier, [waylay, kayo, harbor]).
+
+% Nombres visibles de agentes cuyo átomo no coincide con el nombre capitalizado
+nombre_agente(kayo, 'KAY/O').
@@ -0,0 +1,46 @@
+"""Benchmark de rendimiento del motor de composiciones (equipos puntuados por segundo)"""
+
+import sys
+import time
+
+from motor_valo import CompositionEngine, STYLE_COMP_KEYS, np
+
+def measure(func, repeat=3):
+    """Ejecutar una función varias veces y devolver el mejor tiempo en segundos"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    engine = CompositionEngine()
+    maps = engine.maps
+    styles = list(STYLE_COMP_KEYS)
+    
+    # Búsqueda exhaustiva con máscaras de bits (Python puro)
+    queries = [(map_name, "Jett", style) for map_name in maps for style in styles]
+    elapsed = measure(lambda: [engine.search_teams(*query, top_k=10) for query in queries], repeat=1)
+    print(f"search_teams (bitmask): {elapsed / len(queries) * 1000:.2f} ms por consulta")
+    
+    if np is None:
+        print("NumPy no está instalado: se omite el núcleo vectorizado")
+        return 0
+    
+    # Núcleo vectorizado sobre todos los equipos posibles de cada mapa
+    teams = engine.enumerate_teams()
+    elapsed = measure(lambda: [engine.score_teams(map_name, teams, style)
+                               for map_name in maps for style in styles])
+    scored = len(teams) * len(maps) * len(styles)
+    print(f"score_teams (NumPy): {len(teams)} equipos por mapa, "
+          f"{scored / elapsed:,.0f} equipos/s")
+    
+    elapsed = measure(lambda: [engine.search_teams_vectorized(*query, top_k=10) for query in queries], repeat=1)
+    print(f"search_teams_vectorized: {elapsed / len(queries) * 1000:.2f} ms por consulta")
+    
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+"""Almacén columnar en disco de solo añadido, leído con mmap
+
+Cada campo se guarda en su propio archivo binario como un vector de enteros
+sin signo ('B', 'H' o 'I', en el orden de bytes de la máquina). Un archivo
+meta.json registra la generación actual, el número de filas y los metadatos
+del usuario, y se reescribe de forma atómica.
+
+Los archivos de columna nunca se modifican: cada cambio escribe una
+generación nueva (campo.N.bin) y después apunta meta.json a ella. Así otra
+instancia puede seguir leyendo la generación anterior mapeada mientras se
+escribe la siguiente (en Windows no se puede truncar ni reemplazar un archivo
+mapeado). Se conservan la generación actual y la anterior; las demás se
+borran cuando ya nadie las tiene abiertas.
+
+Las columnas se mapean en memoria: con numpy como np.memmap, para reducirlas
+de forma vectorizada, y sin numpy como memoryview sobre el mmap.
+"""
+
+import json
+import mmap
+import os
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # Sin numpy las columnas se recorren como memoryview
+    np = None
+
+STORE_VERSION = 2
+META_FILE = "meta.json"
+COLUMN_EXTENSION = ".bin"
+
+class ColumnStore:
+    """Tabla de columnas enteras con añadido en bloque y lectura mapeada
+    
+    fields es un diccionario {campo: código de tipo de array}.
+    """
+    def __init__(self, directory, fields):
+        self.directory = directory
+        self.fields = dict(fields)
+        self.rows = 0
+        self.generation = 0
+        self.meta = {}
+        self.maps = {}  # campo -> (archivo, mmap, vista)
+        self.load_meta()
+    
+    def __len__(self):
+        return self.rows
+    
+    def column_path(self, name, generation=None):
+        generation = self.generation if generation is None else generation
+        return os.path.join(self.directory, f"{name}.{generation}{COLUMN_EXTENSION}")
+    
+    def load_meta(self):
+        """Leer el número de filas y los metadatos; un formato distinto vacía el almacén"""
+        try:
+            with open(os.path.join(self.directory, META_FILE), encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("version") != STORE_VERSION or data.get("fields") != self.fields:
+            return
+        
+        # Una columna más corta que las filas registradas invalida el almacén
+        rows, generation = data.get("rows", 0), data.get("generation", 0)
+        for name, typecode in self.fields.items():
+            try:
+                size = os.path.getsize(self.column_path(name, generation)) if rows else 0
+            except OSError:
+                size = 0
+            if size < rows * array(typecode).itemsize:
+                return
+        
+        self.rows = rows
+        self.generation = generation
+        self.meta = data.get("meta", {})
+    
+    def save_meta(self):
+        """Escribir meta.json de forma atómica"""
+        data = {"version": STORE_VERSION, "fields": self.fields, "rows": self.rows,
+                "generation": self.generation, "meta": self.meta}
+        path = os.path.join(self.directory, META_FILE)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
+    def column(self, name):
+        """Vista mapeada de las filas válidas de una columna (np.memmap o memoryview)"""
+        if name in self.maps:
+            return self.maps[name][2]
+        
+        typecode = self.fields[name]
+        if not self.rows:
+            return np.zeros(0, dtype=typecode) if np is not None else memoryview(array(typecode))
+        
+        f = open(self.column_path(name), "rb")
+        if np is not None:
+            view = np.memmap(f, dtype=typecode, mode="r", shape=(self.rows,))
+            self.maps[name] = (f, None, view)
+        else:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            view = memoryview(mapped)[:self.rows * array(typecode).itemsize].cast(typecode)
+            self.maps[name] = (f, mapped, view)
+        return view
+    
+    def close(self):
+        """Liberar los mapas de memoria (necesario antes de reescribir las columnas)"""
+        for f, mapped, view in self.maps.values():
+            if isinstance(view, memoryview):
+                view.release()
+            if mapped is not None:
+                mapped.close()
+            f.close()
+        self.maps.clear()
+    
+    def reset(self):
+        """Vaciar el almacén en memoria sin tocar los archivos"""
+        self.close()
+        self.rows = 0
+        self.generation = 0
+        self.meta = {}
+    
+    def append(self, columns, meta=None, drop=None):
+        """Añadir un bloque de filas {campo: secuencia de enteros} y guardar meta
+        
+        drop=(campo, valores) quita antes esas filas, en la misma generación.
+        """
+        lengths = {len(values) for values in columns.values()}
+        if set(columns) != set(self.fields) or len(lengths) != 1:
+            raise ValueError("Todas las columnas deben tener el mismo número de filas")
+        
+        if drop is not None:
+            data, rows = self.kept_rows(*drop)
+        else:
+            data, rows = {name: self.read_column(name) for name in self.fields}, self.rows
+        for name, typecode in self.fields.items():
+            data[name] += to_bytes(columns[name], typecode)
+        self.write_generation(data, rows + lengths.pop(), meta)
+    
+    def delete(self, name, values, meta=None):
+        """Eliminar las filas cuyo campo name esté en values y guardar meta"""
+        if not self.rows or not values:
+            if meta is not None:
+                self.meta = meta
+                self.save_meta()
+            return
+        self.write_generation(*self.kept_rows(name, values), meta)
+    
+    def kept_rows(self, name, values):
+        """Bytes de cada columna sin las filas cuyo campo name esté en values, y cuántas quedan"""
+        values = set(values)
+        if not self.rows or not values:
+            return {field: self.read_column(field) for field in self.fields}, self.rows
+        
+        key = self.column(name)
+        if np is not None:
+            keep = ~np.isin(key, np.fromiter(values, dtype=np.int64))
+            kept = {field: self.column(field)[keep] for field in self.fields}
+        else:
+            keep = [value not in values for value in key]
+            kept = {field: array(typecode, (value for value, flag in zip(self.column(field), keep) if flag))
+                    for field, typecode in self.fields.items()}
+        return {field: to_bytes(kept[field], typecode) for field, typecode in self.fields.items()}, len(kept[name])
+    
+    def read_column(self, name):
+        """Bytes de las filas válidas de una columna, leídos sin mapear"""
+        if not self.rows:
+            return b""
+        with open(self.column_path(name), "rb") as f:
+            return f.read(self.rows * array(self.fields[name]).itemsize)
+    
+    def write_generation(self, data, rows, meta=None):
+        """Escribir las columnas {campo: bytes} como generación nueva y apuntar meta.json a ella"""
+        generation = self.generation + 1
+        os.makedirs(self.directory, exist_ok=True)
+        try:
+            for name, payload in data.items():
+                with open(self.column_path(name, generation), "wb") as f:
+                    f.write(payload)
+        except OSError:
+            self.remove_generation(generation)
+            raise
+        
+        self.close()
+        previous = (self.rows, self.generation, self.meta)
+        self.rows, self.generation = rows, generation
+        if meta is not None:
+            self.meta = meta
+        try:
+            self.save_meta()
+        except OSError:
+            self.rows, self.generation, self.meta = previous
+            self.remove_generation(generation)
+            raise
+        self.prune()
+    
+    def remove_generation(self, generation):
+        for name in self.fields:
+            try:
+                os.remove(self.column_path(name, generation))
+            except OSError:
+                pass
+    
+    def prune(self):
+        """Borrar las generaciones anteriores a la previa (fallos: se reintenta en el próximo cambio)"""
+        keep = {os.path.basename(self.column_path(name, generation))
+                for name in self.fields for generation in (self.generation, self.generation - 1)}
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            if name.endswith(COLUMN_EXTENSION) and name not in keep:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass  # Aún mapeado por otro proceso (Windows)
+
+def to_bytes(values, typecode):
+    """Bytes de una secuencia de enteros con el tipo de la columna"""
+    if np is not None:
+        return np.asarray(values, dtype=typecode).tobytes()
+    return array(typecode, values).tobytes()
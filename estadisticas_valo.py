@@ -0,0 +1,442 @@
+"""Estadísticas de agentes calculadas a partir del historial de partidas local
+
+Lee exportaciones de partidas en JSON o CSV del directorio de partidas. Cada
+fila describe la actuación de un jugador en una partida:
+    
+    match_id, map, rank, agent, won, first_blood,
+    attack_rounds_won, attack_rounds, defense_rounds_won, defense_rounds
+
+Un JSON puede ser una lista de filas o un objeto {"rows": [...]}; también se
+acepta {"matches": [{"match_id", "map", "rank", "players": [...]}]}, donde
+cada jugador hereda los campos de su partida.
+
+Las filas se codifican como enteros y se añaden en bloque a un almacén
+columnar (columnas_valo) junto con el archivo del que proceden y su tamaño y
+fecha de modificación. Al refrescar solo se leen los archivos nuevos o
+modificados; las filas de los modificados o eliminados se borran del almacén.
+Las consultas recorren las columnas mapeadas con reducciones vectorizadas y
+guardan los agregados de cada agente hasta el siguiente cambio.
+
+El pick rate es el porcentaje de equipos en los que jugó el agente. Un equipo
+es un lado de una partida (match_id y resultado) y cuenta una vez aunque la
+partida aparezca en varios archivos, así que nunca pasa del 100% aunque los
+dos equipos elijan al agente.
+
+Uso como paso de compilación:
+    python estadisticas_valo.py [directorio]
+"""
+
+import csv
+import hashlib
+import json
+import os
+import sys
+
+from columnas_valo import ColumnStore, np
+
+MATCHES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "partidas")
+STORE_DIR = ".columnas"
+MATCH_EXTENSIONS = (".json", ".csv")
+
+# Rangos en orden, con los nombres que usa la interfaz
+RANKS = ["Hierro", "Bronce", "Plata", "Oro", "Platino", "Diamante", "Ascendente", "Inmortal", "Radiante"]
+
+# Nombres alternativos (en minúsculas) de cada rango en las exportaciones
+RANK_ALIASES = {
+    "iron": "Hierro", "bronze": "Bronce", "silver": "Plata", "gold": "Oro", "platinum": "Platino",
+    "diamond": "Diamante", "ascendant": "Ascendente", "immortal": "Inmortal", "radiant": "Radiante",
+}
+RANK_ALIASES.update({rank.lower(): rank for rank in RANKS})
+
+# Porcentajes que devuelve MatchStats.agent_stats, en el orden de la interfaz
+STAT_NAMES = ["Win Rate", "Pick Rate", "First Blood Rate", "Attack Win Rate", "Defense Win Rate"]
+
+# Contadores de cada (agente, mapa, rango), en este orden; games es el número de filas
+COUNTER_FIELDS = ["games", "wins", "first_bloods", "attack_won", "attack_played", "defense_won", "defense_played"]
+
+# Columnas del almacén: archivo de origen, equipo, claves y contadores
+MATCH_COLUMNS = {
+    "source": "I", "team": "Q", "map": "H", "agent": "H", "rank": "B",
+    "wins": "B", "first_bloods": "B", "attack_won": "B", "attack_played": "B",
+    "defense_won": "B", "defense_played": "B",
+}
+MAX_ROUNDS = 255  # Tope de las columnas de rondas (un byte)
+
+class MatchDataError(ValueError):
+    """Una exportación de partidas no tiene el formato esperado"""
+
+def normalize_rank(value):
+    """Rango de la interfaz para un texto como "Gold 2" o "oro"; None si no se reconoce"""
+    words = str(value or "").strip().lower().split()
+    return RANK_ALIASES.get(words[0]) if words else None
+
+def parse_flag(value):
+    """Interpretar 1/0, true/false, sí/no o un booleano"""
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "si", "sí", "win", "victoria")
+
+def parse_count(value):
+    """Entero entre 0 y MAX_ROUNDS; vacío cuenta como 0"""
+    if value in (None, ""):
+        return 0
+    return min(MAX_ROUNDS, max(0, int(float(value))))
+
+def read_rows(path):
+    """Leer las filas de una exportación JSON o CSV"""
+    if path.endswith(".csv"):
+        # utf-8-sig: las exportaciones de Excel empiezan con BOM
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            return list(csv.DictReader(f))
+    
+    with open(path, encoding="utf-8") as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise MatchDataError(f"{os.path.basename(path)}: JSON no válido: {e}") from e
+    
+    name = os.path.basename(path)
+    if isinstance(data, dict) and "matches" in data:
+        if not isinstance(data["matches"], list):
+            raise MatchDataError(f"{name}: se esperaba una lista de partidas")
+        rows = []
+        for number, match in enumerate(data["matches"], 1):
+            players = match.get("players", []) if isinstance(match, dict) else None
+            if not isinstance(players, list) or not all(isinstance(player, dict) for player in players):
+                raise MatchDataError(f"{name}: la partida {number} no tiene una lista de jugadores")
+            for player in players:
+                row = {key: value for key, value in match.items() if key != "players"}
+                row.update(player)
+                rows.append(row)
+        return rows
+    if isinstance(data, dict):
+        data = data.get("rows", [])
+    if not isinstance(data, list):
+        raise MatchDataError(f"{name}: se esperaba una lista de filas")
+    return data
+
+def encode_rows(rows, source_id, source, map_ids, agent_ids):
+    """Codificar las filas de un archivo como columnas de enteros
+    
+    map_ids y agent_ids ({nombre en minúsculas: id}) se amplían con los nombres
+    nuevos. La columna team identifica el lado de la partida en todos los
+    archivos; una fila sin match_id es una partida propia.
+    """
+    columns = {name: [] for name in MATCH_COLUMNS}
+    
+    for number, row in enumerate(rows, 1):
+        if not isinstance(row, dict):
+            raise MatchDataError(f"{source}: la fila {number} no es un objeto")
+        agent = str(row.get("agent") or "").strip().casefold()
+        map_name = str(row.get("map") or "").strip().casefold()
+        rank = normalize_rank(row.get("rank"))
+        if not agent or not map_name or rank is None:
+            continue  # Fila incompleta o rango desconocido
+        
+        try:
+            values = [int(parse_flag(row.get("won"))), int(parse_flag(row.get("first_blood"))),
+                      parse_count(row.get("attack_rounds_won")), parse_count(row.get("attack_rounds")),
+                      parse_count(row.get("defense_rounds_won")), parse_count(row.get("defense_rounds"))]
+        except (ValueError, TypeError, OverflowError) as e:
+            # Texto, listas, infinito o NaN donde se esperaba un número
+            raise MatchDataError(f"{source}: valor no numérico en la fila {number}: {e}") from e
+        
+        match_id = row.get("match_id")
+        team = f"{match_id}\0{values[0]}" if match_id not in (None, "") else f"{source}\0{number}"
+        columns["source"].append(source_id)
+        columns["team"].append(team_key(team))
+        columns["map"].append(map_ids.setdefault(map_name, len(map_ids)))
+        columns["agent"].append(agent_ids.setdefault(agent, len(agent_ids)))
+        columns["rank"].append(RANKS.index(rank))
+        for name, value in zip(COUNTER_FIELDS[1:], values):
+            columns[name].append(value)
+    
+    return columns
+
+def team_key(team):
+    """Entero de 64 bits estable entre ejecuciones para identificar un equipo"""
+    return int.from_bytes(hashlib.blake2b(team.encode("utf-8"), digest_size=8).digest(), "little")
+
+def count_distinct(groups, keys):
+    """Número de claves distintas en cada grupo (vectores numpy): {grupo: n}"""
+    order = np.lexsort((keys, groups))
+    groups, keys = groups[order], keys[order]
+    first = np.ones(len(groups), dtype=bool)
+    first[1:] = (groups[1:] != groups[:-1]) | (keys[1:] != keys[:-1])
+    ids, counts = np.unique(groups[first], return_counts=True)
+    return dict(zip(ids.tolist(), counts.tolist()))
+
+def rate(part, total):
+    """Porcentaje redondeado, o None sin datos"""
+    return round(100 * part / total) if total else None
+
+def add_rollups(rollups, map_name, rank, values):
+    """Sumar los contadores de una celda a sus agregados con mapa y/o rango comodín (None)"""
+    for key in ((map_name, rank), (map_name, None), (None, rank), (None, None)):
+        totals = rollups.get(key)
+        if totals is None:
+            rollups[key] = list(values)
+        else:
+            for i, value in enumerate(values):
+                totals[i] += value
+
+class MatchStats:
+    """Win rate, pick rate, first blood y ataque/defensa por agente, mapa y rango
+    
+    refresh() incorpora los cambios del directorio de partidas leyendo solo los
+    archivos afectados. Cada agente se agrega con un recorrido de las columnas
+    la primera vez que se consulta; las consultas siguientes son búsquedas en
+    un diccionario hasta el próximo cambio.
+    
+    Si el almacén no se puede escribir o leer, store_error guarda el motivo y
+    las consultas se comportan como si no hubiera partidas.
+    """
+    def __init__(self, matches_dir=MATCHES_DIR, store_dir=None):
+        self.matches_dir = matches_dir
+        self.store = ColumnStore(store_dir or os.path.join(matches_dir, STORE_DIR), MATCH_COLUMNS)
+        self.errors = {}  # nombre -> mensaje del último error de lectura
+        self.store_error = None  # Error de disco que dejó el almacén vacío
+        self.load_meta()
+    
+    def __bool__(self):
+        return len(self.store) > 0
+    
+    def load_meta(self):
+        """Recuperar los diccionarios de nombres y los archivos ya incorporados"""
+        meta = self.store.meta
+        self.sources = meta.get("sources", {})  # nombre -> {"id", "stamp"}
+        self.next_source = meta.get("next_source", 0)
+        self.maps = meta.get("maps", [])
+        self.agents = meta.get("agents", [])
+        self.agent_ids = {name: i for i, name in enumerate(self.agents)}
+        self.clear_cache()
+    
+    def clear_cache(self):
+        self.agent_rollups = {}  # id de agente -> {(mapa|None, rango|None): contadores}
+        self.agent_teams = {}  # id de agente -> {(mapa|None, rango|None): equipos}
+        self.team_rollups = None  # {(mapa|None, rango|None): equipos}
+    
+    def source_files(self):
+        """Exportaciones presentes con su sello (tamaño, fecha de modificación)"""
+        try:
+            names = sorted(os.listdir(self.matches_dir))
+        except OSError:
+            return {}
+        
+        stamps = {}
+        for name in names:
+            if name.startswith(".") or not name.lower().endswith(MATCH_EXTENSIONS):
+                continue
+            try:
+                info = os.stat(os.path.join(self.matches_dir, name))
+            except OSError:
+                continue
+            stamps[name] = [info.st_size, info.st_mtime_ns]
+        return stamps
+    
+    def refresh(self):
+        """Incorporar los archivos nuevos o modificados y quitar los eliminados
+        
+        Devuelve True si los datos cambiaron.
+        """
+        stamps = self.source_files()
+        sources = {name: entry for name, entry in self.sources.items() if name in stamps}
+        stale = [entry["id"] for name, entry in self.sources.items() if name not in stamps]
+        
+        map_ids = {name: i for i, name in enumerate(self.maps)}
+        agent_ids = dict(self.agent_ids)
+        batch = {name: [] for name in MATCH_COLUMNS}
+        next_source = self.next_source
+        
+        for name, stamp in stamps.items():
+            entry = sources.get(name)
+            if entry is not None and entry["stamp"] == stamp:
+                continue
+            
+            try:
+                rows = read_rows(os.path.join(self.matches_dir, name))
+                columns = encode_rows(rows, next_source, name, map_ids, agent_ids)
+            except (OSError, UnicodeDecodeError, MatchDataError) as e:
+                # Archivo a medio escribir o dañado: se reintenta en el próximo refresco
+                self.errors[name] = str(e)
+                continue
+            self.errors.pop(name, None)
+            
+            if entry is not None:
+                stale.append(entry["id"])
+            sources[name] = {"id": next_source, "stamp": stamp}
+            next_source += 1
+            for column, values in columns.items():
+                batch[column].extend(values)
+        
+        if not stale and next_source == self.next_source:
+            return False
+        
+        meta = {"sources": sources, "next_source": next_source,
+                "maps": sorted(map_ids, key=map_ids.get), "agents": sorted(agent_ids, key=agent_ids.get)}
+        try:
+            # Una sola generación nueva: la interfaz puede seguir leyendo la anterior
+            self.store.append(batch, meta, drop=("source", stale))
+        except OSError as e:
+            # Directorio de solo lectura o disco lleno: seguir sin estadísticas locales
+            self.disable_store(e)
+            return True
+        self.load_meta()
+        return True
+    
+    def disable_store(self, error):
+        """Vaciar el almacén en memoria tras un error de disco"""
+        self.store_error = str(error)
+        self.store.reset()
+        self.load_meta()
+    
+    def cell_sums(self, rows, weights):
+        """Sumar columnas por celda (mapa, rango) en las filas indicadas
+        
+        rows es None para todas las filas. Devuelve {(id de mapa, índice de rango): sumas}.
+        """
+        store = self.store
+        if np is not None:
+            map_col, rank_col = store.column("map"), store.column("rank")
+            if rows is not None:
+                map_col, rank_col = map_col[rows], rank_col[rows]
+            cells = map_col.astype(np.intp) * len(RANKS) + rank_col
+            size = len(self.maps) * len(RANKS)
+            counts = np.bincount(cells, minlength=size)
+            sums = [counts if name is None else
+                    np.bincount(cells, weights=store.column(name) if rows is None else store.column(name)[rows],
+                                minlength=size)
+                    for name in weights]
+            return {divmod(int(cell), len(RANKS)): [int(total[cell]) for total in sums]
+                    for cell in np.flatnonzero(counts)}
+        
+        # Sin numpy: un recorrido de las vistas mapeadas
+        columns = [store.column(name) for name in weights if name is not None]
+        map_col, rank_col = store.column("map"), store.column("rank")
+        result = {}
+        for row in range(len(store)) if rows is None else rows:
+            key = (map_col[row], rank_col[row])
+            totals = result.setdefault(key, [0] * len(weights))
+            values = iter(column[row] for column in columns)
+            for i, name in enumerate(weights):
+                totals[i] += 1 if name is None else next(values)
+        return result
+    
+    def team_counts(self, rows):
+        """Equipos distintos por agregado con mapa y/o rango comodín en las filas indicadas
+        
+        rows es None para todas las filas. Devuelve {(mapa|None, rango|None): equipos}.
+        """
+        store = self.store
+        map_col, rank_col, team_col = store.column("map"), store.column("rank"), store.column("team")
+        if np is not None:
+            if rows is not None:
+                map_col, rank_col, team_col = map_col[rows], rank_col[rows], team_col[rows]
+            map_col, rank_col = map_col.astype(np.intp), rank_col.astype(np.intp)
+            cells = count_distinct(map_col * len(RANKS) + rank_col, team_col)
+            counts = {divmod(cell, len(RANKS)): n for cell, n in cells.items()}
+            counts.update(((map_id, None), n) for map_id, n in count_distinct(map_col, team_col).items())
+            counts.update(((None, rank_index), n) for rank_index, n in count_distinct(rank_col, team_col).items())
+            if len(team_col):
+                counts[(None, None)] = len(np.unique(team_col))
+        else:
+            teams = {}
+            for row in range(len(store)) if rows is None else rows:
+                map_id, rank_index = map_col[row], rank_col[row]
+                for key in ((map_id, rank_index), (map_id, None), (None, rank_index), (None, None)):
+                    teams.setdefault(key, set()).add(team_col[row])
+            counts = {key: len(values) for key, values in teams.items()}
+        
+        return {(None if map_id is None else self.maps[map_id], None if rank_index is None else RANKS[rank_index]): n
+                for (map_id, rank_index), n in counts.items()}
+    
+    def agent_rows(self, agent_id):
+        agent_col = self.store.column("agent")
+        if np is not None:
+            return np.flatnonzero(agent_col == agent_id)
+        return [row for row, value in enumerate(agent_col) if value == agent_id]
+    
+    def rollups_for(self, agent):
+        """Agregados del agente con mapa y/o rango comodín, calculados una vez por cambio"""
+        agent_id = self.agent_ids.get(agent.casefold())
+        if agent_id is None:
+            return {}
+        if agent_id in self.agent_rollups:
+            return self.agent_rollups[agent_id]
+        
+        try:
+            rows = self.agent_rows(agent_id)
+            cells = self.cell_sums(rows, [None] + COUNTER_FIELDS[1:])
+            teams = self.team_counts(rows)
+        except OSError as e:
+            # Columna borrada o ilegible desde que se cargó meta.json
+            self.disable_store(e)
+            return {}
+        
+        rollups = {}
+        for (map_id, rank_index), values in cells.items():
+            add_rollups(rollups, self.maps[map_id], RANKS[rank_index], values)
+        self.agent_rollups[agent_id] = rollups
+        self.agent_teams[agent_id] = teams
+        return rollups
+    
+    def teams_in(self, map_key, rank):
+        """Equipos distintos registrados en un mapa y rango (None = todos)"""
+        if self.team_rollups is None:
+            try:
+                self.team_rollups = self.team_counts(None)
+            except OSError as e:
+                self.disable_store(e)
+                return 0
+        return self.team_rollups.get((map_key, rank), 0)
+    
+    def pick_rate(self, agent, map_key, rank):
+        """Porcentaje de los equipos del mapa y rango en los que jugó el agente"""
+        self.rollups_for(agent)
+        teams = self.agent_teams.get(self.agent_ids.get(agent.casefold()), {})
+        return rate(teams.get((map_key, rank), 0), self.teams_in(map_key, rank))
+    
+    def agent_stats(self, agent, map_name=None, rank=None):
+        """Porcentajes del agente (opcionalmente en un mapa y/o rango)
+        
+        Devuelve None si no hay partidas del agente con esos filtros.
+        """
+        map_key = map_name.casefold() if map_name else None
+        values = self.rollups_for(agent).get((map_key, rank))
+        if not values:
+            return None
+        
+        games, wins, first_bloods, attack_won, attack_played, defense_won, defense_played = values
+        return {
+            "Win Rate": rate(wins, games),
+            "Pick Rate": self.pick_rate(agent, map_key, rank),
+            "First Blood Rate": rate(first_bloods, games),
+            "Attack Win Rate": rate(attack_won, attack_played),
+            "Defense Win Rate": rate(defense_won, defense_played),
+            "Partidas": games,
+        }
+    
+    def maps_for(self, agent):
+        """Mapas (en minúsculas) en los que hay partidas del agente"""
+        return sorted(map_key for map_key, rank in self.rollups_for(agent) if map_key is not None and rank is None)
+    
+    def rank_pick_rates(self, agent, map_name=None):
+        """Pick rate del agente en cada rango con partidas registradas"""
+        map_key = map_name.casefold() if map_name else None
+        rollups = self.rollups_for(agent)
+        return {rank: self.pick_rate(agent, map_key, rank) for rank in RANKS if rollups.get((map_key, rank))}
+
+def main():
+    matches_dir = sys.argv[1] if len(sys.argv) > 1 else MATCHES_DIR
+    stats = MatchStats(matches_dir)
+    stats.refresh()
+    for name, message in stats.errors.items():
+        print(f"Error en {name}: {message}", file=sys.stderr)
+    if stats.store_error:
+        print(f"No se pudo usar el almacén: {stats.store_error}", file=sys.stderr)
+    print(f"{len(stats.sources)} archivos, {len(stats.store)} filas, "
+          f"{stats.teams_in(None, None)} equipos, {len(stats.agents)} agentes")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+"""Historial persistente de composiciones generadas (SQLite)
+
+Las composiciones se encolan y un hilo escritor las inserta por lotes en una
+sola transacción, así que generar una composición no espera al disco. Las
+lecturas se hacen por páginas y usan índices sobre mapa, agente, estilo y
+fecha, de modo que el historial puede crecer durante años sin cargarse entero
+en memoria.
+
+Uso:
+    python historial_valo.py [archivo]
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+
+HISTORY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "historial.sqlite3")
+
+# El escritor agrupa lo que llegue en este intervalo, hasta WRITE_BATCH_SIZE filas
+WRITE_BATCH_DELAY = 0.2
+WRITE_BATCH_SIZE = 500
+
+# Columnas por las que se puede filtrar u ordenar, con su nombre en la tabla
+HISTORY_COLUMNS = {"timestamp": "created", "map": "map", "agent": "agent", "style": "style"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS compositions (
+    id INTEGER PRIMARY KEY,
+    created REAL NOT NULL,
+    map TEXT NOT NULL,
+    agent TEXT NOT NULL,
+    style TEXT NOT NULL,
+    composition TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS compositions_created ON compositions (created);
+CREATE INDEX IF NOT EXISTS compositions_map ON compositions (map, created);
+CREATE INDEX IF NOT EXISTS compositions_agent ON compositions (agent, created);
+CREATE INDEX IF NOT EXISTS compositions_style ON compositions (style, created);
+"""
+
+# Base en memoria compartida entre las conexiones de una instancia, si el archivo no se puede usar
+MEMORY_URI = "file:historial-{}?mode=memory&cache=shared"
+
+# Marca que pide al escritor guardar el lote sin esperar a que se complete
+FLUSH = object()
+
+INSERT = "INSERT INTO compositions (created, map, agent, style, composition) VALUES (?, ?, ?, ?, ?)"
+
+def connect(path):
+    conn = sqlite3.connect(path, uri=path.startswith("file:"))
+    # WAL: las lecturas de la interfaz no esperan a las escrituras del hilo escritor
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+def open_history(path):
+    """Conexión con el esquema creado; lanza sqlite3.Error u OSError si no se puede"""
+    conn = connect(path)
+    try:
+        with conn:
+            conn.executescript(SCHEMA)
+    except sqlite3.Error:
+        conn.close()
+        raise
+    return conn
+
+def where_clause(filters):
+    """Condición SQL y parámetros para {columna: valor} (valores None se ignoran)"""
+    conditions, params = [], []
+    for name, value in (filters or {}).items():
+        if value is None:
+            continue
+        if name not in HISTORY_COLUMNS:
+            raise ValueError(f"Columna de historial desconocida: {name}")
+        conditions.append(f"{HISTORY_COLUMNS[name]} = ?")
+        params.append(value)
+    return (" WHERE " + " AND ".join(conditions) if conditions else ""), params
+
+def order_keys(sort):
+    """Claves del orden de una página: la elegida, la fecha y el id
+    
+    Coinciden con los índices (columna, created) más el rowid, así que cada
+    página continúa por el índice desde la última fila de la anterior.
+    """
+    if sort not in HISTORY_COLUMNS:
+        raise ValueError(f"Columna de historial desconocida: {sort}")
+    keys = [sort] if sort == "timestamp" else [sort, "timestamp"]
+    return keys + ["id"]
+
+def row_to_entry(row):
+    entry_id, created, map_name, agent, style, composition = row
+    return {"id": entry_id, "timestamp": created, "map": map_name, "agent": agent,
+            "style": style, "composition": json.loads(composition)}
+
+class CompositionHistory:
+    """Historial de composiciones con escritura por lotes en segundo plano
+    
+    Las lecturas se hacen desde el hilo que creó el objeto; add() puede
+    llamarse desde cualquiera. Si el archivo no se puede abrir (carpeta de
+    solo lectura, base bloqueada o dañada) el historial vive en memoria
+    durante la sesión y error guarda el motivo.
+    """
+    def __init__(self, path=HISTORY_FILE):
+        self.path = path
+        self.error = None  # Último error de la base de datos
+        try:
+            self.conn = open_history(path)
+        except (sqlite3.Error, OSError) as e:
+            self.error = e
+            self.path = MEMORY_URI.format(id(self))
+            self.conn = open_history(self.path)
+        
+        self.last_entry = None
+        self.closed = False
+        self.queue = queue.Queue()
+        self.writer = threading.Thread(target=self.run_writer, name="historial", daemon=True)
+        self.writer.start()
+    
+    def add(self, entry, timestamp=None):
+        """Encolar una composición {"map", "agent", "style", "composition"}"""
+        if self.closed:
+            raise ValueError("El historial está cerrado")
+        entry = dict(entry, timestamp=time.time() if timestamp is None else timestamp)
+        # last() la leerá de la base, con su id como las demás páginas
+        self.last_entry = None
+        self.queue.put((entry["timestamp"], entry["map"], entry["agent"], entry["style"],
+                        json.dumps(entry["composition"], ensure_ascii=False)))
+    
+    def run_writer(self):
+        """Insertar las composiciones encoladas por lotes hasta recibir None"""
+        try:
+            conn = connect(self.path)
+        except sqlite3.Error as e:
+            self.error = e
+            return
+        running = True
+        while running:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + WRITE_BATCH_DELAY
+            while batch[-1] is not None and batch[-1] is not FLUSH and len(batch) < WRITE_BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            
+            running = batch[-1] is not None
+            rows = [row for row in batch if isinstance(row, tuple)]
+            try:
+                if rows:
+                    with conn:
+                        conn.executemany(INSERT, rows)
+            except sqlite3.Error as e:
+                # Base de datos bloqueada o disco lleno: se pierde el lote pero no el hilo
+                self.error = e
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+        conn.close()
+    
+    def flush(self):
+        """Escribir ya las composiciones encoladas y esperar a que terminen"""
+        # Sin escritor (cerrado o sin conexión) nadie vaciaría la cola
+        if self.queue.unfinished_tasks and self.writer.is_alive():
+            self.queue.put(FLUSH)
+            self.queue.join()
+    
+    def close(self):
+        """Escribir lo pendiente y cerrar las conexiones"""
+        self.closed = True
+        if self.writer.is_alive():
+            self.queue.put(None)
+            self.writer.join()
+        self.conn.close()
+    
+    def last(self):
+        """Composición más reciente, o None si el historial está vacío"""
+        if self.last_entry is None:
+            entries = self.page(1)
+            self.last_entry = entries[0] if entries else None
+        return self.last_entry
+    
+    def count(self, filters=None):
+        """Número de composiciones que cumplen los filtros"""
+        self.flush()
+        where, params = where_clause(filters)
+        return self.conn.execute(f"SELECT COUNT(*) FROM compositions{where}", params).fetchone()[0]
+    
+    def page(self, limit, after=None, sort="timestamp", descending=True, filters=None):
+        """Página de composiciones ordenada por una de HISTORY_COLUMNS
+        
+        after es la última composición de la página anterior (None para la
+        primera); la consulta sigue desde ella en vez de saltar filas con
+        OFFSET, y las composiciones añadidas entretanto no desplazan las páginas.
+        """
+        self.flush()
+        where, params = where_clause(filters)
+        keys = order_keys(sort)
+        columns = [HISTORY_COLUMNS.get(key, key) for key in keys]
+        if after is not None:
+            condition = f"({', '.join(columns)}) {'<' if descending else '>'} ({', '.join('?' * len(keys))})"
+            where += f" AND {condition}" if where else f" WHERE {condition}"
+            params += [after[key] for key in keys]
+        
+        order = "DESC" if descending else "ASC"
+        rows = self.conn.execute(
+            f"SELECT id, created, map, agent, style, composition FROM compositions{where} "
+            f"ORDER BY {', '.join(f'{column} {order}' for column in columns)} LIMIT ?",
+            params + [limit])
+        return [row_to_entry(row) for row in rows]
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else HISTORY_FILE
+    history = CompositionHistory(path)
+    try:
+        print(f"{history.count()} composiciones en {path}")
+        for entry in history.page(10):
+            when = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["timestamp"]))
+            print(f"{when}  {entry['map']:<10} {entry['agent']:<10} {entry['style']:<12} "
+                  f"{', '.join(entry['composition'])}")
+    finally:
+        history.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,458 @@
+"""Almacén de imágenes de agentes y mapas con decodificación bajo demanda
+
+Uso como paso de compilación del atlas de tarjetas:
+    python imagenes_valo.py
+"""
+
+import glob
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+
+from PyQt5.QtCore import Qt, QObject, QRect, QRunnable, QSize, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QImage, QPainter, QPixmap
+
+# Tamaño máximo de las imágenes en las tarjetas (factor de escala 1.2)
+AGENT_THUMBNAIL_SIZE = QSize(96, 96)
+MAP_THUMBNAIL_SIZE = QSize(192, 108)
+
+# Subdirectorio (dentro del de imágenes) con las miniaturas ya reducidas
+THUMBNAIL_DIR = ".miniaturas"
+
+# Atlas con las miniaturas de todas las tarjetas (el índice va en un bloque de texto del PNG)
+ATLAS_FILE = "atlas.png"
+ATLAS_VERSION = 1
+ATLAS_WIDTH = 1024
+ATLAS_PADDING = 1
+
+# Memoria máxima de la caché de QPixmap compartida (bytes)
+PIXMAP_CACHE_BYTES = 32 * 1024 * 1024
+
+# Prioridad del pool para pre-generar miniaturas: detrás de las que pide la interfaz
+PRERENDER_PRIORITY = -1
+
+# Hilos máximos del pool propio de cada almacén de imágenes
+DECODE_THREADS = 4
+
+def thumbnail_cache_path(cache_dir, source_path, size):
+    """Ruta de la miniatura en disco, ligada al mtime y tamaño del original"""
+    stat = os.stat(source_path)
+    stamp = hashlib.sha1(f"{stat.st_mtime_ns}:{stat.st_size}".encode("utf-8")).hexdigest()[:10]
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    return os.path.join(cache_dir, f"{stem}-{size.width()}x{size.height()}-{stamp}.png")
+
+def save_thumbnail(image, cache_path):
+    """Guardar una miniatura de forma atómica y borrar las de versiones anteriores"""
+    prefix = cache_path.rsplit("-", 1)[0]
+    tmp_path = f"{cache_path}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        if not image.save(tmp_path, "PNG"):
+            return
+        os.replace(tmp_path, cache_path)
+        for old_path in glob.glob(glob.escape(prefix) + "-*.png"):
+            if old_path != cache_path:
+                os.remove(old_path)
+    except OSError:
+        pass  # Sin caché en disco (p. ej. directorio de solo lectura)
+
+def load_thumbnail(source_path, size, cache_dir):
+    """Leer la miniatura de disco o generarla desde el original y guardarla"""
+    try:
+        cache_path = thumbnail_cache_path(cache_dir, source_path, size)
+    except OSError:
+        return QImage()
+    
+    if os.path.exists(cache_path):
+        image = QImage(cache_path)
+        if not image.isNull():
+            return image
+    
+    image = QImage(source_path)
+    if image.isNull():
+        return image
+    image = image.scaled(size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    save_thumbnail(image, cache_path)
+    return image
+
+def atlas_key(file_name, size):
+    return f"{file_name}@{size.width()}x{size.height()}"
+
+def atlas_stamp(images_dir, entries):
+    """Hash de los originales (nombre, tamaño pedido, mtime y bytes) de un atlas"""
+    digest = hashlib.sha1()
+    for file_name, size in entries:
+        try:
+            stat = os.stat(os.path.join(images_dir, file_name))
+        except OSError:
+            continue
+        digest.update(f"{atlas_key(file_name, size)}:{stat.st_mtime_ns}:{stat.st_size};".encode("utf-8"))
+    return digest.hexdigest()
+
+def pack_atlas(images_dir, entries, atlas_path):
+    """Empaquetar las miniaturas de entries [(archivo, tamaño)] en un único PNG
+    
+    Las miniaturas se colocan por estantes (filas de altura fija) ordenadas
+    de mayor a menor altura. Devuelve el número de imágenes empaquetadas.
+    """
+    cache_dir = os.path.join(images_dir, THUMBNAIL_DIR)
+    sprites = []
+    for file_name, size in entries:
+        image = load_thumbnail(os.path.join(images_dir, file_name), size, cache_dir)
+        if not image.isNull():
+            sprites.append((atlas_key(file_name, size), image))
+    sprites.sort(key=lambda sprite: -sprite[1].height())
+    
+    # Colocación por estantes
+    rects = {}
+    x = y = shelf_height = 0
+    for key, image in sprites:
+        if x + image.width() > ATLAS_WIDTH:
+            x, y, shelf_height = 0, y + shelf_height + ATLAS_PADDING, 0
+        rects[key] = [x, y, image.width(), image.height()]
+        x += image.width() + ATLAS_PADDING
+        shelf_height = max(shelf_height, image.height())
+    
+    atlas = QImage(ATLAS_WIDTH, max(y + shelf_height, 1), QImage.Format_ARGB32_Premultiplied)
+    atlas.fill(Qt.transparent)
+    painter = QPainter(atlas)
+    for key, image in sprites:
+        painter.drawImage(rects[key][0], rects[key][1], image)
+    painter.end()
+    
+    index = {"version": ATLAS_VERSION, "stamp": atlas_stamp(images_dir, entries), "rects": rects}
+    atlas.setText("atlas", json.dumps(index))
+    
+    tmp_path = f"{atlas_path}.{threading.get_ident()}.tmp"
+    try:
+        if not atlas.save(tmp_path, "PNG"):
+            raise OSError(f"No se pudo escribir {tmp_path}")
+        os.replace(tmp_path, atlas_path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return len(sprites)
+
+class ImageAtlas:
+    """Atlas de miniaturas cargado con una sola lectura y una sola decodificación"""
+    def __init__(self, image, index):
+        self.image = image
+        self.stamp = index["stamp"]
+        self.rects = {key: QRect(*rect) for key, rect in index["rects"].items()}
+    
+    @classmethod
+    def load(cls, path):
+        """Leer el atlas, o None si no existe o no es válido"""
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        
+        image = QImage.fromData(data, "PNG")
+        try:
+            index = json.loads(image.text("atlas"))
+        except ValueError:
+            return None
+        if image.isNull() or index.get("version") != ATLAS_VERSION:
+            return None
+        return cls(image, index)
+    
+    def sub_image(self, file_name, size):
+        """Copia del rectángulo de una miniatura, o None si no está en el atlas"""
+        rect = self.rects.get(atlas_key(file_name, size))
+        return self.image.copy(rect) if rect is not None else None
+
+class PixmapCache:
+    """Caché LRU de QPixmap ya escalados, compartida por todos los widgets
+    
+    La clave es (recurso, ancho, alto, device pixel ratio), de modo que cada
+    imagen se convierte y escala una sola vez por tamaño en toda la sesión.
+    Solo debe usarse desde el hilo de la interfaz.
+    """
+    def __init__(self, max_bytes=PIXMAP_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.pixmaps = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def scaled(self, asset, image, size, device_pixel_ratio=1.0):
+        """Obtener image escalada para caber en size (en píxeles lógicos)"""
+        key = (asset, size.width(), size.height(), device_pixel_ratio)
+        if key in self.pixmaps:
+            self.pixmaps.move_to_end(key)
+            self.hits += 1
+            return self.pixmaps[key]
+        
+        self.misses += 1
+        target = size * device_pixel_ratio
+        if image.size() != image.size().scaled(target, Qt.KeepAspectRatio):
+            image = image.scaled(target, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(device_pixel_ratio)
+        
+        self.pixmaps[key] = pixmap
+        self.total_bytes += self.pixmap_bytes(pixmap)
+        while self.total_bytes > self.max_bytes and len(self.pixmaps) > 1:
+            _, evicted = self.pixmaps.popitem(last=False)
+            self.total_bytes -= self.pixmap_bytes(evicted)
+            self.evictions += 1
+        return pixmap
+    
+    def discard(self, asset):
+        """Olvidar todos los tamaños de un recurso (p. ej. si cambió su archivo)"""
+        for key in [key for key in self.pixmaps if key[0] == asset]:
+            self.total_bytes -= self.pixmap_bytes(self.pixmaps.pop(key))
+    
+    def clear(self):
+        """Vaciar la caché y sus estadísticas"""
+        self.pixmaps.clear()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def cache_info(self):
+        """Obtener estadísticas de la caché"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self.pixmaps),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes
+        }
+    
+    @staticmethod
+    def pixmap_bytes(pixmap):
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+# Caché única para todo el proceso
+pixmap_cache = PixmapCache()
+
+class DecodeSignals(QObject):
+    """Señales de las tareas de decodificación; vive en el hilo de la interfaz"""
+    decoded = pyqtSignal(object, QImage)  # (nombre, ancho, alto), imagen
+
+class DecodeTask(QRunnable):
+    """Decodificar una imagen, o cargar su miniatura, en un hilo del pool"""
+    def __init__(self, signals, key, path, size=None, cache_dir=None):
+        super().__init__()
+        self.signals = signals
+        self.key = key
+        self.path = path
+        self.size = size
+        self.cache_dir = cache_dir
+    
+    def run(self):
+        # Sin señales es una pre-generación: basta con dejar la miniatura en disco
+        if self.signals is None:
+            try:
+                cached = os.path.exists(thumbnail_cache_path(self.cache_dir, self.path, self.size))
+            except OSError:
+                return
+            if not cached:
+                load_thumbnail(self.path, self.size, self.cache_dir)
+            return
+        
+        # QImage es seguro fuera del hilo de la interfaz (QPixmap no)
+        if self.size is None:
+            image = QImage(self.path)
+        else:
+            image = load_thumbnail(self.path, self.size, self.cache_dir)
+        self.signals.decoded.emit(self.key, image)
+
+class AtlasTask(QRunnable):
+    """Comprobar el atlas en segundo plano y regenerarlo si los originales cambiaron"""
+    def __init__(self, images_dir, entries, atlas_path, current_stamp=None):
+        super().__init__()
+        self.images_dir = images_dir
+        self.entries = entries
+        self.atlas_path = atlas_path
+        self.current_stamp = current_stamp
+    
+    def run(self):
+        if atlas_stamp(self.images_dir, self.entries) != self.current_stamp:
+            try:
+                pack_atlas(self.images_dir, self.entries, self.atlas_path)
+            except OSError:
+                pass  # Sin permisos de escritura: se vuelve a intentar en el siguiente arranque
+
+class ImageStore(Mapping):
+    """Diccionario de imágenes que solo decodifica un archivo la primera vez que se pide
+    
+    Al crearse solo se lista el directorio una vez para saber qué archivos
+    existen. Cada clave conocida devuelve un QImage o None si no hay imagen
+    (para que la interfaz dibuje un placeholder).
+    
+    request() decodifica en un QThreadPool propio del almacén (no el global:
+    Qt reparte el escalado de QImage entre los hilos del pool global, y si
+    estos quedan detrás de tareas de Python que esperan al GIL la interfaz se
+    bloquea) y entrega la imagen, o una miniatura del tamaño pedido, en el
+    hilo de la interfaz. Las miniaturas se guardan en disco y en los
+    siguientes arranques se leen ya reducidas; si hay un atlas, las
+    miniaturas que contiene se recortan de él sin tocar disco.
+    """
+    def __init__(self, images_dir, file_keys, pool=None, atlas=None):
+        self.images_dir = images_dir
+        self.atlas = atlas
+        self.file_names = {name: f"{key}.png" for name, key in file_keys.items()}
+        self.cache_dir = os.path.join(images_dir, THUMBNAIL_DIR)
+        self.images = {}
+        self.thumbnails = {}
+        self.pending = {}
+        if pool is None:
+            pool = QThreadPool()
+            pool.setMaxThreadCount(min(DECODE_THREADS, max(1, QThreadPool.globalInstance().maxThreadCount())))
+        self.pool = pool
+        self.signals = DecodeSignals()
+        self.signals.decoded.connect(self.on_decoded)
+        
+        try:
+            self.available = set(os.listdir(images_dir))
+        except OSError:
+            self.available = set()
+    
+    def __getitem__(self, name):
+        if name not in self.file_names:
+            raise KeyError(name)
+        if name not in self.images:
+            self.images[name] = self.decode(name)
+        return self.images[name]
+    
+    def __contains__(self, name):
+        # Sin decodificar: Mapping.__contains__ llamaría a __getitem__
+        return name in self.file_names
+    
+    def __iter__(self):
+        return iter(self.file_names)
+    
+    def __len__(self):
+        return len(self.file_names)
+    
+    def add(self, name, file_key):
+        """Registrar una clave nueva (p. ej. un agente añadido al recargar)"""
+        file_name = f"{file_key}.png"
+        self.file_names[name] = file_name
+        self.images.pop(name, None)
+        pixmap_cache.discard(name)
+        for key in [key for key in self.thumbnails if key[0] == name]:
+            del self.thumbnails[key]
+        if os.path.exists(os.path.join(self.images_dir, file_name)):
+            self.available.add(file_name)
+    
+    def has_image(self, name):
+        """Saber si existe el archivo sin decodificarlo"""
+        return self.file_names.get(name) in self.available
+    
+    def is_loaded(self, name):
+        """Saber si la imagen ya se decodificó"""
+        return name in self.images
+    
+    def request(self, name, callback, size=None):
+        """Pedir la imagen (o una miniatura que quepa en size) sin bloquear la interfaz
+        
+        callback(image) se llama en el hilo de la interfaz: de inmediato si ya
+        está decodificada o al terminar la tarea en el pool. Si no hay archivo
+        no se llama y el llamador conserva su placeholder.
+        """
+        if not self.has_image(name):
+            return
+        
+        key = (name, size.width(), size.height()) if size is not None else (name, 0, 0)
+        cache = self.images if size is None else self.thumbnails
+        cache_key = name if size is None else key
+        if cache_key not in cache and size is not None:
+            self.load_from_atlas(name, size)
+        if cache_key in cache:
+            callback(cache[cache_key])
+            return
+        
+        # Agrupar peticiones de la misma imagen en una sola tarea
+        if key in self.pending:
+            self.pending[key].append(callback)
+            return
+        self.pending[key] = [callback]
+        path = os.path.join(self.images_dir, self.file_names[name])
+        self.pool.start(DecodeTask(self.signals, key, path, size, self.cache_dir))
+    
+    def cached_thumbnail(self, name, size):
+        """Miniatura ya disponible en memoria o en el atlas, sin leer disco"""
+        key = (name, size.width(), size.height())
+        if key not in self.thumbnails and self.has_image(name):
+            self.load_from_atlas(name, size)
+        return self.thumbnails.get(key)
+    
+    def load_from_atlas(self, name, size):
+        """Recortar del atlas la miniatura de name si está empaquetada"""
+        if self.atlas is not None:
+            image = self.atlas.sub_image(self.file_names[name], size)
+            if image is not None:
+                self.thumbnails[(name, size.width(), size.height())] = image
+    
+    def atlas_entries(self, size):
+        """Entradas (archivo, tamaño) de esta colección para empaquetar en el atlas"""
+        return [(self.file_names[name], size) for name in self.file_names if self.has_image(name)]
+    
+    def prerender(self, sizes):
+        """Generar en segundo plano las miniaturas en disco que aún no existan"""
+        for name in self.file_names:
+            if not self.has_image(name):
+                continue
+            path = os.path.join(self.images_dir, self.file_names[name])
+            for size in sizes:
+                self.pool.start(DecodeTask(None, None, path, size, self.cache_dir), PRERENDER_PRIORITY)
+    
+    def on_decoded(self, key, image):
+        """Guardar una imagen terminada y avisar a quienes la pidieron"""
+        name, width, height = key
+        image = None if image.isNull() else image
+        if image is None:
+            print(f"Error cargando imagen para {name}")
+        elif width:
+            self.thumbnails[key] = image
+        else:
+            self.images[name] = image
+        
+        for callback in self.pending.pop(key, []):
+            if image is None:
+                continue
+            try:
+                callback(image)
+            except RuntimeError:
+                pass  # El widget se destruyó antes de terminar la decodificación
+    
+    def decode(self, name):
+        """Leer y decodificar el archivo de una clave"""
+        if not self.has_image(name):
+            return None
+        
+        image = QImage(os.path.join(self.images_dir, self.file_names[name]))
+        if image.isNull():
+            print(f"Error cargando imagen para {name}")
+            return None
+        return image
+
+def main():
+    from motor_valo import CompositionEngine
+    
+    images_dir = "imagenes"
+    engine = CompositionEngine()
+    agent_images = ImageStore(images_dir, {agent: engine.catalog.image_key(agent) for agent in engine.all_agents})
+    map_images = ImageStore(images_dir, {map_name: map_name.lower() for map_name in engine.maps})
+    
+    entries = agent_images.atlas_entries(AGENT_THUMBNAIL_SIZE) + map_images.atlas_entries(MAP_THUMBNAIL_SIZE)
+    atlas_path = os.path.join(images_dir, ATLAS_FILE)
+    count = pack_atlas(images_dir, entries, atlas_path)
+    print(f"Atlas escrito en {atlas_path} ({count} imágenes, {os.path.getsize(atlas_path)} bytes)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
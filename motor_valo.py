@@ -0,0 +1,965 @@
+"""Motor de recomendación de composiciones sin dependencias de interfaz gráfica"""
+
+import heapq
+import itertools
+import os
+import random
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+
+from prolog_valo import load_knowledge_base
+from snapshot_valo import SnapshotError, hash_sources, read_snapshot, write_snapshot
+
+try:
+    import numpy as np
+except ImportError:  # El núcleo vectorizado es opcional
+    np = None
+
+# Archivos de la base de conocimiento, relativos al directorio del módulo
+KB_DIR = os.path.dirname(os.path.abspath(__file__))
+KB_FILES = ["Valorant.pl"]
+
+# Instantánea compilada de las tablas; depende también del código que las genera
+SNAPSHOT_FILE = "Valorant.kb"
+SNAPSHOT_CODE_FILES = ["motor_valo.py", "prolog_valo.py", "snapshot_valo.py"]
+SNAPSHOT_TABLES = ["agents_by_role", "maps", "map_comps", "tier_list", "synergies",
+                   "agent_tips", "agent_details"]
+
+# Tablas derivadas que se sustituyen junto con las de la instantánea al recargar
+DERIVED_TABLES = ["agent_roles", "all_agents", "catalog", "map_details",
+                  "search_agents", "search_index", "search_roles", "synergy_masks"]
+
+# Composiciones que debe definir cada mapa en composicion/3
+MAP_COMP_KEYS = ["pro", "ranked", "alt", "aggressive", "defensive"]
+
+# Claves de composición para cada estilo de juego
+STYLE_COMP_KEYS = {
+    "Balanceada": "pro",
+    "Agresiva": "aggressive",
+    "Defensiva": "defensive"
+}
+
+# Orden de roles usado para presentar y puntuar equipos
+ROLE_ORDER = ["Duelista", "Iniciador", "Controlador", "Centinela"]
+
+# Orden de tiers de mejor a peor; los agentes sin tier van al final
+TIER_ORDER = ["S-Tier", "A-Tier", "B-Tier", "C-Tier"]
+UNRANKED_TIER = "No clasificado"
+UNKNOWN_ROLE = "Desconocido"
+
+# Peso de cada tier en la puntuación de un equipo
+TIER_WEIGHTS = {
+    "S-Tier": 3.0,
+    "A-Tier": 2.0,
+    "B-Tier": 1.0,
+    "C-Tier": 0.0
+}
+
+# Pesos de los términos de la búsqueda exhaustiva
+SEARCH_WEIGHTS = {
+    "role": 2.0,     # Por cada rol cubierto
+    "tier": 1.0,     # Por peso de tier de cada agente
+    "synergy": 1.5,  # Por cada pareja con sinergia
+    "map": 1.0       # Por afinidad del agente con el mapa
+}
+
+# Bonificación por rol según el estilo de juego
+STYLE_ROLE_BONUS = {
+    "Balanceada": {},
+    "Agresiva": {"Duelista": 1.0},
+    "Defensiva": {"Centinela": 1.0}
+}
+
+# Máximo de agentes del mismo rol en un equipo legal
+MAX_PER_ROLE = 2
+
+TEAM_SIZE = 5
+
+class AgentCatalog:
+    """Catálogo inmutable de agentes indexado por enteros
+    
+    Se construye una sola vez a partir de los roles y la tier list y resuelve
+    en O(1) el índice, rol, tier, posición de tier y clave de imagen de cada
+    agente. Los agentes se ordenan alfabéticamente, igual que all_agents.
+    """
+    __slots__ = ("names", "roles", "role_ids", "tiers", "tier_ranks", "image_keys", "indices")
+    
+    def __init__(self, agents_by_role, tier_list):
+        agent_roles = {agent: role for role, agents in agents_by_role.items() for agent in agents}
+        agent_tiers = {agent: tier for tier, agents in tier_list.items() for agent in agents}
+        names = tuple(sorted(agent_roles))
+        tiers = tuple(agent_tiers.get(agent, UNRANKED_TIER) for agent in names)
+        
+        set_slot = object.__setattr__
+        set_slot(self, "names", names)
+        set_slot(self, "roles", tuple(agent_roles[agent] for agent in names))
+        set_slot(self, "role_ids", tuple(ROLE_ORDER.index(role) if role in ROLE_ORDER else len(ROLE_ORDER)
+                                         for role in self.roles))
+        set_slot(self, "tiers", tiers)
+        set_slot(self, "tier_ranks", tuple(TIER_ORDER.index(tier) if tier in TIER_ORDER else len(TIER_ORDER)
+                                           for tier in tiers))
+        set_slot(self, "image_keys", tuple(agent.lower().replace("/", "") for agent in names))  # Manejar KAY/O
+        set_slot(self, "indices", MappingProxyType({agent: i for i, agent in enumerate(names)}))
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("AgentCatalog es inmutable")
+    
+    def __len__(self):
+        return len(self.names)
+    
+    def __contains__(self, agent):
+        return agent in self.indices
+    
+    def __iter__(self):
+        return iter(self.names)
+    
+    def index(self, agent):
+        """Obtener el índice entero de un agente"""
+        return self.indices[agent]
+    
+    def role(self, agent):
+        """Obtener el rol de un agente"""
+        i = self.indices.get(agent)
+        return UNKNOWN_ROLE if i is None else self.roles[i]
+    
+    def tier(self, agent):
+        """Obtener el tier de un agente"""
+        i = self.indices.get(agent)
+        return UNRANKED_TIER if i is None else self.tiers[i]
+    
+    def tier_rank(self, agent):
+        """Obtener la posición del tier de un agente (0 = S-Tier)"""
+        i = self.indices.get(agent)
+        return len(TIER_ORDER) if i is None else self.tier_ranks[i]
+    
+    def image_key(self, agent):
+        """Obtener el nombre base del archivo de imagen de un agente"""
+        i = self.indices.get(agent)
+        return agent.lower().replace("/", "") if i is None else self.image_keys[i]
+    
+    def role_counts(self, composition):
+        """Contar agentes por rol (en el orden de ROLE_ORDER) en una sola pasada"""
+        counts = [0] * (len(ROLE_ORDER) + 1)
+        for agent in composition:
+            i = self.indices.get(agent)
+            counts[len(ROLE_ORDER) if i is None else self.role_ids[i]] += 1
+        return counts[:len(ROLE_ORDER)]
+
+class CompositionEngine:
+    """Motor puro en Python que genera composiciones a partir de los datos de meta
+    
+    En modo determinista (por defecto) cada consulta usa un generador aleatorio
+    derivado de la semilla y de la propia consulta, de modo que la misma entrada
+    produce siempre el mismo equipo y el resultado se puede memorizar.
+    """
+    def __init__(self, seed=None, deterministic=True, cache_size=1024, kb_paths=None,
+                 use_snapshot=True, snapshot_path=None):
+        if kb_paths is None:
+            kb_paths = [os.path.join(KB_DIR, name) for name in KB_FILES]
+        self.kb_paths = list(kb_paths)
+        self.use_snapshot = use_snapshot
+        self.snapshot_path = snapshot_path or os.path.join(KB_DIR, SNAPSHOT_FILE)
+        self.seed = seed
+        self.deterministic = deterministic
+        self.cache_size = cache_size
+        self.rng = random.Random(seed)
+        
+        # Protege el intercambio de tablas durante una recarga en caliente
+        self._lock = threading.RLock()
+        
+        # Memoización LRU de recomendaciones
+        self._cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
+        self.load_data()
+    
+    def load_data(self):
+        """Cargar datos de agentes, mapas y composiciones desde la base de conocimiento"""
+        tables = self.load_snapshot() if self.use_snapshot else None
+        if tables is None:
+            # Compilar desde las fuentes y guardar la instantánea para el próximo arranque
+            self.load_facts(load_knowledge_base(self.kb_paths))
+            self.build_catalog()
+            self.build_agent_details()
+            if self.use_snapshot:
+                try:
+                    self.save_snapshot()
+                except OSError:
+                    pass  # Sin permisos de escritura: se vuelve a compilar en el siguiente arranque
+        else:
+            for name in SNAPSHOT_TABLES:
+                setattr(self, name, tables[name])
+            self.build_catalog()
+        
+        # Map callouts and strategies
+        self.map_details = {
+            "Ascent": {
+                "location": "Italia",
+                "callouts": ["A Main", "A Lobby", "Catwalk", "Heaven", "Hell", "Mid", "Market", "B Main"],
+                "attack_strategies": [
+                    "Tomar control de Mid para dividir defensas",
+                    "Ejecutar rápido en A con humos en Heaven y Hell",
+                    "Fake A, rotación a B a través de Market"
+                ],
+                "defense_strategies": [
+                    "Mantener control de Mid con operador",
+                    "Utilidad de Killjoy en B para retrasar pushes",
+                    "Jugar retake en A con utilidad guardada"
+                ]
+            },
+            # Añadir más mapas según sea necesario
+        }
+        
+        self.clear_cache()
+        
+        # Tablas de bits para la búsqueda exhaustiva de equipos
+        self.build_search_tables()
+    
+    def build_catalog(self):
+        """Derivar el mapa de roles, la lista de agentes y el catálogo indexado"""
+        # Agent roles mapping
+        self.agent_roles = {}
+        for role, agents in self.agents_by_role.items():
+            for agent in agents:
+                self.agent_roles[agent] = role
+        
+        # Get all agents for selection
+        self.all_agents = []
+        for role_agents in self.agents_by_role.values():
+            self.all_agents.extend(role_agents)
+        self.all_agents.sort()
+        
+        # Catálogo indexado para búsquedas de rol y tier en O(1)
+        self.catalog = AgentCatalog(self.agents_by_role, self.tier_list)
+    
+    def build_agent_details(self):
+        """Generar habilidades y descripciones de cada agente"""
+        # Agent abilities and descriptions
+        self.agent_details = {}
+        
+        # Crear datos detallados para cada agente
+        for agent in self.all_agents:
+            role = self.catalog.role(agent)
+            tier = self.catalog.tier(agent)
+            
+            # Crear datos básicos
+            self.agent_details[agent] = {
+                "role": role,
+                "tier": tier,
+                "abilities": self.generate_abilities(agent, role),
+                "description": self.generate_description(agent, role)
+            }
+        
+        # Añadir datos específicos para algunos agentes
+        if "Jett" in self.agent_details:
+            self.agent_details["Jett"].update({
+                "real_name": "Sunwoo Han",
+                "origin": "Corea del Sur",
+                "playstyle": "Agresivo, entrada rápida, operador",
+                "description": "Agente ágil con gran movilidad, perfecta para entradas rápidas y uso del Operator."
+            })
+        
+        if "Raze" in self.agent_details:
+            self.agent_details["Raze"].update({
+                "real_name": "Tayane Alves",
+                "origin": "Brasil",
+                "playstyle": "Agresivo, daño por área, vertical",
+                "description": "Especialista en daño explosivo, excelente para limpiar espacios cerrados y movimiento vertical."
+            })
+        
+        if "Sova" in self.agent_details:
+            self.agent_details["Sova"].update({
+                "real_name": "Sasha Novikov",
+                "origin": "Rusia",
+                "playstyle": "Reconocimiento, información, apoyo",
+                "description": "Maestro del reconocimiento, proporciona información crucial para el equipo con sus flechas y drone."
+            })
+    
+    def snapshot_sources(self):
+        """Archivos cuyo contenido determina la validez de la instantánea"""
+        return self.kb_paths + [os.path.join(KB_DIR, name) for name in SNAPSHOT_CODE_FILES]
+    
+    def load_snapshot(self):
+        """Leer las tablas desde la instantánea binaria, o None si no es válida"""
+        try:
+            tables = read_snapshot(self.snapshot_path, hash_sources(self.snapshot_sources()))
+        except (OSError, SnapshotError):
+            return None
+        if not isinstance(tables, dict) or any(name not in tables for name in SNAPSHOT_TABLES):
+            return None
+        return tables
+    
+    def save_snapshot(self):
+        """Compilar las tablas actuales en la instantánea binaria"""
+        tables = {name: getattr(self, name) for name in SNAPSHOT_TABLES}
+        write_snapshot(self.snapshot_path, tables, hash_sources(self.snapshot_sources()))
+    
+    def load_facts(self, facts):
+        """Construir las tablas del motor a partir de los hechos Prolog"""
+        display_names = dict(facts.get(("nombre_agente", 2), []))
+        
+        def agent_name(atom):
+            return display_names.get(atom, atom.capitalize())
+        
+        # Roles de los agentes (en el orden de rol/2)
+        self.agents_by_role = {}
+        for atom, role in facts.get(("rol", 2), []):
+            self.agents_by_role.setdefault(role.capitalize(), []).append(agent_name(atom))
+        known_agents = {agent for agents in self.agents_by_role.values() for agent in agents}
+        
+        def agent_list(atoms, context):
+            agents = [agent_name(atom) for atom in atoms]
+            unknown = [agent for agent in agents if agent not in known_agents]
+            if unknown:
+                raise ValueError(f"Agentes sin rol en {context}: {', '.join(unknown)}")
+            return agents
+        
+        # Composiciones por mapa y estilo
+        self.map_comps = {}
+        for map_atom, comp_key, atoms in facts.get(("composicion", 3), []):
+            map_name = map_atom.capitalize()
+            self.map_comps.setdefault(map_name, {})[comp_key] = agent_list(atoms, f"composicion({map_atom}, {comp_key})")
+        
+        for map_atom, description in facts.get(("descripcion_mapa", 2), []):
+            if map_atom.capitalize() in self.map_comps:
+                self.map_comps[map_atom.capitalize()]["description"] = description
+        
+        # Mapas disponibles: deben tener todas las composiciones que usa la aplicación
+        self.maps = sorted(map_atom.capitalize() for (map_atom,) in facts.get(("mapa", 1), []))
+        for map_name in self.maps:
+            missing = [key for key in MAP_COMP_KEYS if key not in self.map_comps.get(map_name, {})]
+            if missing:
+                raise ValueError(f"Faltan composiciones para {map_name}: {', '.join(missing)}")
+            self.map_comps[map_name].setdefault("description", "")
+        
+        # Tier list: s_tier -> S-Tier
+        self.tier_list = {}
+        for tier_atom, atoms in facts.get(("tier", 2), []):
+            tier_name = "-".join(part.capitalize() for part in tier_atom.split("_"))
+            self.tier_list[tier_name] = agent_list(atoms, f"tier({tier_atom})")
+        
+        # Sinergias (sin dirección: la primera descripción de cada pareja se conserva)
+        self.synergies = {}
+        for atom_a, atom_b, text in facts.get(("sinergia", 3), []):
+            pair = tuple(sorted(agent_list([atom_a, atom_b], "sinergia")))
+            self.synergies.setdefault(pair, text)
+        
+        # Consejos por agente
+        self.agent_tips = {agent_name(atom): text for atom, text in facts.get(("consejo_agente", 2), [])}
+    
+    def generate_abilities(self, agent, role):
+        """Generar habilidades simuladas para un agente"""
+        # Habilidades conocidas para algunos agentes
+        known_abilities = {
+            "Jett": ["Tailwind", "Cloudburst", "Updraft", "Blade Storm"],
+            "Raze": ["Blast Pack", "Paint Shells", "Boom Bot", "Showstopper"],
+            "Sova": ["Shock Bolt", "Recon Bolt", "Owl Drone", "Hunter's Fury"],
+            "Omen": ["Paranoia", "Dark Cover", "Shrouded Step", "From the Shadows"],
+            "Killjoy": ["Alarmbot", "Turret", "Nanoswarm", "Lockdown"],
+            "Viper": ["Poison Cloud", "Toxic Screen", "Snake Bite", "Viper's Pit"],
+            "Cypher": ["Cyber Cage", "Spycam", "Trapwire", "Neural Theft"],
+            "Sage": ["Slow Orb", "Healing Orb", "Barrier Orb", "Resurrection"],
+            "Phoenix": ["Curveball", "Hot Hands", "Blaze", "Run it Back"],
+            "Breach": ["Flashpoint", "Fault Line", "Aftershock", "Rolling Thunder"]
+        }
+        
+        if agent in known_abilities:
+            return known_abilities[agent]
+        
+        # Generar habilidades genéricas basadas en el rol
+        if role == "Duelista":
+            return ["Flash", "Movilidad", "Daño", "Ultimate (Daño/Movilidad)"]
+        elif role == "Iniciador":
+            return ["Reconocimiento", "Flash/Cegadora", "Daño/Debilitación", "Ultimate (Información/Daño)"]
+        elif role == "Controlador":
+            return ["Humo 1", "Humo 2", "Utilidad de Control", "Ultimate (Control de Área)"]
+        elif role == "Centinela":
+            return ["Trampa 1", "Trampa 2", "Utilidad Defensiva", "Ultimate (Información/Defensa)"]
+        else:
+            return ["Habilidad 1", "Habilidad 2", "Habilidad 3", "Ultimate"]
+    
+    def generate_description(self, agent, role):
+        """Generar descripción simulada para un agente"""
+        if role == "Duelista":
+            return f"{agent} es un duelista diseñado para crear espacio y tomar duelos agresivos. Sus habilidades le permiten entrar rápidamente a los sitios y crear ventajas para su equipo."
+        elif role == "Iniciador":
+            return f"{agent} es un iniciador especializado en recopilar información y preparar entradas. Sus habilidades revelan posiciones enemigas y facilitan el trabajo de los duelistas."
+        elif role == "Controlador":
+            return f"{agent} es un controlador que domina el campo de batalla con humos y habilidades de control de área. Puede bloquear líneas de visión y dividir sitios estratégicamente."
+        elif role == "Centinela":
+            return f"{agent} es un centinela enfocado en defender sitios y vigilar flancos. Sus trampas y utilidad defensiva son cruciales para mantener el control del mapa."
+        else:
+            return f"Información no disponible para {agent}."
+    
+    def reload_data(self):
+        """Recargar la base de conocimiento y aplicar solo lo que cambió
+        
+        Equivale a prepare_reload() seguido de apply_reload(). Si los archivos
+        tienen errores se lanza la excepción y el motor conserva sus datos
+        actuales.
+        
+        Devuelve un diccionario con las tablas, mapas y agentes que cambiaron.
+        """
+        return self.apply_reload(*self.prepare_reload())
+    
+    def prepare_reload(self):
+        """Construir las tablas nuevas en un motor aparte y compararlas
+        
+        Es la parte lenta de la recarga y no toca este motor, así que puede
+        ejecutarse en un hilo de trabajo. Devuelve (motor nuevo, cambios).
+        """
+        fresh = CompositionEngine(seed=self.seed, deterministic=self.deterministic, cache_size=0,
+                                  kb_paths=self.kb_paths, use_snapshot=self.use_snapshot,
+                                  snapshot_path=self.snapshot_path)
+        return fresh, self.diff_tables(fresh)
+    
+    def apply_reload(self, fresh, changes):
+        """Sustituir las tablas por las de prepare_reload() de una vez
+        
+        El cambio se hace bajo el cerrojo, así que una consulta nunca ve datos
+        mezclados. Devuelve los cambios aplicados.
+        """
+        if not changes["tables"]:
+            return changes
+        
+        with self._lock:
+            for name in SNAPSHOT_TABLES + DERIVED_TABLES:
+                setattr(self, name, getattr(fresh, name))
+            self.invalidate_cache(changes)
+        
+        return changes
+    
+    def diff_tables(self, other):
+        """Comparar las tablas con las de otro motor, tabla por tabla"""
+        tables = [name for name in SNAPSHOT_TABLES if getattr(self, name) != getattr(other, name)]
+        
+        maps = {map_name for map_name in set(self.map_comps) | set(other.map_comps)
+                if self.map_comps.get(map_name) != other.map_comps.get(map_name)}
+        agents = {agent for agent in set(self.agent_details) | set(other.agent_details)
+                  if self.agent_details.get(agent) != other.agent_details.get(agent)
+                  or self.agent_tips.get(agent) != other.agent_tips.get(agent)}
+        
+        return {"tables": tables, "maps": maps, "agents": agents}
+    
+    def invalidate_cache(self, changes):
+        """Descartar solo las recomendaciones y matrices afectadas por los cambios"""
+        tables = set(changes["tables"])
+        
+        # Un cambio de roles altera los índices de todos los equipos
+        if "agents_by_role" in tables:
+            self._cache.clear()
+            self._feature_cache = {}
+            return
+        
+        # Tiers y sinergias solo intervienen en la búsqueda de equipos
+        search_stale = bool(tables & {"tier_list", "synergies"})
+        tip_agents = changes["agents"] if "agent_tips" in tables else set()
+        
+        stale = [key for key in self._cache
+                 if key[0] in changes["maps"] or key[1] in tip_agents or (search_stale and key[3])]
+        for key in stale:
+            del self._cache[key]
+        
+        if search_stale:
+            self._feature_cache = {}
+        else:
+            self._feature_cache = {key: value for key, value in self._feature_cache.items()
+                                   if key[0] not in changes["maps"]}
+    
+    def clear_cache(self):
+        """Vaciar la memoización de recomendaciones"""
+        self._cache.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
+    
+    def cache_info(self):
+        """Obtener estadísticas de la memoización de recomendaciones"""
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "size": len(self._cache),
+            "max_size": self.cache_size
+        }
+    
+    def build_search_tables(self):
+        """Precalcular índices, roles y máscaras de sinergia para la búsqueda de equipos"""
+        self.search_agents = self.catalog.names
+        self.search_index = self.catalog.indices
+        self.search_roles = self.catalog.role_ids
+        self._feature_cache = {}
+        
+        # Máscara con los agentes que tienen sinergia con cada agente
+        self.synergy_masks = [0] * len(self.search_agents)
+        for agent_a, agent_b in self.synergies:
+            if agent_a in self.search_index and agent_b in self.search_index:
+                i, j = self.search_index[agent_a], self.search_index[agent_b]
+                self.synergy_masks[i] |= 1 << j
+                self.synergy_masks[j] |= 1 << i
+    
+    def get_agent_scores(self, map_name, comp_style):
+        """Puntuación individual de cada agente (tier, afinidad con el mapa y estilo)"""
+        map_data = self.map_comps[map_name]
+        comp_keys = MAP_COMP_KEYS
+        style_comp = self.get_base_comp(map_name, comp_style)
+        style_bonus = STYLE_ROLE_BONUS.get(comp_style, {})
+        
+        scores = []
+        for agent in self.search_agents:
+            # Afinidad: fracción de composiciones del mapa que incluyen al agente
+            affinity = sum(1 for key in comp_keys if agent in map_data[key]) / len(comp_keys)
+            if agent in style_comp:
+                affinity += 1.0
+            
+            tier_weight = TIER_WEIGHTS.get(self.catalog.tier(agent), 0.0)
+            scores.append(SEARCH_WEIGHTS["tier"] * tier_weight +
+                          SEARCH_WEIGHTS["map"] * affinity +
+                          style_bonus.get(self.agent_roles[agent], 0.0))
+        
+        return scores
+    
+    def search_teams(self, map_name, preferred_agent, comp_style="Balanceada", top_k=10):
+        """Puntuar todos los equipos legales que incluyen al agente preferido
+        
+        Los equipos se representan como máscaras de bits sobre el índice de
+        agentes. La búsqueda descarta ramas con más de MAX_PER_ROLE agentes del
+        mismo rol o sin hueco para un controlador, y devuelve los top_k mejores.
+        """
+        if map_name not in self.map_comps:
+            raise ValueError(f"Mapa desconocido: {map_name}")
+        if preferred_agent not in self.search_index:
+            raise ValueError(f"Agente desconocido: {preferred_agent}")
+        
+        agent_scores = self.get_agent_scores(map_name, comp_style)
+        roles = self.search_roles
+        synergy_masks = self.synergy_masks
+        controller = ROLE_ORDER.index("Controlador")
+        role_weight = SEARCH_WEIGHTS["role"]
+        synergy_weight = SEARCH_WEIGHTS["synergy"]
+        
+        preferred = self.search_index[preferred_agent]
+        candidates = [i for i in range(len(self.search_agents)) if i != preferred]
+        counts = [0] * len(ROLE_ORDER)
+        counts[roles[preferred]] = 1
+        best = []  # Montículo de mínimos con los top_k equipos
+        
+        def extend(start, slots_left, mask, score):
+            if slots_left == 0:
+                if counts[controller] == 0:
+                    return
+                # Redondeo para que los empates no dependan del orden de las sumas
+                total = round(score + role_weight * sum(1 for count in counts if count), 9)
+                entry = (total, -mask)
+                if len(best) < top_k:
+                    heapq.heappush(best, entry)
+                elif entry > best[0]:
+                    heapq.heapreplace(best, entry)
+                return
+            
+            for pos in range(start, len(candidates) - slots_left + 1):
+                i = candidates[pos]
+                role = roles[i]
+                if counts[role] >= MAX_PER_ROLE:
+                    continue
+                # Poda: el último hueco debe ser un controlador si aún no hay ninguno
+                if slots_left == 1 and counts[controller] == 0 and role != controller:
+                    continue
+                
+                synergy = (synergy_masks[i] & mask).bit_count()
+                counts[role] += 1
+                extend(pos + 1, slots_left - 1, mask | (1 << i),
+                       score + agent_scores[i] + synergy_weight * synergy)
+                counts[role] -= 1
+        
+        if top_k > 0:
+            extend(0, TEAM_SIZE - 1, 1 << preferred, agent_scores[preferred])
+        
+        return [{"composition": self.team_from_mask(-neg_mask), "score": round(total, 3)}
+                for total, neg_mask in sorted(best, reverse=True)]
+    
+    def build_feature_matrix(self, map_name, comp_style="Balanceada"):
+        """Codificar los agentes como matrices de características para el núcleo NumPy
+        
+        Devuelve la matriz one-hot de roles (agentes x roles), el vector de
+        puntuación individual (tier, afinidad con el mapa y estilo) y la matriz
+        simétrica de sinergias (agentes x agentes).
+        """
+        if np is None:
+            raise RuntimeError("El núcleo vectorizado requiere NumPy")
+        
+        key = (map_name, comp_style)
+        if key in self._feature_cache:
+            return self._feature_cache[key]
+        
+        n = len(self.search_agents)
+        role_onehot = np.zeros((n, len(ROLE_ORDER)), dtype=np.int8)
+        role_onehot[np.arange(n), list(self.search_roles)] = 1
+        
+        agent_scores = np.asarray(self.get_agent_scores(map_name, comp_style), dtype=np.float64)
+        
+        synergy_matrix = np.zeros((n, n), dtype=np.float64)
+        for i, mask in enumerate(self.synergy_masks):
+            for j in range(n):
+                if mask >> j & 1:
+                    synergy_matrix[i, j] = SEARCH_WEIGHTS["synergy"]
+        
+        self._feature_cache[key] = (role_onehot, agent_scores, synergy_matrix)
+        return self._feature_cache[key]
+    
+    def enumerate_teams(self, preferred_agent=None):
+        """Generar la matriz de índices (equipos x 5) de todos los equipos posibles"""
+        if np is None:
+            raise RuntimeError("El núcleo vectorizado requiere NumPy")
+        
+        n = len(self.search_agents)
+        if preferred_agent is None:
+            combos = itertools.combinations(range(n), TEAM_SIZE)
+        else:
+            preferred = self.search_index[preferred_agent]
+            others = [i for i in range(n) if i != preferred]
+            combos = ((preferred,) + combo for combo in itertools.combinations(others, TEAM_SIZE - 1))
+        
+        flat = np.fromiter(itertools.chain.from_iterable(combos), dtype=np.intp)
+        return flat.reshape(-1, TEAM_SIZE)
+    
+    def score_teams(self, map_name, teams, comp_style="Balanceada"):
+        """Puntuar en bloque una matriz de equipos con unas pocas operaciones de arrays
+        
+        Los equipos ilegales (más de MAX_PER_ROLE agentes de un rol o sin
+        controlador) reciben -inf, igual que los descarta search_teams.
+        """
+        role_onehot, agent_scores, synergy_matrix = self.build_feature_matrix(map_name, comp_style)
+        
+        role_counts = role_onehot[teams].sum(axis=1)
+        coverage = (role_counts > 0).sum(axis=1)
+        tier_and_map = agent_scores[teams].sum(axis=1)
+        
+        # Sinergias: sumar las 10 parejas de cada equipo
+        first, second = np.triu_indices(teams.shape[1], k=1)
+        synergy = synergy_matrix[teams[:, first], teams[:, second]].sum(axis=1)
+        
+        scores = tier_and_map + SEARCH_WEIGHTS["role"] * coverage + synergy
+        
+        controller = ROLE_ORDER.index("Controlador")
+        legal = (role_counts <= MAX_PER_ROLE).all(axis=1) & (role_counts[:, controller] > 0)
+        return np.where(legal, scores, -np.inf)
+    
+    def search_teams_vectorized(self, map_name, preferred_agent, comp_style="Balanceada", top_k=10):
+        """Equivalente vectorizado de search_teams usando el núcleo NumPy"""
+        if map_name not in self.map_comps:
+            raise ValueError(f"Mapa desconocido: {map_name}")
+        if preferred_agent not in self.search_index:
+            raise ValueError(f"Agente desconocido: {preferred_agent}")
+        
+        teams = self.enumerate_teams(preferred_agent)
+        scores = self.score_teams(map_name, teams, comp_style)
+        
+        legal_count = int(np.isfinite(scores).sum())
+        top_k = min(top_k, legal_count)
+        if top_k <= 0:
+            return []
+        
+        bit_weights = np.left_shift(1, np.arange(len(self.search_agents), dtype=np.int64))
+        masks = bit_weights[teams].sum(axis=1)
+        scores = np.round(scores, 9)
+        
+        # Mismo orden que search_teams: puntuación descendente y máscara ascendente
+        top = np.lexsort((masks, -scores))[:top_k]
+        return [{"composition": self.team_from_mask(mask), "score": round(total, 3)}
+                for total, mask in zip(scores[top].tolist(), masks[top].tolist())]
+    
+    def team_from_mask(self, mask):
+        """Convertir una máscara de bits en una lista de agentes ordenada por rol"""
+        team = [agent for i, agent in enumerate(self.search_agents) if mask >> i & 1]
+        team.sort(key=lambda agent: self.catalog.role_ids[self.catalog.index(agent)])
+        return team
+    
+    def get_rng(self, map_name, preferred_agent, comp_style):
+        """Obtener el generador aleatorio a usar para una consulta"""
+        if not self.deterministic:
+            return self.rng
+        
+        # Semilla derivada de la consulta: no depende del orden de las llamadas
+        return random.Random(f"{self.seed}|{map_name}|{preferred_agent}|{comp_style}")
+    
+    def get_base_comp(self, map_name, comp_style):
+        """Obtener la composición meta del mapa para el estilo indicado"""
+        comp_key = STYLE_COMP_KEYS.get(comp_style, "pro")
+        return self.map_comps[map_name][comp_key]
+    
+    def recommend(self, map_name, preferred_agent, comp_style="Balanceada", search=False, top_k=5):
+        """Recomendar una composición para el mapa, el agente preferido y el estilo
+        
+        Con search=True la composición es el mejor equipo de la búsqueda
+        exhaustiva y el resultado incluye la lista ordenada en "ranked_teams".
+        """
+        if map_name not in self.map_comps:
+            raise ValueError(f"Mapa desconocido: {map_name}")
+        if preferred_agent not in self.agent_roles:
+            raise ValueError(f"Agente desconocido: {preferred_agent}")
+        
+        with self._lock:
+            # Servir desde la memoización; reload_data descarta las entradas afectadas
+            key = (map_name, preferred_agent, comp_style, search, top_k)
+            if self.deterministic and key in self._cache:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return self.copy_result(self._cache[key])
+            
+            result = self.build_recommendation(map_name, preferred_agent, comp_style, search, top_k)
+            
+            if self.deterministic and self.cache_size > 0:
+                self.cache_misses += 1
+                self._cache[key] = result
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+                return self.copy_result(result)
+            
+            return result
+    
+    def copy_result(self, result):
+        """Copiar un resultado para que el llamador no modifique la memoización"""
+        copy = {key: list(value) if isinstance(value, list) else value
+                for key, value in result.items()}
+        if "ranked_teams" in copy:
+            copy["ranked_teams"] = [{"composition": list(team["composition"]), "score": team["score"]}
+                                    for team in copy["ranked_teams"]]
+        return copy
+    
+    def build_recommendation(self, map_name, preferred_agent, comp_style, search=False, top_k=5):
+        """Construir la recomendación sin consultar la memoización"""
+        map_data = self.map_comps[map_name]
+        base_comp = self.get_base_comp(map_name, comp_style)
+        ranked_comp = map_data["ranked"]
+        alt_comp = map_data["alt"]
+        
+        # Ajustar la composición según el agente preferido
+        ranked_teams = None
+        if search:
+            ranked_teams = self.search_teams(map_name, preferred_agent, comp_style, max(top_k, 1))
+        
+        if ranked_teams:
+            final_comp = list(ranked_teams[0]["composition"])
+        else:
+            rng = self.get_rng(map_name, preferred_agent, comp_style)
+            final_comp = self.adjust_composition(base_comp, ranked_comp, alt_comp, preferred_agent, rng)
+        
+        result = self.describe_composition(map_name, final_comp, preferred_agent, comp_style)
+        if ranked_teams is not None:
+            result["ranked_teams"] = ranked_teams
+        
+        return result
+    
+    def describe_composition(self, map_name, composition, preferred_agent, comp_style):
+        """Resultado con la información del mapa y los consejos para una composición ya elegida"""
+        if map_name not in self.map_comps:
+            raise ValueError(f"Mapa desconocido: {map_name}")
+        map_data = self.map_comps[map_name]
+        return {
+            "map": map_name,
+            "agent": preferred_agent,
+            "style": comp_style,
+            "composition": list(composition),
+            "pro": list(map_data["pro"]),
+            "ranked": list(map_data["ranked"]),
+            "alt": list(map_data["alt"]),
+            "description": map_data["description"],
+            "tips": self.generate_tips(map_name, composition, preferred_agent, comp_style)
+        }
+    
+    def adjust_composition(self, base_comp, ranked_comp, alt_comp, preferred_agent, rng=None):
+        """Ajustar la composición basada en el agente preferido"""
+        if rng is None:
+            rng = self.rng
+        
+        # Si el agente preferido ya está en la composición base, no hay cambios
+        if preferred_agent in base_comp:
+            return base_comp.copy()
+        
+        # Encontrar el rol del agente preferido
+        preferred_role = self.agent_roles[preferred_agent]
+        
+        # Intentar reemplazar un agente del mismo rol en la composición base
+        final_comp = base_comp.copy()
+        replaced = False
+        
+        for i, agent in enumerate(base_comp):
+            if self.agent_roles.get(agent) == preferred_role:
+                final_comp[i] = preferred_agent
+                replaced = True
+                break
+        
+        # Si no se pudo reemplazar por rol, buscar en otras composiciones
+        if not replaced:
+            # Verificar si el agente está en la composición ranked o alt
+            if preferred_agent in ranked_comp:
+                final_comp = ranked_comp.copy()
+            elif preferred_agent in alt_comp:
+                final_comp = alt_comp.copy()
+            else:
+                # Último recurso - reemplazar un agente menos importante
+                # Identificar agentes core que aparecen en todas las composiciones
+                core_agents = set(base_comp).intersection(set(ranked_comp)).intersection(set(alt_comp))
+                non_core = [agent for agent in base_comp if agent not in core_agents]
+                
+                if non_core:
+                    # Reemplazar un agente no core
+                    replace_idx = base_comp.index(rng.choice(non_core))
+                else:
+                    # Si todos son core, reemplazar uno al azar pero no un controlador
+                    controllers = [i for i, agent in enumerate(base_comp) 
+                                 if self.agent_roles.get(agent) == "Controlador"]
+                    
+                    # Evitar reemplazar controladores si es posible
+                    non_controllers = [i for i in range(len(base_comp)) if i not in controllers]
+                    
+                    if non_controllers and preferred_role != "Controlador":
+                        replace_idx = rng.choice(non_controllers)
+                    else:
+                        replace_idx = rng.randint(0, len(base_comp) - 1)
+                
+                final_comp[replace_idx] = preferred_agent
+        
+        # Asegurar que la composición tenga al menos un controlador
+        has_controller = any(self.agent_roles.get(agent) == "Controlador" for agent in final_comp)
+        
+        if not has_controller:
+            # Buscar un agente que no sea el preferido para reemplazar
+            for i, agent in enumerate(final_comp):
+                if agent != preferred_agent and self.agent_roles.get(agent) != "Controlador":
+                    # Reemplazar con un controlador popular
+                    final_comp[i] = "Omen"  # Controlador versátil para la mayoría de mapas
+                    break
+        
+        return final_comp
+    
+    def generate_tips(self, map_name, composition, preferred_agent, comp_style):
+        """Generar consejos específicos para el mapa y la composición"""
+        tips = []
+        
+        # Añadir consejos específicos del mapa
+        if map_name == "Ascent":
+            tips.append("Utiliza habilidades de reconocimiento para controlar Mid y asegurar la transición entre sitios.")
+            tips.append("Mantén control de Catwalk y Market con tus controladores para ejecutar rápidamente en A o B.")
+            if comp_style == "Agresiva":
+                tips.append("Aprovecha las entradas rápidas por A Main y B Main con duelistas para sorprender a los defensores.")
+            elif comp_style == "Defensiva":
+                tips.append("Establece una defensa fuerte en Heaven y CT para controlar múltiples ángulos.")
+        elif map_name == "Bind":
+            tips.append("Utiliza los teletransportadores para rotaciones rápidas y flanqueos sorpresa.")
+            tips.append("Coordina utilidad para limpiar esquinas en Hookah y Showers.")
+            if comp_style == "Agresiva":
+                tips.append("Presiona agresivamente Hookah y Showers para tomar control temprano del mapa.")
+            elif comp_style == "Defensiva":
+                tips.append("Coloca centinelas en los teletransportadores para detectar rotaciones enemigas.")
+        elif map_name == "Breeze":
+            tips.append("La Pantalla Tóxica de Viper es esencial para dividir los amplios espacios abiertos.")
+            tips.append("Utiliza operadores en las largas líneas de visión de A Main y Mid.")
+            if comp_style == "Agresiva":
+                tips.append("Toma control agresivo de Cave y Nest para presionar a los defensores desde múltiples ángulos.")
+            elif comp_style == "Defensiva":
+                tips.append("Mantén operadores en A Bridge y B Nest para controlar las líneas largas.")
+        elif map_name == "Fracture":
+            tips.append("Coordina ataques desde ambos lados del mapa para dividir atención de defensores.")
+            tips.append("Prioriza el control de Dish y Arcade para facilitar rotaciones a ambos sitios.")
+            if comp_style == "Agresiva":
+                tips.append("Utiliza a Breach y Fade para entradas coordinadas desde ambos lados del sitio.")
+            elif comp_style == "Defensiva":
+                tips.append("Coloca centinelas en puntos clave como Dish y Tower para detectar flancos.")
+        elif map_name == "Haven":
+            tips.append("Coordina tácticas para manejar los tres sitios de bomba y sus múltiples entradas.")
+            tips.append("Divide habilidades defensivas eficientemente entre todos los sitios.")
+            if comp_style == "Agresiva":
+                tips.append("Presiona agresivamente C Long o A Long para forzar rotaciones y crear espacio.")
+            elif comp_style == "Defensiva":
+                tips.append("Mantén control de Garage para facilitar rotaciones rápidas entre sitios.")
+        elif map_name == "Icebox":
+            tips.append("La Pantalla Tóxica de Viper es crucial para dividir sitios y crear espacio para plantar.")
+            tips.append("Utiliza el muro de Sage para facilitar plantaciones seguras en sitios abiertos como B.")
+            if comp_style == "Agresiva":
+                tips.append("Aprovecha el movimiento vertical en B Site para sorprender a los defensores.")
+            elif comp_style == "Defensiva":
+                tips.append("Coloca utilidad de Killjoy en B para retrasar pushes y facilitar retakes.")
+        elif map_name == "Lotus":
+            tips.append("Aprovecha las puertas rotatorias para ejecutar rotaciones silenciosas.")
+            tips.append("Mantén control de Main Hall para dividir el mapa y facilitar rotaciones.")
+            if comp_style == "Agresiva":
+                tips.append("Utiliza a Raze para limpiar espacios cerrados cerca de las puertas rotatorias.")
+            elif comp_style == "Defensiva":
+                tips.append("Coloca centinelas en C Mound y A Tree para detectar flancos a través de las puertas.")
+        elif map_name == "Pearl":
+            tips.append("Usa controladores para bloquear líneas de visión largas en Mid y A Main.")
+            tips.append("Controla Water para poder flanquear B desde múltiples ángulos.")
+            if comp_style == "Agresiva":
+                tips.append("Presiona agresivamente Mid para dividir el mapa y controlar rotaciones.")
+            elif comp_style == "Defensiva":
+                tips.append("Mantén control de Art y Link para facilitar rotaciones defensivas.")
+        elif map_name == "Split":
+            tips.append("Coordina habilidades para tomar control de Mid y presionar ambos sitios.")
+            tips.append("Usa muros y humos para bloquear las visiones extensas de Heaven y Rafters.")
+            if comp_style == "Agresiva":
+                tips.append("Utiliza a Raze para entradas verticales sorpresa en A o B Main.")
+            elif comp_style == "Defensiva":
+                tips.append("Coloca centinelas en Mid Mail y Vents para detectar flancos.")
+        elif map_name == "Sunset":
+            tips.append("Aprovecha los múltiples niveles y ángulos verticales para sorprender a los enemigos.")
+            tips.append("Coordina utilidad para limpiar espacios cerrados y esquinas.")
+            if comp_style == "Agresiva":
+                tips.append("Utiliza a Raze y Phoenix para limpiar espacios cerrados con su utilidad.")
+            elif comp_style == "Defensiva":
+                tips.append("Coloca a Deadlock y Killjoy para controlar áreas clave y retrasar pushes.")
+        
+        # Añadir consejos específicos de la composición
+        duelist_count, initiator_count, controller_count, sentinel_count = self.catalog.role_counts(composition)
+        
+        if duelist_count > 1:
+            tips.append("Con múltiples duelistas, coordina las entradas para no desperdiciar utilidad ni arriesgar demasiado.")
+        
+        if controller_count > 1:
+            tips.append("Distribuye los humos entre sitios para maximizar la cobertura y duración.")
+        
+        if "Jett" in composition:
+            tips.append("Utiliza a Jett para tomar ángulos agresivos con Operator y crear espacio para el equipo.")
+        
+        if "Viper" in composition:
+            tips.append("Aprende los lineups de Viper para pantallas toxicas y hoyos venenosos clave.")
+        
+        if "Omen" in composition:
+            tips.append("Aprovecha la teletransportación de Omen para flanqueos sorpresa o reposicionamientos.")
+        
+        if "Sova" in composition:
+            tips.append("Comunica la información obtenida con las flechas de reconocimiento de Sova.")
+        
+        if "Killjoy" in composition:
+            tips.append("Coloca utilidad de Killjoy en ángulos sorpresa o para defender post-planta.")
+        
+        if "Sage" in composition and map_name in ["Split", "Icebox"]:
+            tips.append("Usa el muro de Sage para bloquear entradas clave o facilitar plantaciones.")
+        
+        # Añadir consejos del agente preferido
+        if preferred_agent == "Jett":
+            tips.append("Como Jett, usa tus Cloudburst para cubrir ángulos mientras entras con Tailwind.")
+        elif preferred_agent == "Raze":
+            tips.append("Usa los Blast Pack de Raze para movimientos verticales sorpresa y entrada rápida.")
+        elif preferred_agent == "Omen":
+            tips.append("Coloca humos profundos para bloquear visión de Defenders mientras tu equipo toma espacio.")
+        elif preferred_agent == "Viper":
+            tips.append("Aprende los lineups post-planta de Viper para Snake Bite en ubicaciones comunes de defuse.")
+        elif preferred_agent == "Sova":
+            tips.append("Domina los rebotes de flecha y lugares de Drone para maximizar la información obtenida.")
+        elif preferred_agent == "Killjoy":
+            tips.append("Coloca Alarmbots en ubicaciones inesperadas para detectar flancos o pushes rápidos.")
+        elif preferred_agent == "Cypher":
+            tips.append("Usa la cámara de Cypher para vigilar flancos mientras el equipo ataca un sitio.")
+        elif preferred_agent == "Breach":
+            tips.append("Coordina tus flashes y aturdimientos con las entradas de los duelistas del equipo.")
+        elif preferred_agent in self.agent_tips:
+            tips.append(self.agent_tips[preferred_agent])
+        
+        # Limitar a 6 consejos máximo
+        return tips[:6]
+    
+    def get_agent_tier(self, agent):
+        """Obtener el tier de un agente"""
+        return self.catalog.tier(agent)
@@ -0,0 +1,180 @@
+"""Lector de hechos Prolog para la base de conocimiento de Valorant
+
+Solo entiende el subconjunto de hechos sin variables que usan Valorant.pl y
+Valorant GOD.pl (átomos, átomos entre comillas, números y listas). Las reglas
+y los hechos con variables se ignoran.
+"""
+
+import re
+from collections import namedtuple
+
+# Término compuesto anidado dentro de un hecho, p. ej. par(jett, sova)
+Term = namedtuple("Term", ["name", "args"])
+
+TOKEN_RE = re.compile(r"""
+    (?P<skip>\s+|%[^\n]*|/\*.*?\*/)
+  | (?P<quoted>'(?:[^'\\]|''|\\.)*')
+  | (?P<number>-?\d+(?:\.\d+)?(?![A-Za-z_]))
+  | (?P<atom>[a-z][A-Za-z0-9_]*)
+  | (?P<var>[A-Z_][A-Za-z0-9_]*)
+  | (?P<end>\.(?=\s|%|$))
+  | (?P<punct>[()\[\],|!;])
+  | (?P<symbol>[-+*/\\^<>=~:.?@#&$]+)
+""", re.VERBOSE | re.DOTALL)
+
+QUOTE_ESCAPES = {"n": "\n", "t": "\t", "\\": "\\", "'": "'", '"': '"'}
+
+class PrologSyntaxError(ValueError):
+    """Error de sintaxis al leer un archivo de hechos Prolog"""
+
+def tokenize(text):
+    """Dividir el texto en cláusulas, cada una como lista de (tipo, valor, línea)"""
+    clauses = []
+    current = []
+    line = 1
+    pos = 0
+    length = len(text)
+    
+    while pos < length:
+        match = TOKEN_RE.match(text, pos)
+        if match is None:
+            raise PrologSyntaxError(f"Carácter inesperado {text[pos]!r} en la línea {line}")
+        
+        kind = match.lastgroup
+        value = match.group()
+        if kind == "end":
+            clauses.append(current)
+            current = []
+        elif kind != "skip":
+            current.append((kind, value, line))
+        
+        line += value.count("\n")
+        pos = match.end()
+    
+    if current:
+        raise PrologSyntaxError(f"Cláusula sin punto final en la línea {current[0][2]}")
+    
+    return clauses
+
+def unquote(value):
+    """Convertir un átomo entre comillas en texto"""
+    body = value[1:-1].replace("''", "'")
+    if "\\" not in body:
+        return body
+    return re.sub(r"\\(.)", lambda m: QUOTE_ESCAPES.get(m.group(1), m.group(1)), body)
+
+class FactParser:
+    """Analizador descendente de una cláusula ya dividida en tokens"""
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+    
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None, None)
+    
+    def take(self, value=None):
+        kind, text, line = self.peek()
+        if kind is None:
+            raise PrologSyntaxError("Fin inesperado de la cláusula")
+        if value is not None and text != value:
+            raise PrologSyntaxError(f"Se esperaba {value!r} y se encontró {text!r} en la línea {line}")
+        self.pos += 1
+        return kind, text, line
+    
+    def parse_term(self):
+        kind, text, line = self.take()
+        
+        if kind == "number":
+            return float(text) if "." in text else int(text)
+        if kind == "quoted":
+            name = unquote(text)
+        elif kind in ("atom", "symbol"):
+            name = text
+        elif text == "[":
+            return self.parse_list()
+        else:
+            raise PrologSyntaxError(f"Término inesperado {text!r} en la línea {line}")
+        
+        # Término compuesto: functor seguido de argumentos
+        if self.peek()[1] == "(":
+            self.take("(")
+            args = self.parse_args(")")
+            return Term(name, tuple(args))
+        return name
+    
+    def parse_args(self, closing):
+        args = [self.parse_term()]
+        while self.peek()[1] == ",":
+            self.take(",")
+            args.append(self.parse_term())
+        self.take(closing)
+        return args
+    
+    def parse_list(self):
+        if self.peek()[1] == "]":
+            self.take("]")
+            return []
+        
+        items = [self.parse_term()]
+        while self.peek()[1] == ",":
+            self.take(",")
+            items.append(self.parse_term())
+        if self.peek()[1] == "|":
+            raise PrologSyntaxError(f"Listas con cola no soportadas en la línea {self.peek()[2]}")
+        self.take("]")
+        return items
+    
+    def parse_fact(self):
+        term = self.parse_term()
+        if self.pos != len(self.tokens):
+            raise PrologSyntaxError(f"Texto sobrante {self.peek()[1]!r} en la línea {self.peek()[2]}")
+        return term
+
+def parse_facts(text):
+    """Leer los hechos sin variables de un texto Prolog
+    
+    Devuelve un diccionario {(predicado, aridad): [tupla de argumentos, ...]}
+    que conserva el orden de aparición de los hechos.
+    """
+    facts = {}
+    
+    for tokens in tokenize(text):
+        # Ignorar reglas, directivas y cláusulas con variables
+        if any(kind == "var" or (kind == "symbol" and value == ":-") for kind, value, _ in tokens):
+            continue
+        
+        term = FactParser(tokens).parse_fact()
+        if isinstance(term, Term):
+            key, args = (term.name, len(term.args)), term.args
+        elif isinstance(term, str):
+            key, args = (term, 0), ()
+        else:
+            raise PrologSyntaxError(f"Hecho no válido en la línea {tokens[0][2]}")
+        
+        facts.setdefault(key, []).append(args)
+    
+    return facts
+
+def read_source(path):
+    """Leer un archivo Prolog en UTF-8 o, si no es válido, en Latin-1"""
+    with open(path, "rb") as f:
+        data = f.read()
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return data.decode("latin-1")
+
+def load_facts(path):
+    """Leer los hechos de un archivo Prolog"""
+    return parse_facts(read_source(path))
+
+def load_knowledge_base(paths):
+    """Combinar los hechos de varios archivos Prolog
+    
+    Los archivos se aplican en orden y cada predicado definido en un archivo
+    posterior reemplaza por completo al de los anteriores.
+    """
+    facts = {}
+    for path in paths:
+        facts.update(load_facts(path))
+    return facts
@@ -1,21 +1,31 @@
 import sys
 import os
 import json
-import random
+import time
 import webbrowser
+from collections import OrderedDict
+from functools import partial
 from typing import Dict, List, Tuple, Optional, Set, Any
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                             QLabel, QPushButton, QFrame, QScrollArea, QGridLayout, 
                             QRadioButton, QButtonGroup, QGroupBox, QSplitter, QMessageBox,
                             QTabWidget, QComboBox, QFileDialog, QToolBar, QAction, QMenu,
-                            QSizePolicy, QSpacerItem, QDialog, QTableWidget, QTableWidgetItem,
-                            QProgressBar, QLineEdit, QTextEdit, QCheckBox, QSlider, QToolTip)
+                            QSizePolicy, QSpacerItem, QDialog,
+                            QProgressBar, QLineEdit, QTextEdit, QCheckBox, QSlider, QToolTip,
+                            QListView, QAbstractItemView, QStyledItemDelegate, QStyle, QTableView)
 from PyQt5.QtGui import (QPixmap, QImage, QPainter, QColor, QFont, QIcon, QCursor, QPalette, 
                         QBrush, QLinearGradient, QRadialGradient, QPen, QFontMetrics, 
                         QMouseEvent, QResizeEvent, QKeyEvent, QDesktopServices)
 from PyQt5.QtCore import (Qt, QSize, QRect, QUrl, QBuffer, QByteArray, QIODevice, 
                          pyqtSignal, QThread, QTimer, QPropertyAnimation, QEasingCurve,
-                         QPoint, QEvent, QObject, QMargins)
+                         QPoint, QEvent, QObject, QMargins, QFileSystemWatcher, QThreadPool, QRunnable,
+                         QAbstractListModel, QAbstractTableModel, QModelIndex)
+
+from motor_valo import CompositionEngine, TIER_ORDER, ROLE_ORDER
+from historial_valo import CompositionHistory
+from estadisticas_valo import MatchStats, MATCHES_DIR, RANKS, STAT_NAMES
+from imagenes_valo import (ImageStore, ImageAtlas, AtlasTask, pixmap_cache, ATLAS_FILE,
+                           PRERENDER_PRIORITY, AGENT_THUMBNAIL_SIZE, MAP_THUMBNAIL_SIZE)
 
 # Constantes de estilo
 VALORANT_RED = "#FF4655"
@@ -25,6 +35,34 @@ VALORANT_LIGHT_BLUE = "#1F2731"
 VALORANT_DARK_RED = "#BD3944"
 VALORANT_ACCENT = "#BDBCB7"
 
+# Tamaños de imagen de diálogos y resultados
+AGENT_HEADER_SIZE = QSize(150, 150)
+BROWSER_CARD_SIZE = QSize(100, 100)
+MINI_CARD_SIZE = QSize(30, 30)
+MAP_HEADER_SIZE = QSize(200, 120)
+
+# Miniaturas que se pre-generan en disco al arrancar
+AGENT_PRERENDER_SIZES = [AGENT_THUMBNAIL_SIZE, AGENT_HEADER_SIZE, BROWSER_CARD_SIZE, MINI_CARD_SIZE]
+MAP_PRERENDER_SIZES = [MAP_THUMBNAIL_SIZE, MAP_HEADER_SIZE]
+
+# Espera tras el último evento de redimensionado antes de reescalar las tarjetas (ms)
+RESIZE_DEBOUNCE_DELAY = 120
+
+# Tarjetas reescaladas por vuelta del bucle de eventos
+RESIZE_BATCH_SIZE = 6
+
+# Espera tras el último cambio en la base de conocimiento antes de recargarla (ms)
+KB_RELOAD_DELAY = 300
+
+# Tiempo de cálculo a partir del cual se muestra la barra de progreso (ms)
+PROGRESS_DELAY = 150
+
+# Diálogos de información de agente que se conservan para reutilizarlos
+AGENT_INFO_CACHE_SIZE = 8
+
+# Composiciones que se leen del historial por página
+HISTORY_PAGE_SIZE = 100
+
 # Colores de roles
 ROLE_COLORS = {
     "Duelista": "#FF4655",
@@ -41,6 +79,326 @@ TIER_COLORS = {
     "C-Tier": "#FF6347"   # Red-orange
 }
 
+# Factores de escala posibles (ver on_resize); cada uno tiene sus reglas en la hoja de estilo
+SIZE_FACTORS = (0.8, 0.9, 1.0, 1.1, 1.2)
+
+# Variantes de HoverButton: color de fondo -> nombre de la variante
+BUTTON_VARIANTS = {
+    VALORANT_RED: "primary",
+    VALORANT_LIGHT_BLUE: "secondary",
+}
+
+def size_bucket(factor):
+    """Nombre del tramo de tamaño usado en la propiedad sizeBucket"""
+    return str(round(factor * 100))
+
+def set_style_property(widget, name, value):
+    """Cambiar una propiedad dinámica y volver a aplicar la hoja de estilo solo a ese widget"""
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+
+def build_app_stylesheet():
+    """Construir la hoja de estilo de la aplicación
+    
+    Los estados de los widgets (seleccionado, tier, rol, tramo de tamaño...)
+    se expresan con nombres de objeto y propiedades dinámicas, de modo que
+    Qt analiza el CSS una sola vez al arrancar.
+    """
+    rules = [f"""
+        QMainWindow {{
+            background-color: {VALORANT_BLUE};
+        }}
+        QLabel {{
+            color: {VALORANT_WHITE};
+        }}
+        QScrollArea {{
+            border: none;
+            background-color: transparent;
+        }}
+        QGroupBox {{
+            border: 1px solid #2A3441;
+            border-radius: 8px;
+            margin-top: 1ex;
+            font-weight: bold;
+            color: {VALORANT_WHITE};
+        }}
+        QGroupBox::title {{
+            subcontrol-origin: margin;
+            subcontrol-position: top center;
+            padding: 0 5px;
+        }}
+        QComboBox {{
+            background-color: {VALORANT_LIGHT_BLUE};
+            color: {VALORANT_WHITE};
+            border: 1px solid #2A3441;
+            border-radius: 4px;
+            padding: 5px;
+        }}
+        QComboBox::drop-down {{
+            border: none;
+        }}
+        QComboBox QAbstractItemView {{
+            background-color: {VALORANT_LIGHT_BLUE};
+            color: {VALORANT_WHITE};
+            selection-background-color: #2A3441;
+        }}
+        QToolBar {{
+            background-color: {VALORANT_LIGHT_BLUE};
+            border: none;
+        }}
+        QToolButton {{
+            background-color: transparent;
+            border: none;
+            color: {VALORANT_WHITE};
+        }}
+        QToolButton:hover {{
+            background-color: #2A3441;
+        }}
+        QMenu {{
+            background-color: {VALORANT_LIGHT_BLUE};
+            color: {VALORANT_WHITE};
+            border: 1px solid #2A3441;
+        }}
+        QMenu::item {{
+            padding: 5px 20px 5px 20px;
+        }}
+        QMenu::item:selected {{
+            background-color: #2A3441;
+        }}
+        QStatusBar {{
+            background-color: {VALORANT_LIGHT_BLUE};
+            color: {VALORANT_WHITE};
+        }}
+        QPushButton[variant] {{
+            color: {VALORANT_WHITE};
+            border: none;
+            border-radius: 4px;
+            padding: 8px 16px;
+            font-weight: bold;
+            font-size: 12px;
+        }}
+        QPushButton[variant]:hover {{
+            background-color: {VALORANT_DARK_RED};
+        }}
+        QPushButton[variant]:pressed {{
+            background-color: {QColor(VALORANT_DARK_RED).darker(120).name()};
+        }}
+        QPushButton[large="true"] {{
+            font-size: 14px;
+        }}
+        #agentCard, #mapCard {{
+            background-color: {VALORANT_LIGHT_BLUE};
+            border-radius: 8px;
+            padding: 5px;
+            margin: 5px;
+        }}
+        #mapCard {{
+            margin: 2px;
+        }}
+        #agentCard:hover, #mapCard:hover {{
+            background-color: #2A3441;
+            border: 1px solid {VALORANT_RED};
+        }}
+        #agentCard[selected="true"], #mapCard[selected="true"] {{
+            background-color: #2A3441;
+            border: 2px solid {VALORANT_RED};
+            margin: 5px;
+        }}
+        QLabel#cardName {{
+            color: {VALORANT_WHITE};
+            font-weight: bold;
+        }}
+        QPushButton#cardInfo {{
+            background-color: transparent;
+            color: white;
+            border: none;
+            padding: 2px;
+            font-size: 12px;
+        }}
+        QRadioButton[styleOption="true"] {{
+            color: {VALORANT_WHITE};
+            font-size: 12px;
+            spacing: 8px;
+        }}
+        QRadioButton[styleOption="true"]::indicator {{
+            width: 16px;
+            height: 16px;
+            border-radius: 8px;
+        }}
+        QRadioButton[styleOption="true"]::indicator:unchecked {{
+            border: 2px solid {VALORANT_WHITE};
+            background-color: transparent;
+        }}
+        QRadioButton[styleOption="true"]::indicator:checked {{
+            border: 2px solid {VALORANT_RED};
+            background-color: {VALORANT_RED};
+        }}
+        QProgressBar#animatedProgress {{
+            border: none;
+            border-radius: 4px;
+            background-color: {VALORANT_LIGHT_BLUE};
+            height: 8px;
+        }}
+        QProgressBar#animatedProgress::chunk {{
+            background-color: {VALORANT_RED};
+            border-radius: 4px;
+        }}
+        #resultSection, QGroupBox#selectionGroup {{
+            background-color: {VALORANT_LIGHT_BLUE};
+            border-radius: 8px;
+            padding: 15px;
+        }}
+        #welcomeSection {{
+            background-color: {VALORANT_LIGHT_BLUE};
+            border-radius: 8px;
+            padding: 20px;
+        }}
+        #progressSection {{
+            background-color: {VALORANT_LIGHT_BLUE};
+            border-radius: 8px;
+            padding: 10px;
+        }}
+        #plainFrame {{
+            background-color: transparent;
+        }}
+        #appBar {{
+            background-color: {VALORANT_BLUE};
+        }}
+        QLabel[textStyle="appTitle"] {{
+            font-size: 24px;
+            font-weight: bold;
+            color: {VALORANT_RED};
+        }}
+        QLabel[textStyle="version"] {{
+            font-size: 12px;
+            color: {VALORANT_ACCENT};
+        }}
+        QLabel[textStyle="footnote"] {{
+            font-size: 10px;
+            color: {VALORANT_ACCENT};
+        }}
+        QLabel[textStyle="link"] {{
+            font-size: 10px;
+            color: {VALORANT_RED};
+            text-decoration: underline;
+        }}
+        QLabel[textStyle="label"] {{
+            font-weight: bold;
+        }}
+        QLabel[textStyle="selection"] {{
+            font-weight: bold;
+            padding: 5px;
+        }}
+        QLabel[textStyle="mapTitle"], QLabel[textStyle="pageTitle"] {{
+            font-size: 20px;
+            font-weight: bold;
+            color: {VALORANT_RED};
+        }}
+        QLabel[textStyle="sectionTitle"] {{
+            font-size: 18px;
+            font-weight: bold;
+            color: {VALORANT_RED};
+        }}
+        QLabel[textStyle="title"] {{
+            font-size: 16px;
+            font-weight: bold;
+            color: {VALORANT_RED};
+        }}
+        QLabel[textStyle="subtitle"] {{
+            font-size: 16px;
+            font-weight: bold;
+            color: {VALORANT_WHITE};
+        }}
+        QLabel[textStyle="heading"] {{
+            font-size: 14px;
+            font-weight: bold;
+            color: {VALORANT_WHITE};
+            margin-top: 10px;
+        }}
+        QLabel[textStyle="message"] {{
+            font-size: 14px;
+            color: {VALORANT_WHITE};
+        }}
+        QLabel[textStyle="welcome"] {{
+            font-size: 14px;
+            color: {VALORANT_WHITE};
+            padding: 10px;
+        }}
+        QLabel[textStyle="body"] {{
+            font-size: 12px;
+            color: {VALORANT_WHITE};
+        }}
+        QLabel[textStyle="bullet"] {{
+            font-size: 16px;
+            font-weight: bold;
+            color: {VALORANT_RED};
+        }}
+    """]
+    
+    # Botones con fondo propio
+    for color, variant in BUTTON_VARIANTS.items():
+        rules.append(f"""
+        QPushButton[variant="{variant}"] {{
+            background-color: {color};
+        }}""")
+    
+    # Botones de filtro y etiquetas por rol
+    role_colors = dict(ROLE_COLORS, Todos="#333333")
+    for role, color in role_colors.items():
+        text_color = "white" if role in ["Todos", "Duelista"] else "#0F1923"
+        rules.append(f"""
+        QPushButton[roleFilter="{role}"] {{
+            background-color: {color};
+            color: {text_color};
+            border: none;
+            border-radius: 4px;
+            padding: 5px 10px;
+            font-weight: bold;
+            font-size: 10px;
+        }}
+        QPushButton[roleFilter="{role}"]:hover {{
+            background-color: {QColor(color).lighter(110).name()};
+        }}
+        QPushButton[roleFilter="{role}"]:pressed {{
+            background-color: {QColor(color).darker(110).name()};
+        }}
+        QLabel[textStyle="role"][role="{role}"] {{
+            font-size: 14px;
+            font-weight: bold;
+            color: {color};
+        }}""")
+    
+    # Color del tier en las tarjetas
+    rules.append(f"""
+        QLabel#cardTier {{
+            color: {VALORANT_WHITE};
+        }}""")
+    for tier, color in TIER_COLORS.items():
+        rules.append(f"""
+        QLabel#cardTier[tier="{tier}"] {{
+            color: {color};
+        }}""")
+    
+    # Tamaño de letra de las tarjetas según el tramo de tamaño de la ventana
+    for factor in SIZE_FACTORS:
+        bucket = size_bucket(factor)
+        rules.append(f"""
+        QLabel#cardName[sizeBucket="{bucket}"] {{
+            font-size: {10 * factor:g}pt;
+        }}
+        QLabel#cardTier[sizeBucket="{bucket}"] {{
+            font-size: {8 * factor:g}pt;
+        }}""")
+    
+    return "\n".join(rules)
+
+
+APP_STYLESHEET = build_app_stylesheet()
+
 class HoverButton(QPushButton):
     """Botón personalizado con efectos de hover"""
     def __init__(self, text="", parent=None, color=VALORANT_RED, hover_color=VALORANT_DARK_RED):
@@ -49,53 +407,41 @@ class HoverButton(QPushButton):
         self.hover_color = hover_color
         self.text_color = VALORANT_WHITE
         self.setCursor(QCursor(Qt.PointingHandCursor))
-        self.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {self.color};
-                color: {self.text_color};
-                border: none;
-                border-radius: 4px;
-                padding: 8px 16px;
-                font-weight: bold;
-                font-size: 12px;
-            }}
-            QPushButton:hover {{
-                background-color: {self.hover_color};
-            }}
-            QPushButton:pressed {{
-                background-color: {QColor(self.hover_color).darker(120).name()};
-            }}
-        """)
+        
+        # Los colores habituales están en la hoja de estilo de la aplicación
+        self.setProperty("variant", BUTTON_VARIANTS.get(color, "custom"))
+        if color not in BUTTON_VARIANTS or hover_color != VALORANT_DARK_RED:
+            self.setStyleSheet(f"""
+                QPushButton {{
+                    background-color: {self.color};
+                }}
+                QPushButton:hover {{
+                    background-color: {self.hover_color};
+                }}
+                QPushButton:pressed {{
+                    background-color: {QColor(self.hover_color).darker(120).name()};
+                }}
+            """)
 
 class AgentCard(QFrame):
     """Widget personalizado para mostrar un agente con su imagen, nombre y tier"""
     clicked = pyqtSignal(str)  # Señal que emite el nombre del agente cuando se hace clic
     info_clicked = pyqtSignal(str)  # Señal que emite el nombre del agente cuando se hace clic en info
     
-    def __init__(self, agent_name, role, tier, image=None, parent=None, size_factor=1.0):
+    def __init__(self, agent_name, role, tier, image=None, parent=None, size_factor=1.0, image_request=None):
         super().__init__(parent)
         self.agent_name = agent_name
         self.role = role
         self.tier = tier
         self.image = image
+        self.image_request = image_request  # Pide la imagen al pool al primer pintado
         self.is_selected = False
         self.is_preferred = False
         self.size_factor = size_factor
         
-        # Configuración del estilo
+        # Configuración del estilo (reglas en APP_STYLESHEET)
         self.setObjectName("agentCard")
-        self.setStyleSheet(f"""
-            #agentCard {{
-                background-color: {VALORANT_LIGHT_BLUE};
-                border-radius: 8px;
-                padding: 5px;
-                margin: 5px;
-            }}
-            #agentCard:hover {{
-                background-color: #2A3441;
-                border: 1px solid {VALORANT_RED};
-            }}
-        """)
+        self.setProperty("selected", False)
         
         # Configuración del layout
         self.layout = QVBoxLayout(self)
@@ -112,25 +458,22 @@ class AgentCard(QFrame):
         
         # Nombre del agente
         self.name_label = QLabel(agent_name)
+        self.name_label.setObjectName("cardName")
         self.name_label.setAlignment(Qt.AlignCenter)
-        self.name_label.setStyleSheet(f"color: {VALORANT_WHITE}; font-weight: bold; font-size: {10 * self.size_factor}pt;")
+        self.name_label.setProperty("sizeBucket", size_bucket(self.size_factor))
         self.layout.addWidget(self.name_label)
         
         # Tier del agente
         self.tier_label = QLabel(tier)
+        self.tier_label.setObjectName("cardTier")
         self.tier_label.setAlignment(Qt.AlignCenter)
-        self.set_tier_color()
+        self.tier_label.setProperty("tier", tier)
+        self.tier_label.setProperty("sizeBucket", size_bucket(self.size_factor))
         self.layout.addWidget(self.tier_label)
         
         # Botón de información
         self.info_button = QPushButton("ℹ️")
-        self.info_button.setStyleSheet("""
-            background-color: transparent;
-            color: white;
-            border: none;
-            padding: 2px;
-            font-size: 12px;
-        """)
+        self.info_button.setObjectName("cardInfo")
         self.info_button.setCursor(QCursor(Qt.PointingHandCursor))
         self.info_button.clicked.connect(self.on_info_clicked)
         self.layout.addWidget(self.info_button)
@@ -145,9 +488,9 @@ class AgentCard(QFrame):
         """Establecer la imagen del agente"""
         if image:
             self.image = image
-            pixmap = QPixmap.fromImage(image)
             img_size = int(80 * self.size_factor)
-            pixmap = pixmap.scaled(img_size, img_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            pixmap = pixmap_cache.scaled(self.agent_name, image, QSize(img_size, img_size),
+                                         self.devicePixelRatioF())
             self.image_label.setPixmap(pixmap)
         else:
             # Crear imagen de placeholder
@@ -181,35 +524,35 @@ class AgentCard(QFrame):
     
     def set_tier_color(self):
         """Establecer el color del tier"""
-        color = TIER_COLORS.get(self.tier, VALORANT_WHITE)
-        self.tier_label.setStyleSheet(f"color: {color}; font-size: {8 * self.size_factor}pt;")
+        set_style_property(self.tier_label, "tier", self.tier)
+    
+    def set_agent(self, agent_name, role, tier, image_request=None):
+        """Reutilizar la tarjeta para otro agente sin recrear sus widgets"""
+        if (agent_name, role, tier) == (self.agent_name, self.role, self.tier) and (self.image or self.image_request):
+            return
+        
+        if agent_name != self.agent_name:
+            self.agent_name = agent_name
+            self.image = None
+            self.set_preferred(self.is_preferred)
+        
+        # Sin imagen todavía: la nueva petición sustituye a la que hubiera
+        if not self.image and image_request is not None:
+            self.image_request = image_request
+        
+        if tier != self.tier:
+            self.tier = tier
+            self.tier_label.setText(tier)
+            self.set_tier_color()
+        
+        self.role = role
+        if not self.image:
+            self.create_placeholder_image()
     
     def set_selected(self, selected):
         """Marcar el agente como seleccionado"""
         self.is_selected = selected
-        if selected:
-            self.setStyleSheet(f"""
-                #agentCard {{
-                    background-color: #2A3441;
-                    border: 2px solid {VALORANT_RED};
-                    border-radius: 8px;
-                    padding: 5px;
-                    margin: 5px;
-                }}
-            """)
-        else:
-            self.setStyleSheet(f"""
-                #agentCard {{
-                    background-color: {VALORANT_LIGHT_BLUE};
-                    border-radius: 8px;
-                    padding: 5px;
-                    margin: 5px;
-                }}
-                #agentCard:hover {{
-                    background-color: #2A3441;
-                    border: 1px solid {VALORANT_RED};
-                }}
-            """)
+        set_style_property(self, "selected", selected)
     
     def set_preferred(self, preferred):
         """Marcar el agente como preferido"""
@@ -223,6 +566,18 @@ class AgentCard(QFrame):
         """Manejar el clic en el botón de información"""
         self.info_clicked.emit(self.agent_name)
     
+    def paintEvent(self, event):
+        """Pedir la imagen la primera vez que la tarjeta es visible (hasta entonces, placeholder)"""
+        if self.image_request is not None:
+            request, self.image_request = self.image_request, None
+            request(partial(self.on_image_ready, self.agent_name))
+        super().paintEvent(event)
+    
+    def on_image_ready(self, agent_name, image):
+        """Aplicar una imagen del pool solo si la tarjeta sigue mostrando ese agente"""
+        if agent_name == self.agent_name:
+            self.set_image(image)
+    
     def mousePressEvent(self, event):
         """Manejar el evento de clic"""
         if event.button() == Qt.LeftButton:
@@ -231,6 +586,8 @@ class AgentCard(QFrame):
     
     def set_size_factor(self, factor):
         """Actualizar el factor de tamaño y redimensionar elementos"""
+        if factor == self.size_factor:
+            return
         self.size_factor = factor
         
         # Actualizar tamaños
@@ -239,8 +596,8 @@ class AgentCard(QFrame):
         self.image_label.setMaximumSize(img_size, img_size)
         
         # Actualizar estilos
-        self.name_label.setStyleSheet(f"color: {VALORANT_WHITE}; font-weight: bold; font-size: {10 * self.size_factor}pt;")
-        self.set_tier_color()
+        set_style_property(self.name_label, "sizeBucket", size_bucket(self.size_factor))
+        set_style_property(self.tier_label, "sizeBucket", size_bucket(self.size_factor))
         
         # Actualizar imagen
         if self.image:
@@ -252,27 +609,17 @@ class MapCard(QFrame):
     """Widget personalizado para mostrar un mapa con su imagen y nombre"""
     clicked = pyqtSignal(str)  # Señal que emite el nombre del mapa cuando se hace clic
     
-    def __init__(self, map_name, image=None, parent=None, size_factor=1.0):
+    def __init__(self, map_name, image=None, parent=None, size_factor=1.0, image_request=None):
         super().__init__(parent)
         self.map_name = map_name
         self.image = image
+        self.image_request = image_request  # Pide la imagen al pool al primer pintado
         self.is_selected = False
         self.size_factor = size_factor
         
-        # Configuración del estilo
+        # Configuración del estilo (reglas en APP_STYLESHEET)
         self.setObjectName("mapCard")
-        self.setStyleSheet(f"""
-            #mapCard {{
-                background-color: {VALORANT_LIGHT_BLUE};
-                border-radius: 8px;
-                padding: 5px;
-                margin: 2px;
-            }}
-            #mapCard:hover {{
-                background-color: #2A3441;
-                border: 1px solid {VALORANT_RED};
-            }}
-        """)
+        self.setProperty("selected", False)
         
         # Configuración del layout
         self.layout = QVBoxLayout(self)
@@ -290,8 +637,9 @@ class MapCard(QFrame):
         
         # Nombre del mapa
         self.name_label = QLabel(map_name)
+        self.name_label.setObjectName("cardName")
         self.name_label.setAlignment(Qt.AlignCenter)
-        self.name_label.setStyleSheet(f"color: {VALORANT_WHITE}; font-weight: bold; font-size: {10 * self.size_factor}pt;")
+        self.name_label.setProperty("sizeBucket", size_bucket(self.size_factor))
         self.layout.addWidget(self.name_label)
         
         # Establecer la imagen
@@ -304,10 +652,10 @@ class MapCard(QFrame):
         """Establecer la imagen del mapa"""
         if image:
             self.image = image
-            pixmap = QPixmap.fromImage(image)
             img_width = int(160 * self.size_factor)
             img_height = int(90 * self.size_factor)
-            pixmap = pixmap.scaled(img_width, img_height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            pixmap = pixmap_cache.scaled(self.map_name, image, QSize(img_width, img_height),
+                                         self.devicePixelRatioF())
             self.image_label.setPixmap(pixmap)
         else:
             # Crear imagen de placeholder
@@ -340,29 +688,14 @@ class MapCard(QFrame):
     def set_selected(self, selected):
         """Marcar el mapa como seleccionado"""
         self.is_selected = selected
-        if selected:
-            self.setStyleSheet(f"""
-                #mapCard {{
-                    background-color: #2A3441;
-                    border: 2px solid {VALORANT_RED};
-                    border-radius: 8px;
-                    padding: 5px;
-                    margin: 5px;
-                }}
-            """)
-        else:
-            self.setStyleSheet(f"""
-                #mapCard {{
-                    background-color: {VALORANT_LIGHT_BLUE};
-                    border-radius: 8px;
-                    padding: 5px;
-                    margin: 5px;
-                }}
-                #mapCard:hover {{
-                    background-color: #2A3441;
-                    border: 1px solid {VALORANT_RED};
-                }}
-            """)
+        set_style_property(self, "selected", selected)
+    
+    def paintEvent(self, event):
+        """Pedir la imagen la primera vez que la tarjeta es visible (hasta entonces, placeholder)"""
+        if self.image_request is not None:
+            request, self.image_request = self.image_request, None
+            request(self.set_image)
+        super().paintEvent(event)
     
     def mousePressEvent(self, event):
         """Manejar el evento de clic"""
@@ -372,6 +705,8 @@ class MapCard(QFrame):
     
     def set_size_factor(self, factor):
         """Actualizar el factor de tamaño y redimensionar elementos"""
+        if factor == self.size_factor:
+            return
         self.size_factor = factor
         
         # Actualizar tamaños
@@ -381,7 +716,7 @@ class MapCard(QFrame):
         self.image_label.setMaximumSize(img_width, img_height)
         
         # Actualizar estilos
-        self.name_label.setStyleSheet(f"color: {VALORANT_WHITE}; font-weight: bold; font-size: {10 * self.size_factor}pt;")
+        set_style_property(self.name_label, "sizeBucket", size_bucket(self.size_factor))
         
         # Actualizar imagen
         if self.image:
@@ -389,40 +724,256 @@ class MapCard(QFrame):
         else:
             self.create_placeholder_image()
 
+# Datos que el modelo de agentes expone a su delegado
+AGENT_ROLE_DATA = Qt.UserRole + 1
+AGENT_TIER_DATA = Qt.UserRole + 2
+AGENT_IMAGE_DATA = Qt.UserRole + 3
+AGENT_SELECTED_DATA = Qt.UserRole + 4
+AGENT_PREFERRED_DATA = Qt.UserRole + 5
+
+class AgentListModel(QAbstractListModel):
+    """Modelo con los agentes visibles de una cuadrícula
+    
+    Las miniaturas se piden al almacén de imágenes solo cuando la vista
+    consulta una fila, es decir, cuando la tarjeta llega a la pantalla.
+    """
+    def __init__(self, agents_data, images, image_size, parent=None):
+        super().__init__(parent)
+        self.agents_data = agents_data
+        self.images = images
+        self.image_size = image_size
+        self.agents = []
+        self.rows = {}
+        self.requested = set()
+        self.selected = None
+        self.preferred = None
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.agents)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        agent = self.agents[index.row()]
+        if role == Qt.DisplayRole:
+            return agent
+        if role == AGENT_ROLE_DATA:
+            return self.agents_data.get(agent, {}).get("role", "Desconocido")
+        if role == AGENT_TIER_DATA:
+            return self.agents_data.get(agent, {}).get("tier", "No clasificado")
+        if role == AGENT_IMAGE_DATA:
+            return self.get_image(agent)
+        if role == AGENT_SELECTED_DATA:
+            return agent == self.selected
+        if role == AGENT_PREFERRED_DATA:
+            return agent == self.preferred
+        return None
+    
+    def get_image(self, agent):
+        """Miniatura del agente, o None mientras se decodifica (o si no hay imagen)"""
+        if agent not in self.images:
+            return None
+        image = self.images.cached_thumbnail(agent, self.image_size)
+        if image is None and agent not in self.requested:
+            self.requested.add(agent)
+            self.images.request(agent, partial(self.on_image_ready, agent), self.image_size)
+        return image
+    
+    def on_image_ready(self, agent, image):
+        self.agent_changed(agent, [AGENT_IMAGE_DATA])
+    
+    def set_agents(self, agents):
+        """Sustituir la lista de agentes visibles (ya filtrada y ordenada)"""
+        self.beginResetModel()
+        self.agents = list(agents)
+        self.rows = {agent: row for row, agent in enumerate(self.agents)}
+        self.endResetModel()
+    
+    def set_selected(self, agent):
+        previous, self.selected = self.selected, agent
+        self.agent_changed(previous, [AGENT_SELECTED_DATA])
+        self.agent_changed(agent, [AGENT_SELECTED_DATA])
+    
+    def set_preferred(self, agent):
+        previous, self.preferred = self.preferred, agent
+        self.agent_changed(previous, [AGENT_PREFERRED_DATA])
+        self.agent_changed(agent, [AGENT_PREFERRED_DATA])
+    
+    def refresh_agents(self, agents):
+        """Volver a pintar los agentes cuyos datos cambiaron"""
+        for agent in agents:
+            self.requested.discard(agent)
+            self.agent_changed(agent)
+    
+    def agent_changed(self, agent, roles=None):
+        row = self.rows.get(agent)
+        if row is not None:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, roles or [])
+
+class AgentCardDelegate(QStyledItemDelegate):
+    """Pinta cada agente como una tarjeta: imagen, nombre, rol, tier y botón"""
+    def __init__(self, image_size=80, show_role=False, button_text="ℹ️", parent=None):
+        super().__init__(parent)
+        self.base_image_size = image_size
+        self.show_role = show_role
+        self.button_text = button_text
+        self.size_factor = 1.0
+    
+    def set_size_factor(self, factor):
+        self.size_factor = factor
+    
+    def image_size(self):
+        return int(self.base_image_size * self.size_factor)
+    
+    def name_font(self):
+        font = QFont()
+        font.setPointSizeF(10 * self.size_factor)
+        font.setBold(True)
+        return font
+    
+    def small_font(self):
+        font = QFont()
+        font.setPointSizeF(8 * self.size_factor)
+        return font
+    
+    def line_heights(self):
+        """Alturas de las líneas de texto bajo la imagen"""
+        name_height = QFontMetrics(self.name_font()).height()
+        small_height = QFontMetrics(self.small_font()).height() + 2
+        lines = [name_height] + [small_height] * (2 if self.show_role else 1)
+        return lines, small_height + 8  # Texto y botón
+    
+    def sizeHint(self, option, index):
+        lines, button_height = self.line_heights()
+        width = max(self.image_size(), int(90 * self.size_factor)) + 2 * 13
+        height = self.image_size() + sum(lines) + button_height + 2 * 13 + 4 * 4
+        return QSize(width, height)
+    
+    def card_rect(self, rect):
+        return rect.adjusted(5, 5, -5, -5)
+    
+    def button_rect(self, rect):
+        """Zona del botón de la tarjeta (para detectar clics)"""
+        card = self.card_rect(rect)
+        _, button_height = self.line_heights()
+        return QRect(card.left() + 8, card.bottom() - 8 - button_height, card.width() - 16, button_height)
+    
+    def paint(self, painter, option, index):
+        agent = index.data(Qt.DisplayRole)
+        role = index.data(AGENT_ROLE_DATA)
+        tier = index.data(AGENT_TIER_DATA)
+        selected = index.data(AGENT_SELECTED_DATA)
+        hovered = bool(option.state & QStyle.State_MouseOver)
+        
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        
+        # Fondo y borde de la tarjeta
+        card = self.card_rect(option.rect)
+        if selected:
+            painter.setPen(QPen(QColor(VALORANT_RED), 2))
+        elif hovered:
+            painter.setPen(QPen(QColor(VALORANT_RED), 1))
+        else:
+            painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor("#2A3441" if selected or hovered else VALORANT_LIGHT_BLUE))
+        painter.drawRoundedRect(card, 8, 8)
+        
+        # Imagen o placeholder
+        img_size = self.image_size()
+        image_rect = QRect(card.left() + (card.width() - img_size) // 2, card.top() + 8, img_size, img_size)
+        image = index.data(AGENT_IMAGE_DATA)
+        if image:
+            pixmap = pixmap_cache.scaled(agent, image, QSize(img_size, img_size), painter.device().devicePixelRatioF())
+            size = pixmap.size() / pixmap.devicePixelRatioF()
+            painter.drawPixmap(QRect(image_rect.left() + (img_size - size.width()) // 2,
+                                     image_rect.top() + (img_size - size.height()) // 2,
+                                     size.width(), size.height()), pixmap)
+        else:
+            color = QColor(ROLE_COLORS.get(role, VALORANT_WHITE))
+            painter.setPen(color)
+            painter.setBrush(color.darker(150))
+            painter.drawRoundedRect(image_rect.adjusted(5, 5, -5, -5), 10, 10)
+            painter.setPen(QColor(VALORANT_WHITE))
+            painter.setFont(QFont("Arial", int(12 * self.size_factor), QFont.Bold))
+            painter.drawText(image_rect.adjusted(5, 5, -5, -5), Qt.AlignCenter, agent)
+        
+        # Nombre, rol y tier
+        lines, button_height = self.line_heights()
+        name = f"{agent} ★" if index.data(AGENT_PREFERRED_DATA) else agent
+        texts = [(name, self.name_font(), VALORANT_WHITE)]
+        if self.show_role:
+            texts.append((role, self.small_font(), ROLE_COLORS.get(role, VALORANT_WHITE)))
+        texts.append((tier, self.small_font(), TIER_COLORS.get(tier, VALORANT_WHITE)))
+        
+        y = image_rect.bottom() + 4
+        for (text, font, color), height in zip(texts, lines):
+            painter.setFont(font)
+            painter.setPen(QColor(color))
+            painter.drawText(QRect(card.left(), y, card.width(), height), Qt.AlignCenter, text)
+            y += height + 4
+        
+        # Botón (información o detalles)
+        button = self.button_rect(option.rect)
+        if len(self.button_text) > 2:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(VALORANT_BLUE))
+            painter.drawRoundedRect(button, 4, 4)
+        painter.setFont(self.small_font())
+        painter.setPen(QColor(VALORANT_WHITE))
+        painter.drawText(button, Qt.AlignCenter, self.button_text)
+        
+        painter.restore()
+
+class AgentGridView(QListView):
+    """Cuadrícula virtualizada de agentes: solo se pintan las tarjetas visibles"""
+    agent_clicked = pyqtSignal(str)  # Clic en la tarjeta
+    info_clicked = pyqtSignal(str)  # Clic en el botón de la tarjeta
+    
+    def __init__(self, model, delegate, parent=None):
+        super().__init__(parent)
+        self.setModel(model)
+        self.setItemDelegate(delegate)
+        self.setViewMode(QListView.IconMode)
+        self.setResizeMode(QListView.Adjust)
+        self.setMovement(QListView.Static)
+        self.setWrapping(True)
+        self.setUniformItemSizes(True)
+        self.setSpacing(2)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setFrameShape(QFrame.NoFrame)
+        self.setMouseTracking(True)
+        self.viewport().setAttribute(Qt.WA_Hover)
+        self.viewport().setCursor(QCursor(Qt.PointingHandCursor))
+        self.setStyleSheet("background-color: transparent;")
+    
+    def set_size_factor(self, factor):
+        """Cambiar el tamaño de las tarjetas y recalcular la distribución"""
+        self.itemDelegate().set_size_factor(factor)
+        self.setUniformItemSizes(True)  # Descarta el tamaño de celda memorizado
+        self.scheduleDelayedItemsLayout()
+    
+    def mouseReleaseEvent(self, event):
+        index = self.indexAt(event.pos())
+        if index.isValid() and event.button() == Qt.LeftButton:
+            agent = index.data(Qt.DisplayRole)
+            if self.itemDelegate().button_rect(self.visualRect(index)).contains(event.pos()):
+                self.info_clicked.emit(agent)
+            else:
+                self.agent_clicked.emit(agent)
+        super().mouseReleaseEvent(event)
+
 class RoleButton(QPushButton):
     """Botón personalizado para selección de rol"""
     def __init__(self, role, parent=None):
         super().__init__(role, parent)
         self.role = role
         
-        # Configurar estilo según el rol
-        role_colors = {
-            "Todos": "#333333",
-            "Duelista": ROLE_COLORS["Duelista"],
-            "Iniciador": ROLE_COLORS["Iniciador"],
-            "Controlador": ROLE_COLORS["Controlador"],
-            "Centinela": ROLE_COLORS["Centinela"]
-        }
-        
-        text_color = 'white' if role in ['Todos', 'Duelista'] else '#0F1923'
-        
-        self.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {role_colors[role]};
-                color: {text_color};
-                border: none;
-                border-radius: 4px;
-                padding: 5px 10px;
-                font-weight: bold;
-                font-size: 10px;
-            }}
-            QPushButton:hover {{
-                background-color: {QColor(role_colors[role]).lighter(110).name()};
-            }}
-            QPushButton:pressed {{
-                background-color: {QColor(role_colors[role]).darker(110).name()};
-            }}
-        """)
+        # El color según el rol está en la hoja de estilo de la aplicación
+        self.setProperty("roleFilter", role)
         
         self.setCursor(QCursor(Qt.PointingHandCursor))
 
@@ -430,26 +981,340 @@ class StyleRadioButton(QRadioButton):
     """Botón de radio personalizado para estilos de juego"""
     def __init__(self, text, parent=None):
         super().__init__(text, parent)
-        self.setStyleSheet(f"""
-            QRadioButton {{
-                color: {VALORANT_WHITE};
-                font-size: 12px;
-                spacing: 8px;
-            }}
-            QRadioButton::indicator {{
-                width: 16px;
-                height: 16px;
-                border-radius: 8px;
-            }}
-            QRadioButton::indicator:unchecked {{
-                border: 2px solid {VALORANT_WHITE};
-                background-color: transparent;
-            }}
-            QRadioButton::indicator:checked {{
-                border: 2px solid {VALORANT_RED};
-                background-color: {VALORANT_RED};
-            }}
-        """)
+        self.setProperty("styleOption", True)
+
+class CompositionView(QWidget):
+    """Panel persistente con el resultado de una recomendación
+    
+    Los widgets se crean una sola vez; cada nueva composición solo cambia
+    textos, imágenes y visibilidad, reutilizando las tarjetas de agentes.
+    """
+    info_clicked = pyqtSignal(str)  # Nombre del agente cuyo botón de info se pulsó
+    save_clicked = pyqtSignal()
+    export_clicked = pyqtSignal()
+    details_clicked = pyqtSignal()
+    
+    def __init__(self, agent_images, map_images, parent=None):
+        super().__init__(parent)
+        self.agent_images = agent_images
+        self.map_images = map_images
+        self.map_name = None
+        
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(15)
+        
+        layout.addWidget(self.create_map_section())
+        layout.addWidget(self.create_comp_section())
+        layout.addWidget(self.create_tips_section())
+        layout.addWidget(self.create_alt_section())
+        layout.addWidget(self.create_actions_section())
+    
+    def create_section(self, layout_class=QVBoxLayout):
+        section = QFrame()
+        section.setObjectName("resultSection")
+        return section, layout_class(section)
+    
+    def create_map_section(self):
+        """Cabecera con la imagen del mapa, el estilo y la estrategia"""
+        map_section, map_layout = self.create_section()
+        
+        # Cabecera con mapa y estilo
+        header_frame = QFrame()
+        header_layout = QHBoxLayout(header_frame)
+        header_layout.setContentsMargins(0, 0, 0, 0)
+        
+        # Imagen del mapa (si está disponible)
+        self.map_img_label = QLabel()
+        header_layout.addWidget(self.map_img_label)
+        
+        # Información del mapa
+        map_info_frame = QFrame()
+        map_info_layout = QVBoxLayout(map_info_frame)
+        
+        # Título del mapa
+        self.map_title = QLabel()
+        self.map_title.setProperty("textStyle", "mapTitle")
+        map_info_layout.addWidget(self.map_title)
+        
+        # Estilo de composición
+        self.style_label = QLabel()
+        self.style_label.setProperty("textStyle", "subtitle")
+        map_info_layout.addWidget(self.style_label)
+        
+        header_layout.addWidget(map_info_frame, 1)  # 1 = stretch factor
+        map_layout.addWidget(header_frame)
+        
+        # Descripción del mapa
+        desc_label = QLabel("ESTRATEGIA RECOMENDADA:")
+        desc_label.setProperty("textStyle", "heading")
+        map_layout.addWidget(desc_label)
+        
+        self.desc_text = QLabel()
+        self.desc_text.setProperty("textStyle", "body")
+        self.desc_text.setWordWrap(True)
+        map_layout.addWidget(self.desc_text)
+        
+        return map_section
+    
+    def create_comp_section(self):
+        """Sección de la composición: una fila de tarjetas por rol"""
+        comp_section, comp_layout = self.create_section()
+        
+        # Título de composición
+        comp_title = QLabel("COMPOSICIÓN DE EQUIPO")
+        comp_title.setProperty("textStyle", "sectionTitle")
+        comp_layout.addWidget(comp_title)
+        
+        # Filas por rol: {rol: (frame, layout de agentes, tarjetas)}
+        self.role_rows = {}
+        for role in ROLE_ORDER:
+            role_frame = QFrame()
+            role_frame.setObjectName("plainFrame")
+            role_layout = QVBoxLayout(role_frame)
+            role_layout.setContentsMargins(0, 10, 0, 5)
+            
+            # Etiqueta de rol
+            role_label = QLabel(role.upper())
+            role_label.setProperty("textStyle", "role")
+            role_label.setProperty("role", role)
+            role_layout.addWidget(role_label)
+            
+            # Frame para los agentes de este rol
+            agents_frame = QFrame()
+            agents_frame.setObjectName("plainFrame")
+            agents_layout = QHBoxLayout(agents_frame)
+            agents_layout.setContentsMargins(0, 0, 0, 0)
+            agents_layout.setSpacing(15)
+            
+            role_layout.addWidget(agents_frame)
+            comp_layout.addWidget(role_frame)
+            self.role_rows[role] = (role_frame, agents_layout, [])
+        
+        return comp_section
+    
+    def create_tips_section(self):
+        """Sección de consejos; las filas se reutilizan entre composiciones"""
+        tips_section, self.tips_layout = self.create_section()
+        
+        # Título de recomendaciones
+        tips_title = QLabel("RECOMENDACIONES ADICIONALES")
+        tips_title.setProperty("textStyle", "title")
+        self.tips_layout.addWidget(tips_title)
+        
+        self.tip_rows = []  # (frame, etiqueta de texto)
+        return tips_section
+    
+    def create_tip_row(self):
+        """Crear una fila de consejo con viñeta"""
+        tip_frame = QFrame()
+        tip_frame.setObjectName("plainFrame")
+        tip_layout = QHBoxLayout(tip_frame)
+        tip_layout.setContentsMargins(0, 5, 0, 5)
+        
+        # Bullet point
+        bullet = QLabel("•")
+        bullet.setProperty("textStyle", "bullet")
+        tip_layout.addWidget(bullet)
+        
+        # Texto del consejo
+        tip_text = QLabel()
+        tip_text.setProperty("textStyle", "body")
+        tip_text.setWordWrap(True)
+        tip_layout.addWidget(tip_text, 1)  # 1 = stretch factor
+        
+        self.tips_layout.addWidget(tip_frame)
+        return tip_frame, tip_text
+    
+    def create_alt_section(self):
+        """Sección con las composiciones pro, ranked, alternativa y calculadas"""
+        alt_section, alt_layout = self.create_section()
+        
+        # Título de composiciones alternativas
+        alt_title = QLabel("COMPOSICIONES ALTERNATIVAS")
+        alt_title.setProperty("textStyle", "title")
+        alt_layout.addWidget(alt_title)
+        
+        self.alt_texts = {}
+        for key, title in [("pro", "Composición Pro:"), ("ranked", "Composición Ranked:"),
+                           ("alt", "Composición Alternativa:"), ("ranked_teams", "Mejores Equipos Calculados:")]:
+            label = QLabel(title)
+            label.setProperty("textStyle", "heading")
+            alt_layout.addWidget(label)
+            
+            text = QLabel()
+            text.setProperty("textStyle", "body")
+            text.setWordWrap(True)
+            alt_layout.addWidget(text)
+            self.alt_texts[key] = text
+        
+        return alt_section
+    
+    def create_actions_section(self):
+        """Botones de acción sobre la composición mostrada"""
+        actions_frame, actions_layout = self.create_section(QHBoxLayout)
+        
+        # Botón para guardar composición
+        save_button = HoverButton("Guardar Composición")
+        save_button.clicked.connect(self.save_clicked)
+        actions_layout.addWidget(save_button)
+        
+        # Botón para exportar composición
+        export_button = HoverButton("Exportar Composición")
+        export_button.clicked.connect(self.export_clicked)
+        actions_layout.addWidget(export_button)
+        
+        # Botón para ver detalles de agentes
+        details_button = HoverButton("Ver Detalles de Agentes", color=VALORANT_LIGHT_BLUE)
+        details_button.clicked.connect(self.details_clicked)
+        actions_layout.addWidget(details_button)
+        
+        return actions_frame
+    
+    def set_result(self, result, catalog, size_factor=1.0):
+        """Mostrar una recomendación del motor actualizando los widgets existentes"""
+        self.set_map(result["map"])
+        self.style_label.setText(f"ESTILO: {result['style'].upper()}")
+        self.desc_text.setText(result["description"])
+        
+        # Agrupar agentes por rol
+        roles_used = {}
+        for agent in result["composition"]:
+            roles_used.setdefault(catalog.role(agent), []).append(agent)
+        
+        for role, (role_frame, agents_layout, cards) in self.role_rows.items():
+            agents = roles_used.get(role, [])
+            
+            # Crear tarjetas solo si este rol nunca tuvo tantos agentes
+            while len(cards) < len(agents):
+                agent = agents[len(cards)]
+                card = AgentCard(agent, role, "", size_factor=size_factor,
+                                 image_request=partial(self.agent_images.request, agent, size=AGENT_THUMBNAIL_SIZE))
+                card.info_clicked.connect(self.info_clicked)
+                agents_layout.addWidget(card)
+                cards.append(card)
+            
+            for card, agent in zip(cards, agents):
+                card.set_agent(agent, role, catalog.tier(agent),
+                               image_request=partial(self.agent_images.request, agent, size=AGENT_THUMBNAIL_SIZE))
+                card.set_preferred(agent == result["agent"])
+                card.set_size_factor(size_factor)
+            
+            for i, card in enumerate(cards):
+                card.setVisible(i < len(agents))
+            role_frame.setVisible(bool(agents))
+        
+        # Consejos generados por el motor
+        tips = result["tips"]
+        while len(self.tip_rows) < len(tips):
+            self.tip_rows.append(self.create_tip_row())
+        for i, (tip_frame, tip_text) in enumerate(self.tip_rows):
+            if i < len(tips):
+                tip_text.setText(tips[i])
+            tip_frame.setVisible(i < len(tips))
+        
+        # Composiciones alternativas
+        for key in ("pro", "ranked", "alt"):
+            self.alt_texts[key].setText(", ".join(result[key]))
+        self.alt_texts["ranked_teams"].setText("\n".join(f"{i}. {', '.join(team['composition'])} ({team['score']})"
+                                                         for i, team in enumerate(result.get("ranked_teams", []), 1)))
+    
+    def set_map(self, map_name):
+        """Actualizar la cabecera del mapa (la imagen solo si cambió el mapa)"""
+        self.map_title.setText(f"MAPA: {map_name.upper()}")
+        if map_name == self.map_name:
+            return
+        self.map_name = map_name
+        
+        # La imagen llega del pool; mientras tanto (o si no hay archivo) no se muestra
+        self.map_img_label.setVisible(False)
+        if map_name in self.map_images:
+            self.map_images.request(map_name, partial(self.on_map_image, map_name), MAP_HEADER_SIZE)
+    
+    def on_map_image(self, map_name, image):
+        if map_name != self.map_name:
+            return  # Llegó tarde: ya se muestra otro mapa
+        self.map_img_label.setPixmap(pixmap_cache.scaled(map_name, image, MAP_HEADER_SIZE, self.devicePixelRatioF()))
+        self.map_img_label.setVisible(True)
+
+class RecommendSignals(QObject):
+    """Señales de las tareas de recomendación; vive en el hilo de la interfaz"""
+    finished = pyqtSignal(int, object)  # Número de petición, resultado
+    failed = pyqtSignal(int, str)  # Número de petición, mensaje de error
+
+class RecommendTask(QRunnable):
+    """Calcular una recomendación del motor en un hilo del pool"""
+    def __init__(self, signals, request_id, engine, map_name, agent, comp_style):
+        super().__init__()
+        self.signals = signals
+        self.request_id = request_id
+        self.engine = engine
+        self.map_name = map_name
+        self.agent = agent
+        self.comp_style = comp_style
+    
+    def run(self):
+        try:
+            result = self.engine.recommend(self.map_name, self.agent, self.comp_style)
+            result["ranked_teams"] = self.engine.recommend(self.map_name, self.agent, self.comp_style,
+                                                           search=True, top_k=3)["ranked_teams"]
+        except Exception as e:
+            # Una excepción que salga de un QRunnable cierra la aplicación
+            self.signals.failed.emit(self.request_id, str(e))
+            return
+        self.signals.finished.emit(self.request_id, result)
+
+class StatsSignals(QObject):
+    """Señales del refresco de estadísticas; vive en el hilo de la interfaz"""
+    finished = pyqtSignal(object, bool)  # Estadísticas refrescadas, si cambiaron
+    failed = pyqtSignal(str)  # Mensaje de error
+
+class StatsRefreshTask(QRunnable):
+    """Incorporar las partidas nuevas en un hilo del pool
+    
+    Trabaja sobre su propia instancia de MatchStats: la interfaz sigue
+    consultando la anterior hasta recibir esta.
+    """
+    def __init__(self, signals, matches_dir, store_dir):
+        super().__init__()
+        self.signals = signals
+        self.matches_dir = matches_dir
+        self.store_dir = store_dir
+    
+    def run(self):
+        try:
+            stats = MatchStats(self.matches_dir, self.store_dir)
+            changed = stats.refresh()
+            stats.teams_in(None, None)  # El recuento de equipos recorre todas las filas: hacerlo aquí
+        except Exception as e:
+            # Una excepción que salga de un QRunnable cierra la aplicación
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(stats, changed)
+
+class KnowledgeBaseSignals(QObject):
+    """Señales de la recarga de la base de conocimiento; vive en el hilo de la interfaz"""
+    finished = pyqtSignal(object, object)  # Motor con los datos nuevos, cambios
+    failed = pyqtSignal(str)  # Mensaje de error
+
+class KnowledgeBaseReloadTask(QRunnable):
+    """Leer y comparar la base de conocimiento en un hilo del pool
+    
+    No modifica el motor: la interfaz aplica los cambios al recibirlos.
+    """
+    def __init__(self, signals, engine):
+        super().__init__()
+        self.signals = signals
+        self.engine = engine
+    
+    def run(self):
+        try:
+            fresh, changes = self.engine.prepare_reload()
+        except Exception as e:
+            # Una excepción que salga de un QRunnable cierra la aplicación
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(fresh, changes)
 
 class AnimatedProgressBar(QProgressBar):
     """Barra de progreso animada personalizada"""
@@ -458,30 +1323,19 @@ class AnimatedProgressBar(QProgressBar):
         self.setRange(0, 100)
         self.setValue(0)
         self.setTextVisible(False)
-        self.setStyleSheet(f"""
-            QProgressBar {{
-                border: none;
-                border-radius: 4px;
-                background-color: {VALORANT_LIGHT_BLUE};
-                height: 8px;
-            }}
-            QProgressBar::chunk {{
-                background-color: {VALORANT_RED};
-                border-radius: 4px;
-            }}
-        """)
+        self.setObjectName("animatedProgress")
         
         # Animación
         self.animation_timer = QTimer(self)
         self.animation_timer.timeout.connect(self.update_animation)
         self.animation_value = 0
-        
+    
     def start_animation(self):
         """Iniciar animación"""
         self.animation_value = 0
         self.setValue(0)
         self.animation_timer.start(20)
-        
+    
     def update_animation(self):
         """Actualizar valor de la animación"""
         self.animation_value += 2
@@ -490,13 +1344,56 @@ class AnimatedProgressBar(QProgressBar):
             self.animation_value = 100
         self.setValue(self.animation_value)
 
+class LazyTabWidget(QTabWidget):
+    """QTabWidget cuyas tabs se construyen la primera vez que se muestran"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.tab_builders = {}
+        self.currentChanged.connect(self.build_tab)
+    
+    def add_lazy_tab(self, title, builder):
+        """Añadir una tab vacía que se rellena con builder(tab) al mostrarse"""
+        tab = QWidget()
+        index = self.addTab(tab, title)
+        self.tab_builders[index] = builder
+        
+        # La primera tab es la actual desde el principio: construirla ya
+        if index == self.currentIndex():
+            self.build_tab(index)
+        return index
+    
+    def reset_tab(self, index, builder):
+        """Sustituir el contenido de una tab por uno que builder rellenará al mostrarse"""
+        old_tab, title = self.widget(index), self.tabText(index)
+        current = self.currentIndex()
+        
+        # Sin señales: quitar y volver a poner la tab no debe construir otras
+        self.blockSignals(True)
+        self.removeTab(index)
+        self.insertTab(index, QWidget(), title)
+        self.setCurrentIndex(current)
+        self.blockSignals(False)
+        old_tab.deleteLater()
+        
+        self.tab_builders[index] = builder
+        if index == current:
+            self.build_tab(index)
+    
+    def build_tab(self, index):
+        """Construir el contenido de la tab si aún no se ha hecho"""
+        builder = self.tab_builders.pop(index, None)
+        if builder is not None:
+            builder(self.widget(index))
+
 class AgentInfoDialog(QDialog):
     """Diálogo para mostrar información detallada de un agente"""
-    def __init__(self, agent_name, agent_data, agent_image=None, parent=None):
+    def __init__(self, agent_name, agent_data, image_request=None, parent=None, catalog=None, stats=None):
         super().__init__(parent)
         self.agent_name = agent_name
         self.agent_data = agent_data
-        self.agent_image = agent_image
+        self.image_request = image_request
+        self.catalog = catalog
+        self.stats = stats
         
         self.setWindowTitle(f"Información de {agent_name}")
         self.setMinimumSize(600, 700)
@@ -540,29 +1437,14 @@ class AgentInfoDialog(QDialog):
         # Cabecera con imagen y datos básicos
         self.create_header(layout)
         
-        # Tabs para organizar la información
-        tab_widget = QTabWidget()
-        layout.addWidget(tab_widget)
-        
-        # Tab de habilidades
-        abilities_tab = QWidget()
-        self.create_abilities_tab(abilities_tab)
-        tab_widget.addTab(abilities_tab, "Habilidades")
-        
-        # Tab de estrategias
-        strategies_tab = QWidget()
-        self.create_strategies_tab(strategies_tab)
-        tab_widget.addTab(strategies_tab, "Estrategias")
+        # Tabs para organizar la información; cada una se construye al abrirla
+        self.tab_widget = LazyTabWidget()
+        layout.addWidget(self.tab_widget)
         
-        # Tab de estadísticas
-        stats_tab = QWidget()
-        self.create_stats_tab(stats_tab)
-        tab_widget.addTab(stats_tab, "Estadísticas")
-        
-        # Tab de lineups
-        lineups_tab = QWidget()
-        self.create_lineups_tab(lineups_tab)
-        tab_widget.addTab(lineups_tab, "Lineups")
+        self.tab_widget.add_lazy_tab("Habilidades", self.create_abilities_tab)
+        self.tab_widget.add_lazy_tab("Estrategias", self.create_strategies_tab)
+        self.stats_tab = self.tab_widget.add_lazy_tab("Estadísticas", self.create_stats_tab)
+        self.tab_widget.add_lazy_tab("Lineups", self.create_lineups_tab)
         
         # Botones de acción
         button_layout = QHBoxLayout()
@@ -594,17 +1476,13 @@ class AgentInfoDialog(QDialog):
         image_frame = QFrame()
         image_layout = QVBoxLayout(image_frame)
         
-        image_label = QLabel()
-        if self.agent_image:
-            pixmap = QPixmap.fromImage(self.agent_image)
-            pixmap = pixmap.scaled(150, 150, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            image_label.setPixmap(pixmap)
-        else:
-            # Crear imagen de placeholder
-            self.create_placeholder_image(image_label)
-        
-        image_label.setAlignment(Qt.AlignCenter)
-        image_layout.addWidget(image_label)
+        # Placeholder hasta que el pool entregue la imagen (si la hay)
+        self.image_label = QLabel()
+        self.create_placeholder_image(self.image_label)
+        self.image_label.setAlignment(Qt.AlignCenter)
+        image_layout.addWidget(self.image_label)
+        if self.image_request is not None:
+            self.image_request(self.set_agent_image)
         
         # Tier del agente
         tier = self.get_agent_tier()
@@ -775,10 +1653,41 @@ class AgentInfoDialog(QDialog):
         # Añadir espaciador para alinear al principio
         layout.addStretch()
     
+    def set_stats(self, stats):
+        """Usar estadísticas recién refrescadas; la tab se rehace al mostrarse"""
+        self.stats = stats
+        self.tab_widget.reset_tab(self.stats_tab, self.create_stats_tab)
+    
     def create_stats_tab(self, tab):
-        """Crear tab de estadísticas"""
+        """Crear tab de estadísticas a partir del historial de partidas"""
         layout = QVBoxLayout(tab)
         
+        if not self.stats or self.stats.agent_stats(self.agent_name) is None:
+            empty_frame = QFrame()
+            empty_frame.setStyleSheet(f"background-color: {VALORANT_LIGHT_BLUE}; border-radius: 8px;")
+            empty_layout = QVBoxLayout(empty_frame)
+            
+            empty_title = QLabel("Sin partidas registradas")
+            empty_title.setStyleSheet(f"font-size: 16px; font-weight: bold; color: {VALORANT_RED};")
+            empty_layout.addWidget(empty_title)
+            
+            empty_msg = QLabel(f"Copia exportaciones de partidas (JSON o CSV) en la carpeta "
+                               f"'{os.path.basename(MATCHES_DIR)}' para ver las estadísticas de {self.agent_name}.")
+            empty_msg.setWordWrap(True)
+            empty_msg.setStyleSheet("font-size: 12px;")
+            empty_layout.addWidget(empty_msg)
+            
+            layout.addWidget(empty_frame)
+            layout.addStretch()
+            return
+        
+        # Filtro por mapa: las consultas leen agregados ya calculados
+        map_combo = QComboBox()
+        map_combo.addItem("Todos los mapas", None)
+        for map_key in self.stats.maps_for(self.agent_name):
+            map_combo.addItem(map_key.title(), map_key)
+        layout.addWidget(map_combo)
+        
         # Estadísticas generales
         stats_frame = QFrame()
         stats_frame.setStyleSheet(f"background-color: {VALORANT_LIGHT_BLUE}; border-radius: 8px;")
@@ -788,40 +1697,11 @@ class AgentInfoDialog(QDialog):
         stats_title.setStyleSheet(f"font-size: 16px; font-weight: bold; color: {VALORANT_RED};")
         stats_layout.addWidget(stats_title)
         
-        # Generar estadísticas simuladas
-        stats = self.generate_simulated_stats()
+        self.games_label = QLabel()
+        self.games_label.setStyleSheet("font-size: 12px;")
+        stats_layout.addWidget(self.games_label)
         
-        # Mostrar estadísticas con barras de progreso
-        for stat_name, stat_value in stats.items():
-            stat_frame = QFrame()
-            stat_layout = QHBoxLayout(stat_frame)
-            stat_layout.setContentsMargins(0, 0, 0, 0)
-            
-            stat_label = QLabel(f"{stat_name}:")
-            stat_label.setMinimumWidth(150)
-            stat_layout.addWidget(stat_label)
-            
-            progress = QProgressBar()
-            progress.setRange(0, 100)
-            progress.setValue(stat_value)
-            progress.setTextVisible(True)
-            progress.setFormat(f"{stat_value}%")
-            progress.setStyleSheet(f"""
-                QProgressBar {{
-                    border: none;
-                    border-radius: 4px;
-                    background-color: {VALORANT_BLUE};
-                    text-align: center;
-                    height: 20px;
-                }}
-                QProgressBar::chunk {{
-                    background-color: {VALORANT_RED};
-                    border-radius: 4px;
-                }}
-            """)
-            stat_layout.addWidget(progress)
-            
-            stats_layout.addWidget(stat_frame)
+        self.stat_bars = {name: self.add_percentage_row(stats_layout, name) for name in STAT_NAMES}
         
         layout.addWidget(stats_frame)
         
@@ -834,46 +1714,65 @@ class AgentInfoDialog(QDialog):
         rank_title.setStyleSheet(f"font-size: 16px; font-weight: bold; color: {VALORANT_RED};")
         rank_layout.addWidget(rank_title)
         
-        # Generar popularidad simulada por rango
-        ranks = self.generate_simulated_rank_popularity()
-        
-        # Mostrar popularidad por rango con barras de progreso
-        for rank_name, rank_value in ranks.items():
-            rank_frame = QFrame()
-            rank_layout = QHBoxLayout(rank_frame)
-            rank_layout.setContentsMargins(0, 0, 0, 0)
-            
-            rank_label = QLabel(f"{rank_name}:")
-            rank_label.setMinimumWidth(150)
-            rank_layout.addWidget(rank_label)
-            
-            progress = QProgressBar()
-            progress.setRange(0, 100)
-            progress.setValue(rank_value)
-            progress.setTextVisible(True)
-            progress.setFormat(f"{rank_value}%")
-            progress.setStyleSheet(f"""
-                QProgressBar {{
-                    border: none;
-                    border-radius: 4px;
-                    background-color: {VALORANT_BLUE};
-                    text-align: center;
-                    height: 20px;
-                }}
-                QProgressBar::chunk {{
-                    background-color: {VALORANT_RED};
-                    border-radius: 4px;
-                }}
-            """)
-            rank_layout.addWidget(progress)
-            
-            rank_layout.addWidget(rank_frame)
+        self.rank_bars = {rank: self.add_percentage_row(rank_layout, rank) for rank in RANKS}
         
         layout.addWidget(rank_frame)
         
+        map_combo.currentIndexChanged.connect(lambda _: self.show_stats(map_combo.currentData()))
+        self.show_stats(None)
+        
         # Añadir espaciador para alinear al principio
         layout.addStretch()
     
+    def add_percentage_row(self, layout, name):
+        """Añadir una fila con etiqueta y barra de porcentaje; devuelve (fila, barra)"""
+        row = QFrame()
+        row_layout = QHBoxLayout(row)
+        row_layout.setContentsMargins(0, 0, 0, 0)
+        
+        label = QLabel(f"{name}:")
+        label.setMinimumWidth(150)
+        row_layout.addWidget(label)
+        
+        progress = QProgressBar()
+        progress.setRange(0, 100)
+        progress.setTextVisible(True)
+        progress.setStyleSheet(f"""
+            QProgressBar {{
+                border: none;
+                border-radius: 4px;
+                background-color: {VALORANT_BLUE};
+                text-align: center;
+                height: 20px;
+            }}
+            QProgressBar::chunk {{
+                background-color: {VALORANT_RED};
+                border-radius: 4px;
+            }}
+        """)
+        row_layout.addWidget(progress)
+        
+        layout.addWidget(row)
+        return row, progress
+    
+    def show_stats(self, map_key):
+        """Mostrar los agregados del agente para un mapa (None = todos)"""
+        stats = self.stats.agent_stats(self.agent_name, map_key) or {}
+        self.games_label.setText(f"Partidas analizadas: {stats.get('Partidas', 0)}")
+        for name, (row, progress) in self.stat_bars.items():
+            self.set_percentage(row, progress, stats.get(name))
+        
+        pick_rates = self.stats.rank_pick_rates(self.agent_name, map_key)
+        for rank, (row, progress) in self.rank_bars.items():
+            self.set_percentage(row, progress, pick_rates.get(rank))
+    
+    def set_percentage(self, row, progress, value):
+        """Actualizar una barra; las filas sin datos se ocultan"""
+        row.setVisible(value is not None)
+        if value is not None:
+            progress.setValue(value)
+            progress.setFormat(f"{value}%")
+    
     def create_lineups_tab(self, tab):
         """Crear tab de lineups"""
         layout = QVBoxLayout(tab)
@@ -933,6 +1832,11 @@ class AgentInfoDialog(QDialog):
         # Añadir espaciador para alinear al principio
         layout.addStretch()
     
+    def set_agent_image(self, image):
+        """Sustituir el placeholder por la imagen del agente"""
+        self.image_label.setPixmap(pixmap_cache.scaled(self.agent_name, image, AGENT_HEADER_SIZE,
+                                                       self.devicePixelRatioF()))
+    
     def create_placeholder_image(self, label):
         """Crear imagen de placeholder para el agente"""
         role = self.get_agent_role()
@@ -958,80 +1862,24 @@ class AgentInfoDialog(QDialog):
         label.setPixmap(QPixmap.fromImage(image))
     
     def get_agent_role(self):
-        """Obtener el rol del agente desde los datos o simularlo"""
+        """Obtener el rol del agente desde los datos o el catálogo"""
         if "role" in self.agent_data:
             return self.agent_data["role"]
         
-        # Simular rol basado en el nombre del agente
-        agent_roles = {
-            "Jett": "Duelista",
-            "Raze": "Duelista",
-            "Phoenix": "Duelista",
-            "Reyna": "Duelista",
-            "Neon": "Duelista",
-            "Yoru": "Duelista",
-            "Iso": "Duelista",
-            "Sova": "Iniciador",
-            "Breach": "Iniciador",
-            "Skye": "Iniciador",
-            "KAY/O": "Iniciador",
-            "Fade": "Iniciador",
-            "Gekko": "Iniciador",
-            "Tejo": "Iniciador",
-            "Waylay": "Iniciador",
-            "Brimstone": "Controlador",
-            "Viper": "Controlador",
-            "Omen": "Controlador",
-            "Astra": "Controlador",
-            "Harbor": "Controlador",
-            "Clove": "Controlador",
-            "Killjoy": "Centinela",
-            "Cypher": "Centinela",
-            "Sage": "Centinela",
-            "Chamber": "Centinela",
-            "Deadlock": "Centinela",
-            "Vyse": "Centinela"
-        }
+        if self.catalog is not None:
+            return self.catalog.role(self.agent_name)
         
-        return agent_roles.get(self.agent_name, "Desconocido")
+        return "Desconocido"
     
     def get_agent_tier(self):
-        """Obtener el tier del agente desde los datos o simularlo"""
+        """Obtener el tier del agente desde los datos o el catálogo"""
         if "tier" in self.agent_data:
             return self.agent_data["tier"]
         
-        # Simular tier basado en el nombre del agente
-        agent_tiers = {
-            "Tejo": "S-Tier",
-            "Clove": "S-Tier",
-            "Raze": "S-Tier",
-            "Vyse": "S-Tier",
-            "Yoru": "A-Tier",
-            "Deadlock": "A-Tier",
-            "Cypher": "A-Tier",
-            "Jett": "A-Tier",
-            "Iso": "A-Tier",
-            "Neon": "A-Tier",
-            "Sova": "A-Tier",
-            "Gekko": "A-Tier",
-            "Killjoy": "A-Tier",
-            "Omen": "A-Tier",
-            "Brimstone": "A-Tier",
-            "Phoenix": "A-Tier",
-            "Sage": "A-Tier",
-            "Chamber": "B-Tier",
-            "Viper": "B-Tier",
-            "Breach": "B-Tier",
-            "Skye": "B-Tier",
-            "Fade": "B-Tier",
-            "Astra": "B-Tier",
-            "Reyna": "B-Tier",
-            "Waylay": "C-Tier",
-            "KAY/O": "C-Tier",
-            "Harbor": "C-Tier"
-        }
+        if self.catalog is not None:
+            return self.catalog.tier(self.agent_name)
         
-        return agent_tiers.get(self.agent_name, "No clasificado")
+        return "No clasificado"
     
     def get_recommended_maps(self):
         """Obtener mapas recomendados para el agente"""
@@ -1057,105 +1905,6 @@ class AgentInfoDialog(QDialog):
         else:
             return ["Información no disponible para este agente"]
     
-    def generate_simulated_stats(self):
-        """Generar estadísticas simuladas para el agente"""
-        import random
-        
-        # Estadísticas base según el rol
-        role = self.get_agent_role()
-        tier = self.get_agent_tier()
-        
-        # Ajustar base según tier
-        tier_modifier = {
-            "S-Tier": 15,
-            "A-Tier": 10,
-            "B-Tier": 5,
-            "C-Tier": 0,
-            "No clasificado": 0
-        }
-        
-        base_modifier = tier_modifier.get(tier, 0)
-        
-        if role == "Duelista":
-            base_stats = {
-                "Win Rate": 50 + base_modifier,
-                "Pick Rate": 45 + base_modifier,
-                "First Blood Rate": 60 + base_modifier,
-                "Attack Win Rate": 55 + base_modifier,
-                "Defense Win Rate": 45 + base_modifier
-            }
-        elif role == "Iniciador":
-            base_stats = {
-                "Win Rate": 52 + base_modifier,
-                "Pick Rate": 40 + base_modifier,
-                "Assist Rate": 65 + base_modifier,
-                "Attack Win Rate": 50 + base_modifier,
-                "Defense Win Rate": 50 + base_modifier
-            }
-        elif role == "Controlador":
-            base_stats = {
-                "Win Rate": 51 + base_modifier,
-                "Pick Rate": 35 + base_modifier,
-                "Site Control Rate": 70 + base_modifier,
-                "Attack Win Rate": 48 + base_modifier,
-                "Defense Win Rate": 52 + base_modifier
-            }
-        elif role == "Centinela":
-            base_stats = {
-                "Win Rate": 53 + base_modifier,
-                "Pick Rate": 30 + base_modifier,
-                "Site Defense Rate": 75 + base_modifier,
-                "Attack Win Rate": 45 + base_modifier,
-                "Defense Win Rate": 60 + base_modifier
-            }
-        else:
-            base_stats = {
-                "Win Rate": 50,
-                "Pick Rate": 30,
-                "Effectiveness": 50,
-                "Attack Win Rate": 50,
-                "Defense Win Rate": 50
-            }
-        
-        # Añadir variación aleatoria
-        stats = {}
-        for stat, value in base_stats.items():
-            # Asegurar que el valor esté entre 1 y 99
-            random_value = max(1, min(99, value + random.randint(-5, 5)))
-            stats[stat] = random_value
-        
-        return stats
-    
-    def generate_simulated_rank_popularity(self):
-        """Generar popularidad simulada por rango"""
-        import random
-        
-        # Rangos de Valorant
-        ranks = ["Hierro", "Bronce", "Plata", "Oro", "Platino", "Diamante", "Ascendente", "Inmortal", "Radiante"]
-        
-        # Popularidad base según el tier
-        tier = self.get_agent_tier()
-        
-        if tier == "S-Tier":
-            base_values = [30, 40, 50, 60, 70, 75, 80, 85, 90]
-        elif tier == "A-Tier":
-            base_values = [40, 45, 50, 55, 60, 65, 70, 75, 80]
-        elif tier == "B-Tier":
-            base_values = [50, 55, 50, 45, 40, 45, 50, 55, 60]
-        elif tier == "C-Tier":
-            base_values = [60, 50, 40, 35, 30, 25, 20, 15, 10]
-        else:
-            base_values = [50, 50, 50, 50, 50, 50, 50, 50, 50]
-        
-        # Añadir variación aleatoria
-        popularity = {}
-        for i, rank in enumerate(ranks):
-            # Asegurar que el valor esté entre 1 y 99
-            random_value = max(1, min(99, base_values[i] + random.randint(-10, 10)))
-            popularity[rank] = random_value
-        
-        return popularity
-    
     def open_official_guides(self):
         """Abrir guías oficiales en el navegador"""
         agent_lower = self.agent_name.lower().replace("/", "")
@@ -1176,11 +1925,12 @@ class AgentInfoDialog(QDialog):
 
 class AgentBrowserDialog(QDialog):
     """Diálogo para explorar todos los agentes"""
-    def __init__(self, agents_data, agent_images, parent=None):
+    def __init__(self, agents_data, agent_images, parent=None, catalog=None):
         super().__init__(parent)
         self.agents_data = agents_data
         self.agent_images = agent_images
         self.parent_window = parent
+        self.catalog = catalog
         
         self.setWindowTitle("Explorador de Agentes")
         self.setMinimumSize(800, 600)
@@ -1226,27 +1976,21 @@ class AgentBrowserDialog(QDialog):
         title_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(title_label)
         
-        # Tabs para organizar por roles
-        tab_widget = QTabWidget()
-        layout.addWidget(tab_widget)
+        # Tabs para organizar por roles; cada una se construye al abrirla por primera vez
+        self.tab_widget = LazyTabWidget()
+        layout.addWidget(self.tab_widget)
         
         # Tab para todos los agentes
-        all_tab = QWidget()
-        self.create_agents_grid(all_tab, None)
-        tab_widget.addTab(all_tab, "Todos")
+        self.tab_widget.add_lazy_tab("Todos", partial(self.create_agents_grid, filter_role=None))
         
         # Tab para cada rol
         roles = ["Duelista", "Iniciador", "Controlador", "Centinela"]
         
         for role in roles:
-            role_tab = QWidget()
-            self.create_agents_grid(role_tab, role)
-            tab_widget.addTab(role_tab, role)
+            self.tab_widget.add_lazy_tab(role, partial(self.create_agents_grid, filter_role=role))
         
         # Tab para tier list
-        tier_tab = QWidget()
-        self.create_tier_list_tab(tier_tab)
-        tab_widget.addTab(tier_tab, "Tier List")
+        self.tab_widget.add_lazy_tab("Tier List", self.create_tier_list_tab)
         
         # Botón para cerrar
         close_button = HoverButton("Cerrar")
@@ -1257,19 +2001,6 @@ class AgentBrowserDialog(QDialog):
         """Crear grid de agentes filtrado por rol"""
         layout = QVBoxLayout(tab)
         
-        # Scroll area para agentes
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setFrameShape(QFrame.NoFrame)
-        scroll.setStyleSheet("background-color: transparent;")
-        
-        # Contenedor para agentes
-        container = QWidget()
-        container.setStyleSheet("background-color: transparent;")
-        grid = QGridLayout(container)
-        grid.setContentsMargins(10, 10, 10, 10)
-        grid.setSpacing(15)
-        
         # Filtrar agentes por rol
         agents = []
         for agent_name, agent_data in self.agents_data.items():
@@ -1277,121 +2008,24 @@ class AgentBrowserDialog(QDialog):
                 agents.append((agent_name, agent_data))
         
         # Ordenar agentes por tier y luego por nombre
-        tier_order = {"S-Tier": 0, "A-Tier": 1, "B-Tier": 2, "C-Tier": 3, "No clasificado": 4}
+        tier_order = {tier: rank for rank, tier in enumerate(TIER_ORDER)}
         
         def get_tier(agent_tuple):
-            return tier_order.get(agent_tuple[1].get("tier", "No clasificado"), 4)
+            if self.catalog is not None and agent_tuple[0] in self.catalog:
+                return self.catalog.tier_rank(agent_tuple[0])
+            return tier_order.get(agent_tuple[1].get("tier", "No clasificado"), len(TIER_ORDER))
         
         agents.sort(key=lambda x: (get_tier(x), x[0]))
         
-        # Añadir agentes al grid
-        row, col = 0, 0
-        max_cols = 4  # Número de columnas en el grid
-        
-        for agent_name, agent_data in agents:
-            # Crear card para el agente
-            agent_card = self.create_agent_card(agent_name, agent_data)
-            
-            grid.addWidget(agent_card, row, col)
-            
-            # Actualizar fila y columna
-            col += 1
-            if col >= max_cols:
-                col = 0
-                row += 1
-        
-        scroll.setWidget(container)
-        layout.addWidget(scroll)
-    
-    def create_agent_card(self, agent_name, agent_data):
-        """Crear tarjeta para un agente"""
-        card = QFrame()
-        card.setStyleSheet(f"""
-            QFrame {{
-                background-color: {VALORANT_LIGHT_BLUE};
-                border-radius: 8px;
-                padding: 10px;
-            }}
-            QFrame:hover {{
-                background-color: #2A3441;
-                border: 1px solid {VALORANT_RED};
-            }}
-        """)
-        card.setCursor(QCursor(Qt.PointingHandCursor))
-        
-        # Layout
-        layout = QVBoxLayout(card)
-        layout.setContentsMargins(10, 10, 10, 10)
-        layout.setSpacing(5)
-        
-        # Imagen del agente
-        image_label = QLabel()
-        image_label.setAlignment(Qt.AlignCenter)
-        
-        if agent_name in self.agent_images and self.agent_images[agent_name]:
-            pixmap = QPixmap.fromImage(self.agent_images[agent_name])
-            pixmap = pixmap.scaled(100, 100, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            image_label.setPixmap(pixmap)
-        else:
-            # Crear imagen de placeholder
-            self.create_placeholder_image(image_label, agent_name, agent_data)
-        
-        layout.addWidget(image_label)
-        
-        # Nombre del agente
-        name_label = QLabel(agent_name)
-        name_label.setStyleSheet("font-size: 14px; font-weight: bold; color: white;")
-        name_label.setAlignment(Qt.AlignCenter)
-        layout.addWidget(name_label)
-        
-        # Rol del agente
-        role = agent_data.get("role", "Desconocido")
-        role_color = ROLE_COLORS.get(role, VALORANT_WHITE)
-        
-        role_label = QLabel(role)
-        role_label.setStyleSheet(f"font-size: 12px; color: {role_color};")
-        role_label.setAlignment(Qt.AlignCenter)
-        layout.addWidget(role_label)
-        
-        # Tier del agente
-        tier = agent_data.get("tier", "No clasificado")
-        tier_color = TIER_COLORS.get(tier, VALORANT_WHITE)
-        
-        tier_label = QLabel(tier)
-        tier_label.setStyleSheet(f"font-size: 12px; color: {tier_color};")
-        tier_label.setAlignment(Qt.AlignCenter)
-        layout.addWidget(tier_label)
-        
-        # Botón de ver detalles
-        details_button = HoverButton("Ver Detalles", color="#1F2731")
-        details_button.clicked.connect(lambda: self.show_agent_details(agent_name))
-        layout.addWidget(details_button)
-        
-        return card
-    
-    def create_placeholder_image(self, label, agent_name, agent_data):
-        """Crear imagen de placeholder para el agente"""
-        role = agent_data.get("role", "Desconocido")
-        color = ROLE_COLORS.get(role, VALORANT_WHITE)
-        
-        # Crear imagen
-        image = QImage(100, 100, QImage.Format_ARGB32)
-        image.fill(QColor(VALORANT_BLUE))
-        
-        painter = QPainter(image)
-        painter.setPen(QColor(color))
-        painter.setBrush(QColor(color).darker(150))
-        painter.drawRoundedRect(5, 5, 90, 90, 10, 10)
-        
-        # Añadir texto
-        painter.setPen(QColor(VALORANT_WHITE))
-        font = QFont("Arial", 14, QFont.Bold)
-        painter.setFont(font)
-        painter.drawText(QRect(5, 5, 90, 90), Qt.AlignCenter, agent_name)
-        painter.end()
-        
-        # Establecer la imagen
-        label.setPixmap(QPixmap.fromImage(image))
+        # Cuadrícula virtualizada de tarjetas
+        model = AgentListModel(self.agents_data, self.agent_images, BROWSER_CARD_SIZE, tab)
+        model.set_agents(agent_name for agent_name, _ in agents)
+        delegate = AgentCardDelegate(BROWSER_CARD_SIZE.width(), show_role=True, button_text="Ver Detalles", parent=tab)
+        view = AgentGridView(model, delegate)
+        view.setSpacing(5)
+        view.agent_clicked.connect(self.show_agent_details)
+        view.info_clicked.connect(self.show_agent_details)
+        layout.addWidget(view)
     
     def create_tier_list_tab(self, tab):
         """Crear tab de tier list"""
@@ -1511,15 +2145,13 @@ class AgentBrowserDialog(QDialog):
         image_label = QLabel()
         image_label.setFixedSize(30, 30)
         
-        if agent_name in self.agent_images and self.agent_images[agent_name]:
-            pixmap = QPixmap.fromImage(self.agent_images[agent_name])
-            pixmap = pixmap.scaled(30, 30, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            image_label.setPixmap(pixmap)
-        else:
-            # Usar solo el texto para mini cards
-            image_label.setText(agent_name[0])
-            image_label.setStyleSheet(f"font-size: 14px; font-weight: bold; color: {VALORANT_WHITE}; background-color: {VALORANT_BLUE}; border-radius: 15px;")
-            image_label.setAlignment(Qt.AlignCenter)
+        # Inicial del agente hasta que el pool entregue la miniatura (si la hay)
+        image_label.setText(agent_name[0])
+        image_label.setStyleSheet(f"font-size: 14px; font-weight: bold; color: {VALORANT_WHITE}; background-color: {VALORANT_BLUE}; border-radius: 15px;")
+        image_label.setAlignment(Qt.AlignCenter)
+        if agent_name in self.agent_images:
+            self.agent_images.request(agent_name, partial(self.set_mini_card_image, image_label, agent_name),
+                                      MINI_CARD_SIZE)
         
         layout.addWidget(image_label)
         
@@ -1533,6 +2165,10 @@ class AgentBrowserDialog(QDialog):
         
         return card
     
+    def set_mini_card_image(self, image_label, agent_name, image):
+        image_label.setStyleSheet("")
+        image_label.setPixmap(pixmap_cache.scaled(agent_name, image, MINI_CARD_SIZE, self.devicePixelRatioF()))
+    
     def get_tier_description(self, tier):
         """Obtener descripción para cada tier"""
         descriptions = {
@@ -1546,101 +2182,183 @@ class AgentBrowserDialog(QDialog):
     
     def show_agent_details(self, agent_name):
         """Mostrar detalles del agente"""
+        # La ventana principal reutiliza los diálogos ya creados
+        if isinstance(self.parent_window, ValorantTeamCompAdvisor):
+            self.parent_window.show_agent_details(agent_name)
+            return
+        
         agent_data = self.agents_data.get(agent_name, {})
-        agent_image = self.agent_images.get(agent_name)
+        image_request = partial(self.agent_images.request, agent_name, size=AGENT_HEADER_SIZE)
         
-        dialog = AgentInfoDialog(agent_name, agent_data, agent_image, self)
+        dialog = AgentInfoDialog(agent_name, agent_data, image_request, self, catalog=self.catalog)
         dialog.exec_()
 
+# Columnas del historial: título y columna de ordenación en historial_valo (None = sin orden)
+HISTORY_TABLE_COLUMNS = [("Fecha", "timestamp"), ("Mapa", "map"), ("Agente", "agent"),
+                         ("Estilo", "style"), ("Composición", None)]
+
+class HistoryTableModel(QAbstractTableModel):
+    """Modelo del historial que lee las composiciones por páginas
+    
+    Solo se piden al historial las filas que la vista necesita (fetchMore);
+    el orden y los filtros se aplican en la consulta SQL, así que abrir el
+    diálogo cuesta lo mismo con diez composiciones que con cien mil.
+    """
+    def __init__(self, history, parent=None):
+        super().__init__(parent)
+        self.history = history
+        self.entries = []
+        self.exhausted = False
+        self.sort_column = 0
+        self.sort_key = "timestamp"
+        self.descending = True
+        self.filters = {}
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.entries)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HISTORY_TABLE_COLUMNS)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        
+        entry = self.entries[index.row()]
+        key = HISTORY_TABLE_COLUMNS[index.column()][1]
+        if key == "timestamp":
+            return time.strftime("%d/%m/%Y %H:%M", time.localtime(entry["timestamp"]))
+        if key is None:
+            return ", ".join(entry["composition"])
+        return entry[key]
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return HISTORY_TABLE_COLUMNS[section][0]
+        return None
+    
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self.exhausted
+    
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        
+        # Cada página sigue desde la última fila leída (keyset, sin OFFSET)
+        after = self.entries[-1] if self.entries else None
+        page = self.history.page(HISTORY_PAGE_SIZE, after, self.sort_key, self.descending, self.filters)
+        self.exhausted = len(page) < HISTORY_PAGE_SIZE
+        if page:
+            self.beginInsertRows(QModelIndex(), len(self.entries), len(self.entries) + len(page) - 1)
+            self.entries.extend(page)
+            self.endInsertRows()
+    
+    def sort(self, column, order=Qt.AscendingOrder):
+        key = HISTORY_TABLE_COLUMNS[column][1]
+        descending = order == Qt.DescendingOrder
+        if key is None or (key, descending) == (self.sort_key, self.descending):
+            return
+        self.sort_column = column
+        self.sort_key = key
+        self.descending = descending
+        self.reload()
+    
+    def sort_order(self):
+        return Qt.DescendingOrder if self.descending else Qt.AscendingOrder
+    
+    def set_filter(self, name, value):
+        """Filtrar por una columna del historial (None quita el filtro)"""
+        self.filters[name] = value
+        self.reload()
+    
+    def reload(self):
+        """Descartar las filas leídas y pedir de nuevo la primera página"""
+        self.beginResetModel()
+        self.entries = []
+        self.exhausted = False
+        self.endResetModel()
+        self.fetchMore()
+    
+    def entry(self, row):
+        return self.entries[row] if 0 <= row < len(self.entries) else None
+
 class ValorantTeamCompAdvisor(QMainWindow):
     def __init__(self):
         super().__init__()
         
-        # Configuración de la ventana principal
-        self.setWindowTitle("Valorant Team Comp Advisor Premium")
-        self.setMinimumSize(1200, 800)
-        self.setStyleSheet(f"""
-            QMainWindow {{
-                background-color: {VALORANT_BLUE};
-            }}
-            QLabel {{
-                color: {VALORANT_WHITE};
-            }}
-            QScrollArea {{
-                border: none;
-                background-color: transparent;
-            }}
-            QGroupBox {{
-                border: 1px solid #2A3441;
-                border-radius: 8px;
-                margin-top: 1ex;
-                font-weight: bold;
-                color: {VALORANT_WHITE};
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                subcontrol-position: top center;
-                padding: 0 5px;
-            }}
-            QComboBox {{
-                background-color: {VALORANT_LIGHT_BLUE};
-                color: {VALORANT_WHITE};
-                border: 1px solid #2A3441;
-                border-radius: 4px;
-                padding: 5px;
-            }}
-            QComboBox::drop-down {{
-                border: none;
-            }}
-            QComboBox QAbstractItemView {{
-                background-color: {VALORANT_LIGHT_BLUE};
-                color: {VALORANT_WHITE};
-                selection-background-color: #2A3441;
-            }}
-            QToolBar {{
-                background-color: {VALORANT_LIGHT_BLUE};
-                border: none;
-            }}
-            QToolButton {{
-                background-color: transparent;
-                border: none;
-                color: {VALORANT_WHITE};
-            }}
-            QToolButton:hover {{
-                background-color: #2A3441;
-            }}
-            QMenu {{
-                background-color: {VALORANT_LIGHT_BLUE};
-                color: {VALORANT_WHITE};
-                border: 1px solid #2A3441;
-            }}
-            QMenu::item {{
-                padding: 5px 20px 5px 20px;
-            }}
-            QMenu::item:selected {{
-                background-color: #2A3441;
-            }}
-            QStatusBar {{
-                background-color: {VALORANT_LIGHT_BLUE};
-                color: {VALORANT_WHITE};
-            }}
-        """)
+        # Configuración de la ventana principal
+        self.setWindowTitle("Valorant Team Comp Advisor Premium")
+        self.setMinimumSize(1200, 800)
+        
+        # Hoja de estilo común: los widgets solo cambian propiedades dinámicas
+        app = QApplication.instance()
+        if app.styleSheet() != APP_STYLESHEET:
+            app.setStyleSheet(APP_STYLESHEET)
         
         # Variables de estado
         self.selected_map = None
         self.selected_agent = None
         self.comp_style = "Balanceada"
-        self.agent_cards = {}
         self.map_cards = {}
-        self.composition_history = []
+        self.agent_filter = "Todos"
+        self.agent_browser = None
+        self.agent_info_dialogs = OrderedDict()
+        self.current_composition = None  # La que se muestra; la usan Guardar y Exportar
+        self.match_stats = MatchStats()
+        self.composition_history = CompositionHistory()
         self.size_factor = 1.0  # Factor de escala para elementos responsivos
         
+        # Reescalado agrupado: solo al cambiar de tramo y repartido en varias vueltas
+        self.pending_resize = []
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(RESIZE_DEBOUNCE_DELAY)
+        self.resize_timer.timeout.connect(self.update_element_sizes)
+        self.resize_batch_timer = QTimer(self)
+        self.resize_batch_timer.setInterval(0)
+        self.resize_batch_timer.timeout.connect(self.resize_next_batch)
+        
+        # Tareas de Python en un pool propio: el global lo usa Qt para escalar
+        # QImage y una tarea que espera al GIL allí puede bloquear la interfaz
+        self.worker_pool = QThreadPool(self)
+        
+        # Generación en segundo plano: solo cuenta la última petición
+        self.generation_id = 0
+        self.recommend_signals = RecommendSignals(self)
+        self.recommend_signals.finished.connect(self.on_composition_ready)
+        self.recommend_signals.failed.connect(self.on_composition_failed)
+        self.progress_timer = QTimer(self)
+        self.progress_timer.setSingleShot(True)
+        self.progress_timer.setInterval(PROGRESS_DELAY)
+        self.progress_timer.timeout.connect(self.show_generation_progress)
+        
+        # Refresco de las estadísticas de partidas, también en el pool
+        self.stats_refreshing = False
+        self.stats_signals = StatsSignals(self)
+        self.stats_signals.finished.connect(self.on_match_stats_ready)
+        self.stats_signals.failed.connect(self.on_match_stats_failed)
+        
+        # Recarga de la base de conocimiento, también en el pool
+        self.kb_reloading = False
+        self.kb_reload_pending = False
+        self.kb_signals = KnowledgeBaseSignals(self)
+        self.kb_signals.finished.connect(self.on_knowledge_base_ready)
+        self.kb_signals.failed.connect(self.on_knowledge_base_failed)
+        
         # Cargar datos
         self.load_data()
         
         # Crear la interfaz
         self.create_ui()
         
+        # Recargar la base de conocimiento cuando cambien los archivos .pl
+        self.setup_kb_watcher()
+        
+        # Completar en segundo plano la caché de miniaturas en disco
+        self.agent_images.prerender(AGENT_PRERENDER_SIZES)
+        self.map_images.prerender(MAP_PRERENDER_SIZES)
+        self.check_image_atlas()
+        
         # Mostrar mensaje de bienvenida
         self.show_welcome_message()
         
@@ -1649,289 +2367,163 @@ class ValorantTeamCompAdvisor(QMainWindow):
     
     def load_data(self):
         """Cargar datos de agentes, mapas y composiciones"""
-        # Agents by role data
-        self.agents_by_role = {
-            "Duelista": ["Jett", "Raze", "Phoenix", "Reyna", "Neon", "Yoru", "Iso"],
-            "Iniciador": ["Sova", "Breach", "Skye", "KAY/O", "Fade", "Gekko", "Tejo", "Waylay"],
-            "Controlador": ["Brimstone", "Viper", "Omen", "Astra", "Harbor", "Clove"],
-            "Centinela": ["Killjoy", "Cypher", "Sage", "Chamber", "Deadlock", "Vyse"]
-        }
-        
-        # Maps data
-        self.maps = [
-            "Ascent", "Bind", "Breeze", "Fracture", "Haven", 
-            "Icebox", "Lotus", "Pearl", "Split", "Sunset"
-        ]
-        
-        # Map-specific optimal comps
-        self.map_comps = {
-            "Ascent": {
-                "pro": ["Jett", "Omen", "Sova", "KAY/O", "Killjoy"],
-                "ranked": ["Jett", "Omen", "Sova", "KAY/O", "Killjoy"],
-                "alt": ["Jett", "Omen", "Skye", "Reyna", "Killjoy"],
-                "aggressive": ["Jett", "Reyna", "Raze", "Skye", "Omen"],
-                "defensive": ["Cypher", "Killjoy", "Sage", "Sova", "Omen"],
-                "description": "Equilibra poder de entrada, control de mapa e información. Jett aporta entrada rápida y uso del Operator, Omen controla ángulos con sus humos, los iniciadores brindan reconocimiento, y Killjoy asegura la defensa de sitios."
-            },
-            "Bind": {
-                "pro": ["Raze", "Skye", "Brimstone", "Viper", "Cypher"],
-                "ranked": ["Raze", "Skye", "Brimstone", "Viper", "Killjoy"],
-                "alt": ["Phoenix", "Fade", "Brimstone", "Viper", "Cypher"],
-                "aggressive": ["Raze", "Phoenix", "Skye", "Breach", "Brimstone"],
-                "defensive": ["Cypher", "Killjoy", "Viper", "Brimstone", "Sova"],
-                "description": "Mapa con teletransportadores que requiere control de flancos. Raze es excelente para limpiar espacios cerrados, Brimstone y Viper controlan sitios con humos, mientras Cypher vigila los flancos y teletransportadores."
-            },
-            "Breeze": {
-                "pro": ["Jett", "Sova", "Viper", "Chamber", "Skye"],
-                "ranked": ["Jett", "Sova", "Viper", "Killjoy", "Skye"],
-                "alt": ["Jett", "Sova", "Viper", "Cypher", "KAY/O"],
-                "aggressive": ["Jett", "Reyna", "Skye", "Sova", "Viper"],
-                "defensive": ["Chamber", "Viper", "Cypher", "Sova", "Omen"],
-                "description": "Mapa amplio con largas líneas de visión. Viper es esencial para dividir espacios abiertos, Jett y Chamber aprovechan las líneas largas con Operator, mientras Sova y Skye proporcionan información crucial."
-            },
-            "Fracture": {
-                "pro": ["Raze", "Breach", "Brimstone", "Fade", "Chamber"],
-                "ranked": ["Raze", "Breach", "Brimstone", "Fade", "Killjoy"],
-                "alt": ["Neon", "Breach", "Brimstone", "Fade", "Cypher"],
-                "aggressive": ["Raze", "Neon", "Breach", "Fade", "Brimstone"],
-                "defensive": ["Chamber", "Cypher", "Breach", "Fade", "Brimstone"],
-                "description": "Composición con alto poder de iniciadores y utilidades de control. Raze aprovecha los ángulos cerrados, Breach y Fade proporcionan un combo de aturdimiento y revelado, Brimstone coloca humos rápidos, mientras el centinela controla flancos."
-            },
-            "Haven": {
-                "pro": ["Jett", "Sova", "Omen", "Cypher", "Breach"],
-                "ranked": ["Jett", "Sova", "Omen", "Killjoy", "Breach"],
-                "alt": ["Jett", "Sova", "Omen", "Killjoy", "KAY/O"],
-                "aggressive": ["Jett", "Reyna", "Breach", "Skye", "Omen"],
-                "defensive": ["Cypher", "Killjoy", "Sova", "Sage", "Omen"],
-                "description": "Al tener tres sitios, exige una composición versátil. Jett es imprescindible para aprovechar las largas líneas de visión, Omen cubre múltiples ángulos, la combinación de Sova y Breach provee información constante, mientras el centinela ofrece control de flancos."
-            },
-            "Icebox": {
-                "pro": ["Jett", "Sova", "Viper", "Sage", "Killjoy"],
-                "ranked": ["Jett", "Sova", "Viper", "Sage", "Killjoy"],
-                "alt": ["Reyna", "Sova", "Viper", "Sage", "Chamber"],
-                "aggressive": ["Jett", "Reyna", "Sova", "Viper", "Sage"],
-                "defensive": ["Killjoy", "Sage", "Viper", "Sova", "Chamber"],
-                "description": "Viper es imprescindible, dividiendo sitios con su Pantalla Tóxica. Sage proporciona muro para plantar (especialmente en B) y orbes lentos. Sova despejar espacios largos. Jett puede tomar ángulos elevados. Killjoy vigila flancos en este mapa de amplias rotaciones."
-            },
-            "Lotus": {
-                "pro": ["Raze", "Fade", "Omen", "Viper", "Killjoy"],
-                "ranked": ["Raze", "Fade", "Omen", "Viper", "Killjoy"],
-                "alt": ["Jett", "Skye", "Omen", "Viper", "Killjoy"],
-                "aggressive": ["Raze", "Jett", "Fade", "Skye", "Omen"],
-                "defensive": ["Killjoy", "Cypher", "Viper", "Omen", "Fade"],
-                "description": "La dupla de controladores Omen + Viper es clave. Raze limpia esquinas estrechas y zonas de las puertas. Fade explora los amplios espacios y conectores del mapa. Killjoy vigila rotaciones a través de las puertas y su definitiva cubre áreas extensas."
-            },
-            "Pearl": {
-                "pro": ["Jett", "Fade", "Astra", "Chamber", "Sage"],
-                "ranked": ["Jett", "Fade", "Astra", "Killjoy", "Sage"],
-                "alt": ["Neon", "KAY/O", "Astra", "Killjoy", "Sage"],
-                "aggressive": ["Jett", "Neon", "Fade", "Skye", "Astra"],
-                "defensive": ["Chamber", "Killjoy", "Sage", "Astra", "Fade"],
-                "description": "Astra con sus humos globales puede tapar ángulos largos. Fade revela enemigos en rincones. Chamber vigila flancos y su definitiva es letal en largas distancias. Jett infiltra y toma duelos de larga distancia. Sage controla Mid Connector o bloquea A Main."
-            },
-            "Split": {
-                "pro": ["Raze", "Skye", "Omen", "Cypher", "Sage"],
-                "ranked": ["Raze", "Skye", "Omen", "Killjoy", "Sage"],
-                "alt": ["Jett", "Raze", "Omen", "Skye", "Sage"],
-                "aggressive": ["Raze", "Jett", "Breach", "Skye", "Omen"],
-                "defensive": ["Cypher", "Killjoy", "Sage", "Omen", "Skye"],
-                "description": "Raze aprovecha sus Blast Packs y granadas en entradas cortas. Skye usa destellos y trailblazer para limpiar esquinas. Omen bloquea visibilidad en puntos clave. Cypher coloca trampas en flancos. Sage levanta muros que bloquean rutas cruciales y ralentiza pushes."
-            },
-            "Sunset": {
-                "pro": ["Raze", "Skye", "Omen", "Deadlock", "Killjoy"],
-                "ranked": ["Raze", "Skye", "Omen", "Deadlock", "Killjoy"],
-                "alt": ["Phoenix", "Fade", "Brimstone", "Deadlock", "Killjoy"],
-                "aggressive": ["Raze", "Phoenix", "Skye", "Omen", "Deadlock"],
-                "defensive": ["Deadlock", "Killjoy", "Cypher", "Omen", "Skye"],
-                "description": "Mapa con múltiples niveles y ángulos verticales. Raze y Phoenix son excelentes para limpiar espacios cerrados, Deadlock controla áreas clave, mientras Killjoy asegura el control de sitios con su utilidad."
-            }
-        }
-        
-        # Tier list data
-        self.tier_list = {
-            "S-Tier": ["Tejo", "Clove", "Raze", "Vyse"],
-            "A-Tier": ["Yoru", "Deadlock", "Cypher", "Jett", "Iso", "Neon", "Sova", "Gekko", 
-                      "Killjoy", "Omen", "Brimstone", "Phoenix", "Sage"],
-            "B-Tier": ["Chamber", "Viper", "Breach", "Skye", "Fade", "Astra", "Reyna"],
-            "C-Tier": ["Waylay", "KAY/O", "Harbor"]
-        }
-        
-        # Agent roles mapping
-        self.agent_roles = {}
-        for role, agents in self.agents_by_role.items():
-            for agent in agents:
-                self.agent_roles[agent] = role
-        
-        # Get all agents for selection
-        self.all_agents = []
-        for role_agents in self.agents_by_role.values():
-            self.all_agents.extend(role_agents)
-        self.all_agents.sort()
-        
-        # Agent abilities and descriptions
-        self.agent_details = {}
-        
-        # Crear datos detallados para cada agente
-        for agent in self.all_agents:
-            # Obtener rol
-            role = self.agent_roles.get(agent, "Desconocido")
-            
-            # Obtener tier
-            tier = "No clasificado"
-            for t, agents in self.tier_list.items():
-                if agent in agents:
-                    tier = t
-            
-            # Crear datos básicos
-            self.agent_details[agent] = {
-                "role": role,
-                "tier": tier,
-                "abilities": self.generate_abilities(agent, role),
-                "description": self.generate_description(agent, role)
-            }
-        
-        # Añadir datos específicos para algunos agentes
-        if "Jett" in self.agent_details:
-            self.agent_details["Jett"].update({
-                "real_name": "Sunwoo Han",
-                "origin": "Corea del Sur",
-                "playstyle": "Agresivo, entrada rápida, operador",
-                "description": "Agente ágil con gran movilidad, perfecta para entradas rápidas y uso del Operator."
-            })
-        
-        if "Raze" in self.agent_details:
-            self.agent_details["Raze"].update({
-                "real_name": "Tayane Alves",
-                "origin": "Brasil",
-                "playstyle": "Agresivo, daño por área, vertical",
-                "description": "Especialista en daño explosivo, excelente para limpiar espacios cerrados y movimiento vertical."
-            })
-        
-        if "Sova" in self.agent_details:
-            self.agent_details["Sova"].update({
-                "real_name": "Sasha Novikov",
-                "origin": "Rusia",
-                "playstyle": "Reconocimiento, información, apoyo",
-                "description": "Maestro del reconocimiento, proporciona información crucial para el equipo con sus flechas y drone."
-            })
-        
-        # Map callouts and strategies
-        self.map_details = {
-            "Ascent": {
-                "location": "Italia",
-                "callouts": ["A Main", "A Lobby", "Catwalk", "Heaven", "Hell", "Mid", "Market", "B Main"],
-                "attack_strategies": [
-                    "Tomar control de Mid para dividir defensas",
-                    "Ejecutar rápido en A con humos en Heaven y Hell",
-                    "Fake A, rotación a B a través de Market"
-                ],
-                "defense_strategies": [
-                    "Mantener control de Mid con operador",
-                    "Utilidad de Killjoy en B para retrasar pushes",
-                    "Jugar retake en A con utilidad guardada"
-                ]
-            },
-            # Añadir más mapas según sea necesario
-        }
+        # El motor sin interfaz es la única fuente de datos y recomendaciones
+        self.engine = CompositionEngine()
+        self.bind_engine_tables()
         
         # Cargar imágenes
         self.load_images()
     
-    def generate_abilities(self, agent, role):
-        """Generar habilidades simuladas para un agente"""
-        # Habilidades conocidas para algunos agentes
-        known_abilities = {
-            "Jett": ["Tailwind", "Cloudburst", "Updraft", "Blade Storm"],
-            "Raze": ["Blast Pack", "Paint Shells", "Boom Bot", "Showstopper"],
-            "Sova": ["Shock Bolt", "Recon Bolt", "Owl Drone", "Hunter's Fury"],
-            "Omen": ["Paranoia", "Dark Cover", "Shrouded Step", "From the Shadows"],
-            "Killjoy": ["Alarmbot", "Turret", "Nanoswarm", "Lockdown"],
-            "Viper": ["Poison Cloud", "Toxic Screen", "Snake Bite", "Viper's Pit"],
-            "Cypher": ["Cyber Cage", "Spycam", "Trapwire", "Neural Theft"],
-            "Sage": ["Slow Orb", "Healing Orb", "Barrier Orb", "Resurrection"],
-            "Phoenix": ["Curveball", "Hot Hands", "Blaze", "Run it Back"],
-            "Breach": ["Flashpoint", "Fault Line", "Aftershock", "Rolling Thunder"]
-        }
-        
-        if agent in known_abilities:
-            return known_abilities[agent]
-        
-        # Generar habilidades genéricas basadas en el rol
-        if role == "Duelista":
-            return ["Flash", "Movilidad", "Daño", "Ultimate (Daño/Movilidad)"]
-        elif role == "Iniciador":
-            return ["Reconocimiento", "Flash/Cegadora", "Daño/Debilitación", "Ultimate (Información/Daño)"]
-        elif role == "Controlador":
-            return ["Humo 1", "Humo 2", "Utilidad de Control", "Ultimate (Control de Área)"]
-        elif role == "Centinela":
-            return ["Trampa 1", "Trampa 2", "Utilidad Defensiva", "Ultimate (Información/Defensa)"]
-        else:
-            return ["Habilidad 1", "Habilidad 2", "Habilidad 3", "Ultimate"]
-    
-    def generate_description(self, agent, role):
-        """Generar descripción simulada para un agente"""
-        if role == "Duelista":
-            return f"{agent} es un duelista diseñado para crear espacio y tomar duelos agresivos. Sus habilidades le permiten entrar rápidamente a los sitios y crear ventajas para su equipo."
-        elif role == "Iniciador":
-            return f"{agent} es un iniciador especializado en recopilar información y preparar entradas. Sus habilidades revelan posiciones enemigas y facilitan el trabajo de los duelistas."
-        elif role == "Controlador":
-            return f"{agent} es un controlador que domina el campo de batalla con humos y habilidades de control de área. Puede bloquear líneas de visión y dividir sitios estratégicamente."
-        elif role == "Centinela":
-            return f"{agent} es un centinela enfocado en defender sitios y vigilar flancos. Sus trampas y utilidad defensiva son cruciales para mantener el control del mapa."
-        else:
-            return f"Información no disponible para {agent}."
+    def bind_engine_tables(self):
+        """Enlazar las tablas del motor (de nuevo tras cada recarga)"""
+        self.agents_by_role = self.engine.agents_by_role
+        self.maps = self.engine.maps
+        self.map_comps = self.engine.map_comps
+        self.tier_list = self.engine.tier_list
+        self.agent_roles = self.engine.agent_roles
+        self.all_agents = self.engine.all_agents
+        self.agent_details = self.engine.agent_details
+        self.map_details = self.engine.map_details
+        self.catalog = self.engine.catalog
     
     def load_images(self):
-        """Cargar imágenes de agentes y mapas"""
-        self.agent_images = {}
-        self.map_images = {}
+        """Registrar las imágenes de agentes y mapas (se decodifican al primer uso)"""
+        images_dir = "imagenes"
+        # Las miniaturas de las tarjetas salen del atlas (una lectura y una decodificación)
+        self.image_atlas = ImageAtlas.load(os.path.join(images_dir, ATLAS_FILE))
+        self.agent_images = ImageStore(images_dir, {agent: self.catalog.image_key(agent) for agent in self.all_agents},
+                                       atlas=self.image_atlas)
+        self.map_images = ImageStore(images_dir, {map_name: map_name.lower() for map_name in self.maps},
+                                     atlas=self.image_atlas)
         
         try:
-            images_dir = "imagenes"
-            
             # Verificar si existe el directorio de imágenes
             if not os.path.exists(images_dir):
                 os.makedirs(images_dir)
                 print(f"Directorio de imágenes creado: {images_dir}")
-            
-            # Cargar imágenes de agentes
-            for agent in self.all_agents:
-                agent_lower = agent.lower().replace("/", "")  # Manejar KAY/O
-                
-                try:
-                    img_path = os.path.join(images_dir, f"{agent_lower}.png")
-                    if os.path.exists(img_path):
-                        image = QImage(img_path)
-                        self.agent_images[agent] = image
-                    else:
-                        # Crear imagen de placeholder
-                        self.agent_images[agent] = None
-                except Exception as e:
-                    print(f"Error cargando imagen para {agent}: {e}")
-                    self.agent_images[agent] = None
-            
-            # Cargar imágenes de mapas
-            for map_name in self.maps:
-                map_lower = map_name.lower()
-                
-                try:
-                    img_path = os.path.join(images_dir, f"{map_lower}.png")
-                    if os.path.exists(img_path):
-                        image = QImage(img_path)
-                        self.map_images[map_name] = image
-                    else:
-                        # Crear imagen de placeholder
-                        self.map_images[map_name] = None
-                except Exception as e:
-                    print(f"Error cargando imagen para el mapa {map_name}: {e}")
-                    self.map_images[map_name] = None
-                    
+        
         except Exception as e:
             print(f"Error cargando imágenes: {e}")
             QMessageBox.warning(self, "Error de Imágenes", 
                               "No se pudieron cargar algunas imágenes. " +
                               "Asegúrate de tener la carpeta 'imagenes' en el mismo directorio que el programa.")
     
+    def check_image_atlas(self):
+        """Regenerar en segundo plano el atlas si falta o sus originales cambiaron"""
+        entries = (self.agent_images.atlas_entries(AGENT_THUMBNAIL_SIZE) +
+                   self.map_images.atlas_entries(MAP_THUMBNAIL_SIZE))
+        stamp = self.image_atlas.stamp if self.image_atlas else None
+        task = AtlasTask(self.agent_images.images_dir, entries,
+                         os.path.join(self.agent_images.images_dir, ATLAS_FILE), stamp)
+        # En el pool de las imágenes: el global lo usa Qt para escalar QImage
+        self.agent_images.pool.start(task, PRERENDER_PRIORITY)
+    
+    def setup_kb_watcher(self):
+        """Vigilar los archivos de la base de conocimiento para recargarlos en caliente"""
+        self.kb_watcher = QFileSystemWatcher(self)
+        self.kb_watcher.fileChanged.connect(self.on_kb_file_changed)
+        self.watch_kb_files()
+        
+        # Los editores guardan en varias escrituras: agruparlas en una sola recarga
+        self.kb_reload_timer = QTimer(self)
+        self.kb_reload_timer.setSingleShot(True)
+        self.kb_reload_timer.setInterval(KB_RELOAD_DELAY)
+        self.kb_reload_timer.timeout.connect(self.reload_knowledge_base)
+    
+    def watch_kb_files(self):
+        """Añadir al vigilante los archivos que existan y no se estén vigilando"""
+        watched = set(self.kb_watcher.files())
+        for path in self.engine.kb_paths:
+            if path not in watched and os.path.exists(path):
+                self.kb_watcher.addPath(path)
+    
+    def on_kb_file_changed(self, path):
+        """Programar la recarga tras un cambio en un archivo .pl"""
+        # Un guardado por reemplazo hace que el vigilante deje de seguir el archivo
+        self.watch_kb_files()
+        self.kb_reload_timer.start()
+    
+    def reload_knowledge_base(self):
+        """Recargar la base de conocimiento sin bloquear la interfaz"""
+        self.watch_kb_files()
+        
+        # Un cambio durante la recarga se lee cuando esta termine
+        if self.kb_reloading:
+            self.kb_reload_pending = True
+            return
+        self.kb_reloading = True
+        self.worker_pool.start(KnowledgeBaseReloadTask(self.kb_signals, self.engine))
+    
+    def finish_knowledge_base_reload(self):
+        """Marcar la recarga como terminada y lanzar la pendiente, si la hay"""
+        self.kb_reloading = False
+        if self.kb_reload_pending:
+            self.kb_reload_pending = False
+            self.reload_knowledge_base()
+    
+    def on_knowledge_base_failed(self, message):
+        """Archivo a medio editar: mantener los datos actuales"""
+        self.statusBar().showMessage(f"No se pudo recargar la base de conocimiento: {message}")
+        self.finish_knowledge_base_reload()
+    
+    def on_knowledge_base_ready(self, fresh, changes):
+        """Aplicar los datos recargados y refrescar solo lo que cambió"""
+        changes = self.engine.apply_reload(fresh, changes)
+        self.finish_knowledge_base_reload()
+        
+        if not changes["tables"]:
+            return
+        
+        self.bind_engine_tables()
+        self.refresh_map_cards()
+        self.refresh_agent_cards(changes["agents"])
+        
+        # El explorador y los diálogos muestran los datos anteriores: se vuelven a crear al abrirlos
+        if self.agent_browser is not None:
+            self.agent_browser.deleteLater()
+            self.agent_browser = None
+        self.discard_agent_info_dialogs()
+        
+        self.statusBar().showMessage(f"Base de conocimiento recargada ({', '.join(changes['tables'])})")
+    
+    def refresh_map_cards(self):
+        """Rehacer la cuadrícula de mapas solo si cambió la lista de mapas"""
+        if list(self.map_cards) == self.maps:
+            return
+        
+        for map_name in self.maps:
+            if map_name not in self.map_images:
+                self.map_images.add(map_name, map_name.lower())
+        
+        if self.selected_map not in self.maps:
+            self.selected_map = None
+            self.selected_map_label.setText("Mapa seleccionado: Ninguno")
+        
+        self.populate_maps()
+        if self.selected_map:
+            self.map_cards[self.selected_map].set_selected(True)
+    
+    def refresh_agent_cards(self, changed_agents):
+        """Actualizar las tarjetas de los agentes cuyos datos cambiaron"""
+        for agent in self.all_agents:
+            if agent not in self.agent_images:
+                self.agent_images.add(agent, self.catalog.image_key(agent))
+        
+        if self.selected_agent not in self.agent_roles:
+            self.selected_agent = None
+            self.selected_agent_label.setText("Agente seleccionado: Ninguno")
+        
+        if self.agent_filter != "Todos" and self.agent_filter not in self.agents_by_role:
+            self.agent_filter = "Todos"
+        
+        self.agent_model.agents_data = self.agent_details
+        self.agent_model.set_selected(self.selected_agent)
+        self.agent_model.refresh_agents(changed_agents)
+        
+        # Agentes nuevos, eliminados o un cambio de tier alteran el orden de la cuadrícula
+        if self.get_agents_to_show(self.agent_filter) != self.agent_model.agents:
+            self.populate_agents(self.agent_filter)
+    
     def create_ui(self):
         """Crear la interfaz de usuario"""
         # Widget central
@@ -1973,10 +2565,7 @@ class ValorantTeamCompAdvisor(QMainWindow):
         # Botón de generar
         generate_button = HoverButton("OBTENER COMPOSICIÓN")
         generate_button.setMinimumHeight(50)
-        generate_button.setStyleSheet(f"""
-            font-size: 14px;
-            font-weight: bold;
-        """)
+        generate_button.setProperty("large", True)
         generate_button.clicked.connect(self.generate_composition)
         buttons_layout.addWidget(generate_button)
         
@@ -2003,7 +2592,7 @@ class ValorantTeamCompAdvisor(QMainWindow):
         
         # Cabecera de resultados
         results_header = QLabel("COMPOSICIÓN RECOMENDADA")
-        results_header.setStyleSheet(f"font-size: 18px; font-weight: bold; color: {VALORANT_RED};")
+        results_header.setProperty("textStyle", "sectionTitle")
         results_header.setAlignment(Qt.AlignCenter)
         results_layout.addWidget(results_header)
         
@@ -2019,6 +2608,18 @@ class ValorantTeamCompAdvisor(QMainWindow):
         self.results_content_layout.setContentsMargins(10, 10, 10, 10)
         self.results_content_layout.setSpacing(15)
         
+        # Páginas del panel, creadas una vez y alternadas con setVisible
+        self.welcome_page = self.create_welcome_page()
+        self.progress_page = self.create_progress_page()
+        self.composition_view = CompositionView(self.agent_images, self.map_images)
+        self.composition_view.info_clicked.connect(self.show_agent_details)
+        self.composition_view.save_clicked.connect(self.save_composition)
+        self.composition_view.export_clicked.connect(self.export_composition)
+        self.composition_view.details_clicked.connect(self.show_agent_browser)
+        for page in (self.welcome_page, self.progress_page, self.composition_view):
+            page.hide()
+            self.results_content_layout.addWidget(page)
+        
         self.results_scroll.setWidget(self.results_content)
         results_layout.addWidget(self.results_scroll)
         
@@ -2032,7 +2633,10 @@ class ValorantTeamCompAdvisor(QMainWindow):
         self.create_footer(main_layout)
         
         # Crear barra de estado
-        self.statusBar().showMessage("Listo para generar composiciones")
+        if self.composition_history.error is not None:
+            self.statusBar().showMessage(f"El historial no se guardará en disco: {self.composition_history.error}")
+        else:
+            self.statusBar().showMessage("Listo para generar composiciones")
     
     def create_toolbar(self):
         """Crear barra de herramientas"""
@@ -2082,17 +2686,17 @@ class ValorantTeamCompAdvisor(QMainWindow):
     def create_header(self, layout):
         """Crear cabecera de la aplicación"""
         header_frame = QFrame()
-        header_frame.setStyleSheet(f"background-color: {VALORANT_BLUE};")
+        header_frame.setObjectName("appBar")
         header_layout = QHBoxLayout(header_frame)
         
         # Logo y título
         title_label = QLabel("VALORANT TEAM COMP ADVISOR PREMIUM")
-        title_label.setStyleSheet(f"font-size: 24px; font-weight: bold; color: {VALORANT_RED};")
+        title_label.setProperty("textStyle", "appTitle")
         header_layout.addWidget(title_label)
         
         # Versión
         version_label = QLabel("v3.0")
-        version_label.setStyleSheet(f"font-size: 12px; color: {VALORANT_ACCENT};")
+        version_label.setProperty("textStyle", "version")
         version_label.setAlignment(Qt.AlignBottom)
         header_layout.addWidget(version_label)
         
@@ -2105,48 +2709,31 @@ class ValorantTeamCompAdvisor(QMainWindow):
     def create_map_selection(self, layout):
         """Crear sección de selección de mapa"""
         map_group = QGroupBox("SELECCIÓN DE MAPA")
-        map_group.setStyleSheet(f"""
-            QGroupBox {{
-                background-color: {VALORANT_LIGHT_BLUE};
-                padding: 15px;
-            }}
-        """)
+        map_group.setObjectName("selectionGroup")
         map_layout = QVBoxLayout(map_group)
         
         # Scroll area para mapas
         map_scroll = QScrollArea()
         map_scroll.setWidgetResizable(True)
         map_scroll.setFrameShape(QFrame.NoFrame)
-        map_scroll.setStyleSheet("background-color: transparent;")
+        map_scroll.setObjectName("plainFrame")
         
         # Contenedor de mapas
         map_container = QWidget()
-        map_container.setStyleSheet("background-color: transparent;")
-        map_grid = QGridLayout(map_container)
-        map_grid.setContentsMargins(5, 5, 5, 5)
-        map_grid.setSpacing(10)
+        map_container.setObjectName("plainFrame")
+        self.map_grid = QGridLayout(map_container)
+        self.map_grid.setContentsMargins(5, 5, 5, 5)
+        self.map_grid.setSpacing(10)
         
         # Añadir mapas al grid
-        row, col = 0, 0
-        for map_name in self.maps:
-            map_card = MapCard(map_name, self.map_images.get(map_name), size_factor=self.size_factor)
-            map_card.clicked.connect(self.on_map_selected)
-            self.map_cards[map_name] = map_card
-            
-            map_grid.addWidget(map_card, row, col)
-            
-            # Actualizar fila y columna
-            col += 1
-            if col > 1:  # 2 columnas
-                col = 0
-                row += 1
+        self.populate_maps()
         
         map_scroll.setWidget(map_container)
         map_layout.addWidget(map_scroll)
         
         # Etiqueta de mapa seleccionado
         self.selected_map_label = QLabel("Mapa seleccionado: Ninguno")
-        self.selected_map_label.setStyleSheet("font-weight: bold; padding: 5px;")
+        self.selected_map_label.setProperty("textStyle", "selection")
         self.selected_map_label.setAlignment(Qt.AlignCenter)
         map_layout.addWidget(self.selected_map_label)
         
@@ -2156,17 +2743,12 @@ class ValorantTeamCompAdvisor(QMainWindow):
     def create_agent_selection(self, layout):
         """Crear sección de selección de agente"""
         agent_group = QGroupBox("SELECCIÓN DE AGENTE")
-        agent_group.setStyleSheet(f"""
-            QGroupBox {{
-                background-color: {VALORANT_LIGHT_BLUE};
-                padding: 15px;
-            }}
-        """)
+        agent_group.setObjectName("selectionGroup")
         agent_layout = QVBoxLayout(agent_group)
         
         # Filtros de rol
         role_frame = QFrame()
-        role_frame.setStyleSheet("background-color: transparent;")
+        role_frame.setObjectName("plainFrame")
         role_layout = QHBoxLayout(role_frame)
         role_layout.setContentsMargins(0, 0, 0, 10)
         
@@ -2181,28 +2763,22 @@ class ValorantTeamCompAdvisor(QMainWindow):
         
         agent_layout.addWidget(role_frame)
         
-        # Scroll area para agentes
-        agent_scroll = QScrollArea()
-        agent_scroll.setWidgetResizable(True)
-        agent_scroll.setFrameShape(QFrame.NoFrame)
-        agent_scroll.setStyleSheet("background-color: transparent;")
-        
-        # Contenedor de agentes
-        self.agent_container = QWidget()
-        self.agent_container.setStyleSheet("background-color: transparent;")
-        self.agent_grid = QGridLayout(self.agent_container)
-        self.agent_grid.setContentsMargins(5, 5, 5, 5)
-        self.agent_grid.setSpacing(10)
+        # Cuadrícula virtualizada: el delegado pinta solo las tarjetas visibles
+        self.agent_model = AgentListModel(self.agent_details, self.agent_images, AGENT_THUMBNAIL_SIZE, self)
+        self.agent_delegate = AgentCardDelegate(parent=self)
+        self.agent_delegate.set_size_factor(self.size_factor)
+        self.agent_view = AgentGridView(self.agent_model, self.agent_delegate)
+        self.agent_view.agent_clicked.connect(self.on_agent_selected)
+        self.agent_view.info_clicked.connect(self.show_agent_details)
         
         # Poblar agentes
         self.populate_agents()
         
-        agent_scroll.setWidget(self.agent_container)
-        agent_layout.addWidget(agent_scroll)
+        agent_layout.addWidget(self.agent_view)
         
         # Etiqueta de agente seleccionado
         self.selected_agent_label = QLabel("Agente seleccionado: Ninguno")
-        self.selected_agent_label.setStyleSheet("font-weight: bold; padding: 5px;")
+        self.selected_agent_label.setProperty("textStyle", "selection")
         self.selected_agent_label.setAlignment(Qt.AlignCenter)
         agent_layout.addWidget(self.selected_agent_label)
         
@@ -2212,22 +2788,17 @@ class ValorantTeamCompAdvisor(QMainWindow):
     def create_comp_preferences(self, layout):
         """Crear sección de preferencias de composición"""
         pref_group = QGroupBox("PREFERENCIAS")
-        pref_group.setStyleSheet(f"""
-            QGroupBox {{
-                background-color: {VALORANT_LIGHT_BLUE};
-                padding: 15px;
-            }}
-        """)
+        pref_group.setObjectName("selectionGroup")
         pref_layout = QVBoxLayout(pref_group)
         
         # Estilo de juego
         style_frame = QFrame()
-        style_frame.setStyleSheet("background-color: transparent;")
+        style_frame.setObjectName("plainFrame")
         style_layout = QHBoxLayout(style_frame)
         style_layout.setContentsMargins(0, 0, 0, 0)
         
         style_label = QLabel("Estilo de juego:")
-        style_label.setStyleSheet("font-weight: bold;")
+        style_label.setProperty("textStyle", "label")
         style_layout.addWidget(style_label)
         
         # Grupo de botones de radio
@@ -2249,12 +2820,12 @@ class ValorantTeamCompAdvisor(QMainWindow):
     def create_footer(self, layout):
         """Crear pie de página"""
         footer_frame = QFrame()
-        footer_frame.setStyleSheet(f"background-color: {VALORANT_BLUE};")
+        footer_frame.setObjectName("appBar")
         footer_layout = QHBoxLayout(footer_frame)
         
         # Texto de actualización
         update_label = QLabel("Desarrollado con datos de meta actualizados a mayo 2025")
-        update_label.setStyleSheet(f"font-size: 10px; color: {VALORANT_ACCENT};")
+        update_label.setProperty("textStyle", "footnote")
         footer_layout.addWidget(update_label)
         
         # Añadir espaciador para alinear a la derecha
@@ -2262,7 +2833,7 @@ class ValorantTeamCompAdvisor(QMainWindow):
         
         # Enlace a la web oficial
         web_link = QLabel("valorant.com")
-        web_link.setStyleSheet(f"font-size: 10px; color: {VALORANT_RED}; text-decoration: underline;")
+        web_link.setProperty("textStyle", "link")
         web_link.setCursor(QCursor(Qt.PointingHandCursor))
         web_link.mousePressEvent = lambda e: QDesktopServices.openUrl(QUrl("https://playvalorant.com/"))
         footer_layout.addWidget(web_link)
@@ -2270,53 +2841,45 @@ class ValorantTeamCompAdvisor(QMainWindow):
         # Añadir pie de página al layout principal
         layout.addWidget(footer_frame)
     
-    def populate_agents(self, filter_role="Todos"):
-        """Poblar la cuadrícula de agentes según el filtro de rol"""
+    def populate_maps(self):
+        """Poblar la cuadrícula de mapas"""
         # Limpiar grid
-        for i in reversed(range(self.agent_grid.count())):
-            self.agent_grid.itemAt(i).widget().setParent(None)
-        
-        # Filtrar agentes por rol
-        if filter_role == "Todos":
-            agents_to_show = self.all_agents
-        else:
-            agents_to_show = self.agents_by_role[filter_role]
-        
-        # Obtener tier para cada agente
-        agent_tiers = {}
-        for agent in agents_to_show:
-            for tier, agents in self.tier_list.items():
-                if agent in agents:
-                    agent_tiers[agent] = tier
-                    break
-            if agent not in agent_tiers:
-                agent_tiers[agent] = "No clasificado"
-        
-        # Ordenar agentes por tier y luego alfabéticamente
-        tier_order = {"S-Tier": 0, "A-Tier": 1, "B-Tier": 2, "C-Tier": 3, "No clasificado": 4}
-        agents_to_show.sort(key=lambda x: (tier_order.get(agent_tiers[x], 5), x))
+        for i in reversed(range(self.map_grid.count())):
+            self.map_grid.itemAt(i).widget().setParent(None)
+        self.map_cards = {}
         
-        # Añadir agentes al grid
         row, col = 0, 0
-        max_cols = 3  # Número de columnas en el grid
-        
-        for agent in agents_to_show:
-            role = self.agent_roles[agent]
-            tier = agent_tiers[agent]
-            
-            agent_card = AgentCard(agent, role, tier, self.agent_images.get(agent), size_factor=self.size_factor)
-            agent_card.clicked.connect(self.on_agent_selected)
-            agent_card.info_clicked.connect(self.show_agent_details)
-            self.agent_cards[agent] = agent_card
+        for map_name in self.maps:
+            map_card = MapCard(map_name, size_factor=self.size_factor,
+                               image_request=partial(self.map_images.request, map_name, size=MAP_THUMBNAIL_SIZE))
+            map_card.clicked.connect(self.on_map_selected)
+            self.map_cards[map_name] = map_card
             
-            self.agent_grid.addWidget(agent_card, row, col)
+            self.map_grid.addWidget(map_card, row, col)
             
             # Actualizar fila y columna
             col += 1
-            if col >= max_cols:
+            if col > 1:  # 2 columnas
                 col = 0
                 row += 1
     
+    def get_agents_to_show(self, filter_role="Todos"):
+        """Agentes visibles con el filtro de rol, ordenados por tier y nombre"""
+        # Filtrar agentes por rol (copia para no reordenar los datos del motor)
+        if filter_role == "Todos":
+            agents_to_show = list(self.all_agents)
+        else:
+            agents_to_show = list(self.agents_by_role[filter_role])
+        
+        # Ordenar agentes por tier y luego alfabéticamente
+        agents_to_show.sort(key=lambda x: (self.catalog.tier_rank(x), x))
+        return agents_to_show
+    
+    def populate_agents(self, filter_role="Todos"):
+        """Mostrar en la cuadrícula los agentes del filtro de rol"""
+        self.agent_filter = filter_role
+        self.agent_model.set_agents(self.get_agents_to_show(filter_role))
+    
     def filter_agents_by_role(self, role):
         """Filtrar agentes por rol"""
         self.populate_agents(role)
@@ -2339,13 +2902,9 @@ class ValorantTeamCompAdvisor(QMainWindow):
     
     def on_agent_selected(self, agent_name):
         """Manejar la selección de agente"""
-        # Desmarcar agente anterior
-        if self.selected_agent and self.selected_agent in self.agent_cards:
-            self.agent_cards[self.selected_agent].set_selected(False)
-        
-        # Marcar nuevo agente
+        # Marcar nuevo agente (el modelo desmarca el anterior)
         self.selected_agent = agent_name
-        self.agent_cards[agent_name].set_selected(True)
+        self.agent_model.set_selected(agent_name)
         
         # Actualizar etiqueta
         role = self.agent_roles.get(agent_name, "Desconocido")
@@ -2367,45 +2926,61 @@ class ValorantTeamCompAdvisor(QMainWindow):
         width = event.size().width()
         
         if width < 1000:
-            self.size_factor = 0.8
+            size_factor = 0.8
         elif width < 1200:
-            self.size_factor = 0.9
+            size_factor = 0.9
         elif width < 1400:
-            self.size_factor = 1.0
+            size_factor = 1.0
         elif width < 1600:
-            self.size_factor = 1.1
+            size_factor = 1.1
         else:
-            self.size_factor = 1.2
+            size_factor = 1.2
         
-        # Actualizar tamaños de elementos
-        self.update_element_sizes()
+        # Solo hay trabajo si cambia el tramo; se aplica al terminar el arrastre
+        if size_factor != self.size_factor:
+            self.size_factor = size_factor
+            self.resize_timer.start()
         
         # Llamar al método original
         super().resizeEvent(event)
     
+    def closeEvent(self, event):
+        """Escribir el historial pendiente antes de cerrar"""
+        self.composition_history.close()
+        super().closeEvent(event)
+    
     def update_element_sizes(self):
-        """Actualizar tamaños de elementos según el factor de escala"""
-        # Actualizar tarjetas de mapas
-        for map_name, card in self.map_cards.items():
-            card.set_size_factor(self.size_factor)
+        """Actualizar tamaños de elementos según el factor de escala, por lotes"""
+        self.agent_view.set_size_factor(self.size_factor)
+        self.pending_resize = list(self.map_cards.values())
+        self.resize_batch_timer.start()
+    
+    def resize_next_batch(self):
+        """Reescalar el siguiente lote de tarjetas y ceder el control al bucle de eventos"""
+        batch = self.pending_resize[:RESIZE_BATCH_SIZE]
+        self.pending_resize = self.pending_resize[RESIZE_BATCH_SIZE:]
         
-        # Actualizar tarjetas de agentes
-        for agent_name, card in self.agent_cards.items():
+        for card in batch:
             card.set_size_factor(self.size_factor)
+        
+        if not self.pending_resize:
+            self.resize_batch_timer.stop()
     
-    def show_welcome_message(self):
-        """Mostrar mensaje de bienvenida en el panel de resultados"""
-        # Limpiar contenido anterior
-        self.clear_results()
+    def create_welcome_page(self):
+        """Crear la página de bienvenida del panel de resultados"""
+        page = QWidget()
+        page_layout = QVBoxLayout(page)
+        page_layout.setContentsMargins(0, 0, 0, 0)
+        page_layout.setSpacing(15)
         
         # Crear frame de bienvenida
         welcome_frame = QFrame()
-        welcome_frame.setStyleSheet(f"background-color: {VALORANT_LIGHT_BLUE}; border-radius: 8px; padding: 20px;")
+        welcome_frame.setObjectName("welcomeSection")
         welcome_layout = QVBoxLayout(welcome_frame)
         
         # Título de bienvenida
         welcome_title = QLabel("¡BIENVENIDO AL ASESOR DE COMPOSICIONES PREMIUM!")
-        welcome_title.setStyleSheet(f"font-size: 20px; font-weight: bold; color: {VALORANT_RED};")
+        welcome_title.setProperty("textStyle", "pageTitle")
         welcome_title.setAlignment(Qt.AlignCenter)
         welcome_layout.addWidget(welcome_title)
         
@@ -2432,7 +3007,7 @@ class ValorantTeamCompAdvisor(QMainWindow):
         """
         
         msg = QLabel(welcome_text)
-        msg.setStyleSheet(f"font-size: 14px; color: {VALORANT_WHITE}; padding: 10px;")
+        msg.setProperty("textStyle", "welcome")
         msg.setWordWrap(True)
         welcome_layout.addWidget(msg)
         
@@ -2441,38 +3016,57 @@ class ValorantTeamCompAdvisor(QMainWindow):
         explore_button.clicked.connect(self.show_agent_browser)
         welcome_layout.addWidget(explore_button)
         
-        # Añadir frame de bienvenida al contenido de resultados
-        self.results_content_layout.addWidget(welcome_frame)
+        # Añadir frame de bienvenida a la página
+        page_layout.addWidget(welcome_frame)
         
         # Añadir barra de progreso animada
         progress_frame = QFrame()
-        progress_frame.setStyleSheet(f"background-color: {VALORANT_LIGHT_BLUE}; border-radius: 8px; padding: 10px; margin-top: 10px;")
+        progress_frame.setObjectName("progressSection")
+        progress_layout = QVBoxLayout(progress_frame)
+        
+        self.welcome_loading_label = QLabel("Cargando datos de meta actualizados...")
+        self.welcome_loading_label.setProperty("textStyle", "body")
+        self.welcome_loading_label.setAlignment(Qt.AlignCenter)
+        progress_layout.addWidget(self.welcome_loading_label)
+        
+        self.welcome_progress_bar = AnimatedProgressBar()
+        progress_layout.addWidget(self.welcome_progress_bar)
+        
+        page_layout.addWidget(progress_frame)
+        return page
+    
+    def create_progress_page(self):
+        """Crear la página que se muestra mientras se genera una composición lenta"""
+        progress_frame = QFrame()
+        progress_frame.setObjectName("progressSection")
         progress_layout = QVBoxLayout(progress_frame)
         
-        loading_label = QLabel("Cargando datos de meta actualizados...")
-        loading_label.setStyleSheet(f"font-size: 12px; color: {VALORANT_WHITE};")
+        loading_label = QLabel("Generando composición óptima...")
+        loading_label.setProperty("textStyle", "message")
         loading_label.setAlignment(Qt.AlignCenter)
         progress_layout.addWidget(loading_label)
         
-        progress_bar = AnimatedProgressBar()
-        progress_layout.addWidget(progress_bar)
+        self.generation_progress_bar = AnimatedProgressBar()
+        progress_layout.addWidget(self.generation_progress_bar)
         
-        self.results_content_layout.addWidget(progress_frame)
+        return progress_frame
+    
+    def show_results_page(self, page):
+        """Mostrar una de las páginas persistentes del panel de resultados"""
+        for other in (self.welcome_page, self.progress_page, self.composition_view):
+            if other is not page:
+                other.hide()
+        page.show()
+    
+    def show_welcome_message(self):
+        """Mostrar mensaje de bienvenida en el panel de resultados"""
+        self.show_results_page(self.welcome_page)
         
         # Iniciar animación
-        progress_bar.start_animation()
+        self.welcome_progress_bar.start_animation()
         
         # Simular carga completa después de 2 segundos
-        QTimer.singleShot(2000, lambda: loading_label.setText("Datos de meta cargados correctamente"))
-    
-    def clear_results(self):
-        """Limpiar el panel de resultados"""
-        # Eliminar todos los widgets del layout de resultados
-        while self.results_content_layout.count():
-            item = self.results_content_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
+        QTimer.singleShot(2000, lambda: self.welcome_loading_label.setText("Datos de meta cargados correctamente"))
     
     def generate_composition(self):
         """Generar y mostrar la composición del equipo"""
@@ -2480,505 +3074,148 @@ class ValorantTeamCompAdvisor(QMainWindow):
             QMessageBox.warning(self, "Mapa no seleccionado", 
                               "Por favor, selecciona un mapa antes de generar la composición.")
             return
-            
+        
         if not self.selected_agent:
             QMessageBox.warning(self, "Agente no seleccionado", 
                               "Por favor, selecciona un agente que quieras jugar.")
             return
         
-        # Mostrar barra de progreso mientras se genera la composición
         self.statusBar().showMessage("Generando composición...")
         
-        # Limpiar resultados anteriores
-        self.clear_results()
-        
-        # Añadir barra de progreso animada
-        progress_frame = QFrame()
-        progress_frame.setStyleSheet(f"background-color: {VALORANT_LIGHT_BLUE}; border-radius: 8px; padding: 10px;")
-        progress_layout = QVBoxLayout(progress_frame)
-        
-        loading_label = QLabel("Generando composición óptima...")
-        loading_label.setStyleSheet(f"font-size: 14px; color: {VALORANT_WHITE};")
-        loading_label.setAlignment(Qt.AlignCenter)
-        progress_layout.addWidget(loading_label)
-        
-        progress_bar = AnimatedProgressBar()
-        progress_layout.addWidget(progress_bar)
+        # Calcular en un hilo del pool; las peticiones anteriores quedan obsoletas
+        self.generation_id += 1
+        task = RecommendTask(self.recommend_signals, self.generation_id, self.engine,
+                             self.selected_map, self.selected_agent, self.comp_style)
+        self.worker_pool.start(task)
         
-        self.results_content_layout.addWidget(progress_frame)
+        # La barra de progreso solo aparece si el cálculo tarda
+        self.progress_timer.start()
+    
+    def show_generation_progress(self):
+        """Mostrar la barra de progreso mientras se genera la composición"""
+        self.show_results_page(self.progress_page)
         
         # Iniciar animación
-        progress_bar.start_animation()
-        
-        # Simular procesamiento y mostrar resultados después de 1 segundo
-        QTimer.singleShot(1000, self.show_composition_results)
+        self.generation_progress_bar.start_animation()
     
-    def show_composition_results(self):
-        """Mostrar los resultados de la composición generada"""
-        # Limpiar resultados anteriores
-        self.clear_results()
-        
-        # Obtener la composición meta para el mapa seleccionado
-        if self.comp_style == "Agresiva":
-            base_comp = self.map_comps[self.selected_map]["aggressive"]
-        elif self.comp_style == "Defensiva":
-            base_comp = self.map_comps[self.selected_map]["defensive"]
-        else:  # Balanceada (default)
-            base_comp = self.map_comps[self.selected_map]["pro"]
-        
-        ranked_comp = self.map_comps[self.selected_map]["ranked"]
-        alt_comp = self.map_comps[self.selected_map]["alt"]
-        description = self.map_comps[self.selected_map]["description"]
-        
-        # Ajustar la composición según el agente preferido
-        final_comp = self.adjust_composition(base_comp, ranked_comp, alt_comp, self.selected_agent)
-        
-        # Crear sección de mapa
-        map_section = QFrame()
-        map_section.setStyleSheet(f"background-color: {VALORANT_LIGHT_BLUE}; border-radius: 8px; padding: 15px;")
-        map_layout = QVBoxLayout(map_section)
-        
-        # Cabecera con mapa y estilo
-        header_frame = QFrame()
-        header_layout = QHBoxLayout(header_frame)
-        header_layout.setContentsMargins(0, 0, 0, 0)
-        
-        # Imagen del mapa (si está disponible)
-        if self.selected_map in self.map_images and self.map_images[self.selected_map]:
-            map_img_label = QLabel()
-            pixmap = QPixmap.fromImage(self.map_images[self.selected_map])
-            pixmap = pixmap.scaled(200, 120, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            map_img_label.setPixmap(pixmap)
-            header_layout.addWidget(map_img_label)
-        
-        # Información del mapa
-        map_info_frame = QFrame()
-        map_info_layout = QVBoxLayout(map_info_frame)
-        
-        # Título del mapa
-        map_title = QLabel(f"MAPA: {self.selected_map.upper()}")
-        map_title.setStyleSheet(f"font-size: 20px; font-weight: bold; color: {VALORANT_RED};")
-        map_info_layout.addWidget(map_title)
-        
-        # Estilo de composición
-        style_label = QLabel(f"ESTILO: {self.comp_style.upper()}")
-        style_label.setStyleSheet(f"font-size: 16px; font-weight: bold; color: {VALORANT_WHITE};")
-        map_info_layout.addWidget(style_label)
-        
-        header_layout.addWidget(map_info_frame, 1)  # 1 = stretch factor
-        map_layout.addWidget(header_frame)
-        
-        # Descripción del mapa
-        desc_label = QLabel("ESTRATEGIA RECOMENDADA:")
-        desc_label.setStyleSheet(f"font-size: 14px; font-weight: bold; color: {VALORANT_WHITE}; margin-top: 10px;")
-        map_layout.addWidget(desc_label)
-        
-        desc_text = QLabel(description)
-        desc_text.setStyleSheet(f"font-size: 12px; color: {VALORANT_WHITE};")
-        desc_text.setWordWrap(True)
-        map_layout.addWidget(desc_text)
-        
-        # Añadir sección de mapa al contenido de resultados
-        self.results_content_layout.addWidget(map_section)
-        
-        # Crear sección de composición
-        comp_section = QFrame()
-        comp_section.setStyleSheet(f"background-color: {VALORANT_LIGHT_BLUE}; border-radius: 8px; padding: 15px;")
-        comp_layout = QVBoxLayout(comp_section)
-        
-        # Título de composición
-        comp_title = QLabel("COMPOSICIÓN DE EQUIPO")
-        comp_title.setStyleSheet(f"font-size: 18px; font-weight: bold; color: {VALORANT_RED};")
-        comp_layout.addWidget(comp_title)
-        
-        # Agrupar agentes por rol
-        roles_used = {}
-        for agent in final_comp:
-            role = self.agent_roles[agent]
-            if role not in roles_used:
-                roles_used[role] = []
-            roles_used[role].append(agent)
-        
-        # Mostrar agentes por rol
-        role_order = ["Duelista", "Iniciador", "Controlador", "Centinela"]
-        
-        for role in role_order:
-            if role in roles_used and roles_used[role]:
-                # Crear frame para el rol
-                role_frame = QFrame()
-                role_frame.setStyleSheet("background-color: transparent;")
-                role_layout = QVBoxLayout(role_frame)
-                role_layout.setContentsMargins(0, 10, 0, 5)
-                
-                # Etiqueta de rol
-                role_color = ROLE_COLORS.get(role, VALORANT_WHITE)
-                
-                role_label = QLabel(role.upper())
-                role_label.setStyleSheet(f"font-size: 14px; font-weight: bold; color: {role_color};")
-                role_layout.addWidget(role_label)
-                
-                # Frame para los agentes de este rol
-                agents_frame = QFrame()
-                agents_frame.setStyleSheet("background-color: transparent;")
-                agents_layout = QHBoxLayout(agents_frame)
-                agents_layout.setContentsMargins(0, 0, 0, 0)
-                agents_layout.setSpacing(15)
-                
-                # Añadir cada agente
-                for agent in roles_used[role]:
-                    # Crear card para el agente
-                    agent_role = self.agent_roles[agent]
-                    agent_tier = self.get_agent_tier(agent)
-                    
-                    agent_card = AgentCard(agent, agent_role, agent_tier, self.agent_images.get(agent), size_factor=self.size_factor)
-                    
-                    # Marcar como preferido si es el agente seleccionado
-                    if agent == self.selected_agent:
-                        agent_card.set_preferred(True)
-                    
-                    # Conectar señal de info
-                    agent_card.info_clicked.connect(self.show_agent_details)
-                    
-                    agents_layout.addWidget(agent_card)
-                
-                role_layout.addWidget(agents_frame)
-                comp_layout.addWidget(role_frame)
-        
-        # Añadir sección de composición al contenido de resultados
-        self.results_content_layout.addWidget(comp_section)
-        
-        # Crear sección de recomendaciones
-        tips_section = QFrame()
-        tips_section.setStyleSheet(f"background-color: {VALORANT_LIGHT_BLUE}; border-radius: 8px; padding: 15px;")
-        tips_layout = QVBoxLayout(tips_section)
-        
-        # Título de recomendaciones
-        tips_title = QLabel("RECOMENDACIONES ADICIONALES")
-        tips_title.setStyleSheet(f"font-size: 16px; font-weight: bold; color: {VALORANT_RED};")
-        tips_layout.addWidget(tips_title)
-        
-        # Generar consejos
-        tips = self.generate_tips(self.selected_map, final_comp, self.selected_agent, self.comp_style)
-        
-        # Añadir cada consejo
-        for tip in tips:
-            tip_frame = QFrame()
-            tip_frame.setStyleSheet("background-color: transparent;")
-            tip_layout = QHBoxLayout(tip_frame)
-            tip_layout.setContentsMargins(0, 5, 0, 5)
-            
-            # Bullet point
-            bullet = QLabel("•")
-            bullet.setStyleSheet(f"font-size: 16px; font-weight: bold; color: {VALORANT_RED};")
-            tip_layout.addWidget(bullet)
-            
-            # Texto del consejo
-            tip_text = QLabel(tip)
-            tip_text.setStyleSheet(f"font-size: 12px; color: {VALORANT_WHITE};")
-            tip_text.setWordWrap(True)
-            tip_layout.addWidget(tip_text, 1)  # 1 = stretch factor
-            
-            tips_layout.addWidget(tip_frame)
-        
-        # Añadir sección de recomendaciones al contenido de resultados
-        self.results_content_layout.addWidget(tips_section)
-        
-        # Crear sección de composiciones alternativas
-        alt_section = QFrame()
-        alt_section.setStyleSheet(f"background-color: {VALORANT_LIGHT_BLUE}; border-radius: 8px; padding: 15px;")
-        alt_layout = QVBoxLayout(alt_section)
-        
-        # Título de composiciones alternativas
-        alt_title = QLabel("COMPOSICIONES ALTERNATIVAS")
-        alt_title.setStyleSheet(f"font-size: 16px; font-weight: bold; color: {VALORANT_RED};")
-        alt_layout.addWidget(alt_title)
-        
-        # Composición Pro
-        pro_label = QLabel("Composición Pro:")
-        pro_label.setStyleSheet(f"font-size: 14px; font-weight: bold; color: {VALORANT_WHITE}; margin-top: 10px;")
-        alt_layout.addWidget(pro_label)
-        
-        pro_text = QLabel(", ".join(self.map_comps[self.selected_map]["pro"]))
-        pro_text.setStyleSheet(f"font-size: 12px; color: {VALORANT_WHITE};")
-        pro_text.setWordWrap(True)
-        alt_layout.addWidget(pro_text)
-        
-        # Composición Ranked
-        ranked_label = QLabel("Composición Ranked:")
-        ranked_label.setStyleSheet(f"font-size: 14px; font-weight: bold; color: {VALORANT_WHITE}; margin-top: 10px;")
-        alt_layout.addWidget(ranked_label)
-        
-        ranked_text = QLabel(", ".join(ranked_comp))
-        ranked_text.setStyleSheet(f"font-size: 12px; color: {VALORANT_WHITE};")
-        ranked_text.setWordWrap(True)
-        alt_layout.addWidget(ranked_text)
-        
-        # Composición Alt
-        alt_comp_label = QLabel("Composición Alternativa:")
-        alt_comp_label.setStyleSheet(f"font-size: 14px; font-weight: bold; color: {VALORANT_WHITE}; margin-top: 10px;")
-        alt_layout.addWidget(alt_comp_label)
-        
-        alt_comp_text = QLabel(", ".join(alt_comp))
-        alt_comp_text.setStyleSheet(f"font-size: 12px; color: {VALORANT_WHITE};")
-        alt_comp_text.setWordWrap(True)
-        alt_layout.addWidget(alt_comp_text)
-        
-        # Añadir sección de composiciones alternativas al contenido de resultados
-        self.results_content_layout.addWidget(alt_section)
-        
-        # Botones de acción
-        actions_frame = QFrame()
-        actions_frame.setStyleSheet(f"background-color: {VALORANT_LIGHT_BLUE}; border-radius: 8px; padding: 15px;")
-        actions_layout = QHBoxLayout(actions_frame)
-        
-        # Botón para guardar composición
-        save_button = HoverButton("Guardar Composición")
-        save_button.clicked.connect(self.save_composition)
-        actions_layout.addWidget(save_button)
-        
-        # Botón para exportar composición
-        export_button = HoverButton("Exportar Composición")
-        export_button.clicked.connect(self.export_composition)
-        actions_layout.addWidget(export_button)
-        
-        # Botón para ver detalles de agentes
-        details_button = HoverButton("Ver Detalles de Agentes", color=VALORANT_LIGHT_BLUE)
-        details_button.clicked.connect(self.show_agent_browser)
-        actions_layout.addWidget(details_button)
-        
-        self.results_content_layout.addWidget(actions_frame)
-        
-        # Guardar la composición en el historial
-        self.composition_history.append({
-            "map": self.selected_map,
-            "agent": self.selected_agent,
-            "style": self.comp_style,
+    def on_composition_ready(self, request_id, result):
+        """Mostrar la recomendación calculada si sigue siendo la última pedida"""
+        if request_id != self.generation_id:
+            return
+        self.progress_timer.stop()
+        self.show_composition_results(result)
+    
+    def on_composition_failed(self, request_id, message):
+        """Informar de un error al generar la composición"""
+        if request_id != self.generation_id:
+            return
+        self.progress_timer.stop()
+        self.statusBar().showMessage(f"No se pudo generar la composición: {message}")
+    
+    def show_composition_results(self, result, record=True):
+        """Mostrar los resultados de una recomendación del motor (record: añadirla al historial)"""
+        map_name = result["map"]
+        selected_agent = result["agent"]
+        comp_style = result["style"]
+        final_comp = result["composition"]
+        
+        # Actualizar en su sitio los widgets del panel persistente
+        self.composition_view.set_result(result, self.catalog, self.size_factor)
+        self.show_results_page(self.composition_view)
+        
+        # Guardar la composición en el historial (se escribe en segundo plano)
+        self.current_composition = {
+            "map": map_name,
+            "agent": selected_agent,
+            "style": comp_style,
             "composition": final_comp
-        })
+        }
+        if not record:
+            self.statusBar().showMessage(f"Composición del historial para {map_name} con {selected_agent}")
+            return
+        self.composition_history.add(self.current_composition)
         
         # Actualizar barra de estado
-        self.statusBar().showMessage(f"Composición generada para {self.selected_map} con {self.selected_agent}")
-    
-    def adjust_composition(self, base_comp, ranked_comp, alt_comp, preferred_agent):
-        """Ajustar la composición basada en el agente preferido"""
-        # Si el agente preferido ya está en la composición base, no hay cambios
-        if preferred_agent in base_comp:
-            return base_comp.copy()
-        
-        # Encontrar el rol del agente preferido
-        preferred_role = self.agent_roles[preferred_agent]
-        
-        # Intentar reemplazar un agente del mismo rol en la composición base
-        final_comp = base_comp.copy()
-        replaced = False
-        
-        for i, agent in enumerate(base_comp):
-            if self.agent_roles.get(agent) == preferred_role:
-                final_comp[i] = preferred_agent
-                replaced = True
-                break
-        
-        # Si no se pudo reemplazar por rol, buscar en otras composiciones
-        if not replaced:
-            # Verificar si el agente está en la composición ranked o alt
-            if preferred_agent in ranked_comp:
-                final_comp = ranked_comp.copy()
-            elif preferred_agent in alt_comp:
-                final_comp = alt_comp.copy()
-            else:
-                # Último recurso - reemplazar un agente menos importante
-                # Identificar agentes core que aparecen en todas las composiciones
-                core_agents = set(base_comp).intersection(set(ranked_comp)).intersection(set(alt_comp))
-                non_core = [agent for agent in base_comp if agent not in core_agents]
-                
-                if non_core:
-                    # Reemplazar un agente no core
-                    replace_idx = base_comp.index(random.choice(non_core))
-                else:
-                    # Si todos son core, reemplazar uno al azar pero no un controlador
-                    controllers = [i for i, agent in enumerate(base_comp) 
-                                 if self.agent_roles.get(agent) == "Controlador"]
-                    
-                    # Evitar reemplazar controladores si es posible
-                    non_controllers = [i for i in range(len(base_comp)) if i not in controllers]
-                    
-                    if non_controllers and preferred_role != "Controlador":
-                        replace_idx = random.choice(non_controllers)
-                    else:
-                        replace_idx = random.randint(0, len(base_comp) - 1)
-                
-                final_comp[replace_idx] = preferred_agent
-        
-        # Asegurar que la composición tenga al menos un controlador
-        has_controller = any(self.agent_roles.get(agent) == "Controlador" for agent in final_comp)
-        
-        if not has_controller:
-            # Buscar un agente que no sea el preferido para reemplazar
-            for i, agent in enumerate(final_comp):
-                if agent != preferred_agent and self.agent_roles.get(agent) != "Controlador":
-                    # Reemplazar con un controlador popular
-                    final_comp[i] = "Omen"  # Controlador versátil para la mayoría de mapas
-                    break
-        
-        return final_comp
-    
-    def generate_tips(self, map_name, composition, preferred_agent, comp_style):
-        """Generar consejos específicos para el mapa y la composición"""
-        tips = []
-        
-        # Añadir consejos específicos del mapa
-        if map_name == "Ascent":
-            tips.append("Utiliza habilidades de reconocimiento para controlar Mid y asegurar la transición entre sitios.")
-            tips.append("Mantén control de Catwalk y Market con tus controladores para ejecutar rápidamente en A o B.")
-            if comp_style == "Agresiva":
-                tips.append("Aprovecha las entradas rápidas por A Main y B Main con duelistas para sorprender a los defensores.")
-            elif comp_style == "Defensiva":
-                tips.append("Establece una defensa fuerte en Heaven y CT para controlar múltiples ángulos.")
-        elif map_name == "Bind":
-            tips.append("Utiliza los teletransportadores para rotaciones rápidas y flanqueos sorpresa.")
-            tips.append("Coordina utilidad para limpiar esquinas en Hookah y Showers.")
-            if comp_style == "Agresiva":
-                tips.append("Presiona agresivamente Hookah y Showers para tomar control temprano del mapa.")
-            elif comp_style == "Defensiva":
-                tips.append("Coloca centinelas en los teletransportadores para detectar rotaciones enemigas.")
-        elif map_name == "Breeze":
-            tips.append("La Pantalla Tóxica de Viper es esencial para dividir los amplios espacios abiertos.")
-            tips.append("Utiliza operadores en las largas líneas de visión de A Main y Mid.")
-            if comp_style == "Agresiva":
-                tips.append("Toma control agresivo de Cave y Nest para presionar a los defensores desde múltiples ángulos.")
-            elif comp_style == "Defensiva":
-                tips.append("Mantén operadores en A Bridge y B Nest para controlar las líneas largas.")
-        elif map_name == "Fracture":
-            tips.append("Coordina ataques desde ambos lados del mapa para dividir atención de defensores.")
-            tips.append("Prioriza el control de Dish y Arcade para facilitar rotaciones a ambos sitios.")
-            if comp_style == "Agresiva":
-                tips.append("Utiliza a Breach y Fade para entradas coordinadas desde ambos lados del sitio.")
-            elif comp_style == "Defensiva":
-                tips.append("Coloca centinelas en puntos clave como Dish y Tower para detectar flancos.")
-        elif map_name == "Haven":
-            tips.append("Coordina tácticas para manejar los tres sitios de bomba y sus múltiples entradas.")
-            tips.append("Divide habilidades defensivas eficientemente entre todos los sitios.")
-            if comp_style == "Agresiva":
-                tips.append("Presiona agresivamente C Long o A Long para forzar rotaciones y crear espacio.")
-            elif comp_style == "Defensiva":
-                tips.append("Mantén control de Garage para facilitar rotaciones rápidas entre sitios.")
-        elif map_name == "Icebox":
-            tips.append("La Pantalla Tóxica de Viper es crucial para dividir sitios y crear espacio para plantar.")
-            tips.append("Utiliza el muro de Sage para facilitar plantaciones seguras en sitios abiertos como B.")
-            if comp_style == "Agresiva":
-                tips.append("Aprovecha el movimiento vertical en B Site para sorprender a los defensores.")
-            elif comp_style == "Defensiva":
-                tips.append("Coloca utilidad de Killjoy en B para retrasar pushes y facilitar retakes.")
-        elif map_name == "Lotus":
-            tips.append("Aprovecha las puertas rotatorias para ejecutar rotaciones silenciosas.")
-            tips.append("Mantén control de Main Hall para dividir el mapa y facilitar rotaciones.")
-            if comp_style == "Agresiva":
-                tips.append("Utiliza a Raze para limpiar espacios cerrados cerca de las puertas rotatorias.")
-            elif comp_style == "Defensiva":
-                tips.append("Coloca centinelas en C Mound y A Tree para detectar flancos a través de las puertas.")
-        elif map_name == "Pearl":
-            tips.append("Usa controladores para bloquear líneas de visión largas en Mid y A Main.")
-            tips.append("Controla Water para poder flanquear B desde múltiples ángulos.")
-            if comp_style == "Agresiva":
-                tips.append("Presiona agresivamente Mid para dividir el mapa y controlar rotaciones.")
-            elif comp_style == "Defensiva":
-                tips.append("Mantén control de Art y Link para facilitar rotaciones defensivas.")
-        elif map_name == "Split":
-            tips.append("Coordina habilidades para tomar control de Mid y presionar ambos sitios.")
-            tips.append("Usa muros y humos para bloquear las visiones extensas de Heaven y Rafters.")
-            if comp_style == "Agresiva":
-                tips.append("Utiliza a Raze para entradas verticales sorpresa en A o B Main.")
-            elif comp_style == "Defensiva":
-                tips.append("Coloca centinelas en Mid Mail y Vents para detectar flancos.")
-        elif map_name == "Sunset":
-            tips.append("Aprovecha los múltiples niveles y ángulos verticales para sorprender a los enemigos.")
-            tips.append("Coordina utilidad para limpiar espacios cerrados y esquinas.")
-            if comp_style == "Agresiva":
-                tips.append("Utiliza a Raze y Phoenix para limpiar espacios cerrados con su utilidad.")
-            elif comp_style == "Defensiva":
-                tips.append("Coloca a Deadlock y Killjoy para controlar áreas clave y retrasar pushes.")
-        
-        # Añadir consejos específicos de la composición
-        duelist_count = sum(1 for agent in composition if self.agent_roles.get(agent) == "Duelista")
-        controller_count = sum(1 for agent in composition if self.agent_roles.get(agent) == "Controlador")
-        sentinel_count = sum(1 for agent in composition if self.agent_roles.get(agent) == "Centinela")
-        initiator_count = sum(1 for agent in composition if self.agent_roles.get(agent) == "Iniciador")
-        
-        if duelist_count > 1:
-            tips.append("Con múltiples duelistas, coordina las entradas para no desperdiciar utilidad ni arriesgar demasiado.")
-        
-        if controller_count > 1:
-            tips.append("Distribuye los humos entre sitios para maximizar la cobertura y duración.")
-        
-        if "Jett" in composition:
-            tips.append("Utiliza a Jett para tomar ángulos agresivos con Operator y crear espacio para el equipo.")
-        
-        if "Viper" in composition:
-            tips.append("Aprende los lineups de Viper para pantallas toxicas y hoyos venenosos clave.")
-        
-        if "Omen" in composition:
-            tips.append("Aprovecha la teletransportación de Omen para flanqueos sorpresa o reposicionamientos.")
-        
-        if "Sova" in composition:
-            tips.append("Comunica la información obtenida con las flechas de reconocimiento de Sova.")
-        
-        if "Killjoy" in composition:
-            tips.append("Coloca utilidad de Killjoy en ángulos sorpresa o para defender post-planta.")
-        
-        if "Sage" in composition and map_name in ["Split", "Icebox"]:
-            tips.append("Usa el muro de Sage para bloquear entradas clave o facilitar plantaciones.")
-        
-        # Añadir consejos del agente preferido
-        if preferred_agent == "Jett":
-            tips.append("Como Jett, usa tus Cloudburst para cubrir ángulos mientras entras con Tailwind.")
-        elif preferred_agent == "Raze":
-            tips.append("Usa los Blast Pack de Raze para movimientos verticales sorpresa y entrada rápida.")
-        elif preferred_agent == "Omen":
-            tips.append("Coloca humos profundos para bloquear visión de Defenders mientras tu equipo toma espacio.")
-        elif preferred_agent == "Viper":
-            tips.append("Aprende los lineups post-planta de Viper para Snake Bite en ubicaciones comunes de defuse.")
-        elif preferred_agent == "Sova":
-            tips.append("Domina los rebotes de flecha y lugares de Drone para maximizar la información obtenida.")
-        elif preferred_agent == "Killjoy":
-            tips.append("Coloca Alarmbots en ubicaciones inesperadas para detectar flancos o pushes rápidos.")
-        elif preferred_agent == "Cypher":
-            tips.append("Usa la cámara de Cypher para vigilar flancos mientras el equipo ataca un sitio.")
-        elif preferred_agent == "Breach":
-            tips.append("Coordina tus flashes y aturdimientos con las entradas de los duelistas del equipo.")
-        
-        # Limitar a 6 consejos máximo
-        return tips[:6]
+        self.statusBar().showMessage(f"Composición generada para {map_name} con {selected_agent}")
     
     def get_agent_tier(self, agent):
         """Obtener el tier de un agente"""
-        for tier, agents in self.tier_list.items():
-            if agent in agents:
-                return tier
-        return "No clasificado"
+        return self.catalog.tier(agent)
     
     def show_agent_details(self, agent_name):
         """Mostrar detalles del agente en una ventana emergente"""
-        agent_data = self.agent_details.get(agent_name, {})
-        agent_image = self.agent_images.get(agent_name)
+        # Las partidas nuevas se leen en el pool; el diálogo se actualiza al terminar
+        self.refresh_match_stats()
+        
+        dialog = self.agent_info_dialogs.pop(agent_name, None)
+        if dialog is None:
+            agent_data = self.agent_details.get(agent_name, {})
+            image_request = partial(self.agent_images.request, agent_name, size=AGENT_HEADER_SIZE)
+            dialog = AgentInfoDialog(agent_name, agent_data, image_request, self, catalog=self.catalog,
+                                     stats=self.match_stats)
+        
+        # Caché LRU acotada: el diálogo usado pasa al final y sale el más antiguo
+        self.agent_info_dialogs[agent_name] = dialog
+        if len(self.agent_info_dialogs) > AGENT_INFO_CACHE_SIZE:
+            _, oldest = self.agent_info_dialogs.popitem(last=False)
+            oldest.deleteLater()
         
-        dialog = AgentInfoDialog(agent_name, agent_data, agent_image, self)
         dialog.exec_()
     
+    def refresh_match_stats(self):
+        """Buscar partidas nuevas o modificadas sin bloquear la interfaz"""
+        # Tras un error de disco el almacén queda vacío hasta el próximo arranque
+        if self.stats_refreshing or self.match_stats.store_error:
+            return
+        self.stats_refreshing = True
+        self.worker_pool.start(StatsRefreshTask(self.stats_signals, self.match_stats.matches_dir,
+                                                self.match_stats.store.directory))
+    
+    def on_match_stats_ready(self, stats, changed):
+        """Sustituir las estadísticas si cambiaron y actualizar el diálogo abierto"""
+        self.stats_refreshing = False
+        if not changed:
+            stats.store.close()
+            return
+        if stats.store_error:
+            self.statusBar().showMessage(f"Estadísticas locales desactivadas: {stats.store_error}")
+        
+        old_stats, self.match_stats = self.match_stats, stats
+        for agent_name, dialog in list(self.agent_info_dialogs.items()):
+            if dialog.isVisible():
+                dialog.set_stats(stats)
+            else:
+                # Los diálogos guardados muestran estadísticas antiguas
+                del self.agent_info_dialogs[agent_name]
+                dialog.deleteLater()
+        old_stats.store.close()
+    
+    def on_match_stats_failed(self, message):
+        """Error de disco al refrescar: mantener las estadísticas actuales"""
+        self.stats_refreshing = False
+        self.statusBar().showMessage(f"No se pudieron actualizar las estadísticas: {message}")
+    
+    def discard_agent_info_dialogs(self):
+        """Liberar los diálogos de información guardados"""
+        for dialog in self.agent_info_dialogs.values():
+            dialog.deleteLater()
+        self.agent_info_dialogs.clear()
+    
     def show_agent_browser(self):
-        """Mostrar explorador de agentes"""
-        dialog = AgentBrowserDialog(self.agent_details, self.agent_images, self)
-        dialog.exec_()
+        """Mostrar explorador de agentes (se crea una vez y se reutiliza)"""
+        if self.agent_browser is None:
+            self.agent_browser = AgentBrowserDialog(self.agent_details, self.agent_images, self, catalog=self.catalog)
+        self.agent_browser.exec_()
     
     def save_composition(self):
         """Guardar la composición actual en un archivo"""
-        if not self.composition_history:
+        last_comp = self.current_composition
+        if last_comp is None:
             QMessageBox.information(self, "Sin composición", 
                                   "No hay composición para guardar. Genera una composición primero.")
             return
         
         try:
-            # Obtener la última composición
-            last_comp = self.composition_history[-1]
             
             # Crear directorio de guardado si no existe
             save_dir = "composiciones"
@@ -2998,7 +3235,7 @@ class ValorantTeamCompAdvisor(QMainWindow):
             
             # Guardar como JSON
             with open(filename, 'w') as f:
-                json.dump(last_comp, f, indent=4)
+                json.dump({key: last_comp[key] for key in ("map", "agent", "style", "composition")}, f, indent=4)
             
             QMessageBox.information(self, "Composición guardada", 
                                   f"Composición guardada exitosamente en:\n{filename}")
@@ -3167,7 +3404,7 @@ class ValorantTeamCompAdvisor(QMainWindow):
     <li><b>Exportar Composición:</b> Guarda y exporta tus composiciones en formato JSON para compartir con amigos.</li>
     <li><b>Historial de Composiciones:</b> Guarda y revisa el historial de composiciones generadas.</li>
     <li><b>Actualizaciones Futuras:</b> Acceso a nuevas funciones y mejoras en la aplicación.</li>
-    
+
 </ul>
 <p>Estas funciones están diseñadas para mejorar tu experiencia
 y ayudarte a dominar el juego.</p>
@@ -3199,7 +3436,7 @@ y ayudarte a dominar el juego.</p>
         dialog.setStyleSheet(f"background-color: {VALORANT_BLUE}; color: {VALORANT_WHITE};")
         dialog.setContentsMargins(20, 20, 20, 20)
         dialog.setLayout(layout)
-
+    
     def show_about(self):
         """Mostrar información acerca de la aplicación"""
         QMessageBox.about(self, "Acerca de", 
@@ -3209,8 +3446,8 @@ y ayudarte a dominar el juego.</p>
                         "© 2025 Todos los derechos reservados.")
     
     def show_history(self):
-        """Mostrar historial de composiciones"""
-        if not self.composition_history:
+        """Mostrar historial de composiciones (se lee por páginas al desplazarse)"""
+        if self.composition_history.last() is None:
             QMessageBox.information(self, "Historial vacío", 
                                   "No hay composiciones en el historial. Genera una composición primero.")
             return
@@ -3225,16 +3462,16 @@ y ayudarte a dominar el juego.</p>
             QLabel {{
                 color: {VALORANT_WHITE};
             }}
-            QTableWidget {{
+            QTableView {{
                 background-color: {VALORANT_LIGHT_BLUE};
                 color: {VALORANT_WHITE};
                 gridline-color: #2A3441;
                 border: none;
             }}
-            QTableWidget::item {{
+            QTableView::item {{
                 padding: 5px;
             }}
-            QTableWidget::item:selected {{
+            QTableView::item:selected {{
                 background-color: {VALORANT_RED};
             }}
             QHeaderView::section {{
@@ -3256,25 +3493,50 @@ y ayudarte a dominar el juego.</p>
         title_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(title_label)
         
-        # Tabla de historial
-        table = QTableWidget()
-        table.setColumnCount(4)
-        table.setHorizontalHeaderLabels(["Mapa", "Agente", "Estilo", "Composición"])
+        # Filtros: se aplican en la consulta, no sobre las filas ya leídas
+        model = HistoryTableModel(self.composition_history, dialog)
+        filter_layout = QHBoxLayout()
+        filter_label = QLabel("Filtrar:")
+        filter_label.setStyleSheet("font-weight: bold;")
+        filter_layout.addWidget(filter_label)
+        
+        filter_options = [
+            ("map", "Todos los mapas", self.maps),
+            ("agent", "Todos los agentes", self.all_agents),
+            ("style", "Todos los estilos", [radio.text() for radio in self.style_group.buttons()]),
+        ]
+        for name, all_label, values in filter_options:
+            combo = QComboBox()
+            combo.addItem(all_label, None)
+            for value in values:
+                combo.addItem(value, value)
+            combo.currentIndexChanged.connect(
+                lambda _, name=name, combo=combo: model.set_filter(name, combo.currentData()))
+            filter_layout.addWidget(combo)
+        
+        layout.addLayout(filter_layout)
+        
+        # Tabla de historial; el modelo pide más filas al llegar al final
+        table = QTableView()
+        table.setModel(model)
         table.horizontalHeader().setStretchLastSection(True)
-        table.setEditTriggers(QTableWidget.NoEditTriggers)
-        table.setSelectionBehavior(QTableWidget.SelectRows)
-        table.setSelectionMode(QTableWidget.SingleSelection)
-        
-        # Añadir filas
-        table.setRowCount(len(self.composition_history))
-        for i, comp in enumerate(reversed(self.composition_history)):
-            table.setItem(i, 0, QTableWidgetItem(comp["map"]))
-            table.setItem(i, 1, QTableWidgetItem(comp["agent"]))
-            table.setItem(i, 2, QTableWidgetItem(comp["style"]))
-            table.setItem(i, 3, QTableWidgetItem(", ".join(comp["composition"])))
-        
-        # Ajustar tamaño de columnas
-        table.resizeColumnsToContents()
+        table.verticalHeader().setVisible(False)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        table.setSelectionMode(QAbstractItemView.SingleSelection)
+        header = table.horizontalHeader()
+        header.setSortIndicator(model.sort_column, model.sort_order())
+        table.setSortingEnabled(True)
+        
+        # La composición no se puede ordenar: el indicador vuelve a la columna actual
+        def keep_sort_indicator(column, order):
+            if HISTORY_TABLE_COLUMNS[column][1] is None:
+                header.setSortIndicator(model.sort_column, model.sort_order())
+        header.sortIndicatorChanged.connect(keep_sort_indicator)
+        model.fetchMore()  # Primera página; las siguientes las pide la vista
+        
+        def selected_entry():
+            return model.entry(table.currentIndex().row())
         
         layout.addWidget(table)
         
@@ -3283,12 +3545,12 @@ y ayudarte a dominar el juego.</p>
         
         # Botón para cargar composición
         load_button = HoverButton("Cargar Composición")
-        load_button.clicked.connect(lambda: self.load_composition_from_history(table.currentRow()))
+        load_button.clicked.connect(lambda: self.load_composition_from_history(selected_entry()))
         button_layout.addWidget(load_button)
         
         # Botón para exportar composición
         export_button = HoverButton("Exportar Composición")
-        export_button.clicked.connect(lambda: self.export_composition_from_history(table.currentRow()))
+        export_button.clicked.connect(lambda: self.export_composition_from_history(selected_entry()))
         button_layout.addWidget(export_button)
         
         # Botón para cerrar
@@ -3298,24 +3560,24 @@ y ayudarte a dominar el juego.</p>
         
         layout.addLayout(button_layout)
         
+        # Ajustar columnas a la primera página
+        table.resizeColumnsToContents()
+        
         dialog.exec_()
     
-    def load_composition_from_history(self, row):
+    def load_composition_from_history(self, comp):
         """Cargar una composición desde el historial"""
-        if row < 0 or row >= len(self.composition_history):
+        if comp is None:
             QMessageBox.warning(self, "Selección inválida", 
                               "Por favor, selecciona una composición del historial.")
             return
         
-        # Obtener la composición seleccionada (en orden inverso)
-        comp = self.composition_history[len(self.composition_history) - 1 - row]
-        
         # Seleccionar el mapa
         if comp["map"] in self.map_cards:
             self.on_map_selected(comp["map"])
         
         # Seleccionar el agente
-        if comp["agent"] in self.agent_cards:
+        if comp["agent"] in self.agent_roles:
             self.on_agent_selected(comp["agent"])
         
         # Seleccionar el estilo
@@ -3325,19 +3587,24 @@ y ayudarte a dominar el juego.</p>
                 self.comp_style = comp["style"]
                 break
         
-        # Mostrar la composición
-        self.show_composition_results()
+        # Mostrar la composición guardada tal cual, sin recalcularla ni repetirla en el historial
+        try:
+            result = self.engine.describe_composition(comp["map"], comp["composition"], comp["agent"], comp["style"])
+        except ValueError as e:
+            self.statusBar().showMessage(f"No se pudo mostrar la composición: {e}")
+            return
+        self.generation_id += 1  # Una generación en curso ya no debe sustituirla
+        self.progress_timer.stop()
+        self.show_composition_results(result, record=False)
     
     def export_composition(self):
         """Exportar la composición actual"""
-        if not self.composition_history:
+        last_comp = self.current_composition
+        if last_comp is None:
             QMessageBox.information(self, "Sin composición", 
                                   "No hay composición para exportar. Genera una composición primero.")
             return
         
-        # Obtener la última composición
-        last_comp = self.composition_history[-1]
-        
         # Crear directorio de exportación si no existe
         export_dir = "exportaciones"
         if not os.path.exists(export_dir):
@@ -3375,16 +3642,13 @@ y ayudarte a dominar el juego.</p>
             QMessageBox.critical(self, "Error al exportar", 
                                f"No se pudo exportar la composición:\n{str(e)}")
     
-    def export_composition_from_history(self, row):
+    def export_composition_from_history(self, comp):
         """Exportar una composición desde el historial"""
-        if row < 0 or row >= len(self.composition_history):
+        if comp is None:
             QMessageBox.warning(self, "Selección inválida", 
                               "Por favor, selecciona una composición del historial.")
             return
         
-        # Obtener la composición seleccionada (en orden inverso)
-        comp = self.composition_history[len(self.composition_history) - 1 - row]
-        
         # Crear directorio de exportación si no existe
         export_dir = "exportaciones"
         if not os.path.exists(export_dir):
@@ -3431,4 +3695,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-        
\ No newline at end of file
@@ -0,0 +1,100 @@
+"""Instantánea binaria de la base de conocimiento compilada
+
+Guarda las tablas del motor (mapas, composiciones, roles, tiers, sinergias,
+consejos y detalles de agentes) en un archivo con cabecera fija seguida de los
+datos serializados con marshal. El archivo se abre con mmap y solo se usa si
+la versión del formato y el hash de las fuentes coinciden; en otro caso el
+motor vuelve a leer los archivos Prolog.
+
+Uso como paso de compilación:
+    python snapshot_valo.py
+"""
+
+import hashlib
+import marshal
+import mmap
+import os
+import struct
+import sys
+
+SNAPSHOT_MAGIC = b"VALOKB\r\n"
+SNAPSHOT_VERSION = 1
+
+# Cabecera: firma, versión del formato, versión de marshal, hash de las fuentes, tamaño de los datos
+HEADER = struct.Struct("<8sHH20sQ")
+
+class SnapshotError(ValueError):
+    """La instantánea no existe, está dañada o no corresponde a las fuentes"""
+
+def hash_sources(paths):
+    """Calcular el hash SHA-1 del contenido de los archivos fuente"""
+    digest = hashlib.sha1()
+    for path in paths:
+        with open(path, "rb") as f:
+            data = f.read()
+        digest.update(os.path.basename(path).encode("utf-8"))
+        digest.update(struct.pack("<Q", len(data)))
+        digest.update(data)
+    return digest.digest()
+
+def write_snapshot(path, tables, source_hash):
+    """Escribir la instantánea de forma atómica (archivo temporal + rename)"""
+    payload = marshal.dumps(tables)
+    header = HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, marshal.version, source_hash, len(payload))
+    
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(header)
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def read_snapshot(path, source_hash):
+    """Leer las tablas de una instantánea mapeada en memoria
+    
+    Lanza SnapshotError si el archivo no existe o no es válido para source_hash.
+    """
+    try:
+        f = open(path, "rb")
+    except OSError as e:
+        raise SnapshotError(f"No se pudo abrir la instantánea: {e}") from e
+    
+    with f:
+        if os.fstat(f.fileno()).st_size < HEADER.size:
+            raise SnapshotError("Instantánea truncada")
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            magic, version, marshal_version, stored_hash, size = HEADER.unpack_from(mapped, 0)
+            if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+                raise SnapshotError("Formato de instantánea no compatible")
+            if marshal_version != marshal.version:
+                raise SnapshotError("Instantánea creada con otra versión de marshal")
+            if stored_hash != source_hash:
+                raise SnapshotError("La base de conocimiento cambió desde la última instantánea")
+            if HEADER.size + size != len(mapped):
+                raise SnapshotError("Tamaño de instantánea incorrecto")
+            
+            # Leer directamente del mapa sin copiar los datos a un bytes intermedio
+            view = memoryview(mapped)
+            try:
+                with view[HEADER.size:] as payload:
+                    return marshal.loads(payload)
+            except (EOFError, ValueError, TypeError) as e:
+                raise SnapshotError(f"Instantánea dañada: {e}") from e
+            finally:
+                view.release()
+
+def main():
+    from motor_valo import CompositionEngine
+    
+    engine = CompositionEngine(use_snapshot=False)
+    engine.save_snapshot()
+    print(f"Instantánea escrita en {engine.snapshot_path} ({os.path.getsize(engine.snapshot_path)} bytes)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())